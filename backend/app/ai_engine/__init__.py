@@ -1,11 +1,47 @@
-from .pose import PoseEstimator
-from .gait_analysis import GaitAnalyzer
-from .tremor_analysis import TremorAnalyzer
-from .baseline import BaselineManager
-
-__all__ = [
-    "PoseEstimator",
-    "GaitAnalyzer",
-    "TremorAnalyzer",
-    "BaselineManager"
-]
+import importlib
+from typing import TYPE_CHECKING
+
+# Exports are resolved on first attribute access so importing the package
+# (e.g. for KeypointTensor) does not load mediapipe or scipy.signal
+_EXPORTS = {
+    "PoseEstimator": ".pose",
+    "PoseBackendRegistry": ".pose_backends",
+    "KeypointTensor": ".keypoints",
+    "SpectralEngine": ".spectral",
+    "TremorSpectrum": ".spectral",
+    "GaitAnalyzer": ".gait_analysis",
+    "TremorAnalyzer": ".tremor_analysis",
+    "BaselineManager": ".baseline",
+    "extract_session_features": ".features",
+    "PosePreprocessor": ".preprocessing",
+    "SignalQualityError": ".preprocessing",
+    "VideoPoseExtractor": ".video",
+    "extract_video_session": ".video"
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from .pose import PoseEstimator
+    from .pose_backends import PoseBackendRegistry
+    from .keypoints import KeypointTensor
+    from .spectral import SpectralEngine, TremorSpectrum
+    from .gait_analysis import GaitAnalyzer
+    from .tremor_analysis import TremorAnalyzer
+    from .baseline import BaselineManager
+    from .features import extract_session_features
+    from .preprocessing import PosePreprocessor, SignalQualityError
+    from .video import VideoPoseExtractor, extract_video_session
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
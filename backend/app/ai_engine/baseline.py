@@ -1,13 +1,53 @@
 import numpy as np
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from datetime import datetime
 
 class BaselineManager:
     """Manage patient-specific baseline metrics and deviation scoring."""
     
-    def __init__(self, required_sessions: int = 7, deviation_threshold: float = 2.5):
+    # Session feature -> prefix of its baseline keys
+    METRIC_KEYS = {
+        "stride_length": "stride_length",
+        "cadence": "cadence",
+        "gait_symmetry": "gait_symmetry",
+        "tremor_frequency": "tremor_frequency",
+        "tremor_amplitude": "tremor_amplitude",
+        "bradykinesia_score": "bradykinesia"
+    }
+    # Always part of the baseline; other metrics are skipped when missing or zero
+    REQUIRED_METRICS = ("gait_symmetry", "bradykinesia_score")
+    # Baseline keeps only a mean for these
+    MEAN_ONLY_METRICS = ("tremor_frequency", "tremor_amplitude")
+    
+    # Columns of the batch scoring matrices; tremor is scored as relative change
+    DEVIATION_FEATURES = ("gait_symmetry", "bradykinesia_score", "stride_length", "tremor_amplitude")
+    DEFAULT_STDS = (0.05, 0.1, 0.05)
+    MIN_TREMOR_BASELINE = 0.001
+    
+    # Default risk thresholds on the deviation score
+    LOW_THRESHOLD = 1.5
+    MEDIUM_THRESHOLD = 3.0
+    
+    def __init__(
+        self,
+        required_sessions: int = 7,
+        deviation_threshold: float = 2.5,
+        half_life_sessions: float = 20.0,
+        low_threshold: float = LOW_THRESHOLD,
+        medium_threshold: float = MEDIUM_THRESHOLD
+    ):
         self.required_sessions = required_sessions
         self.deviation_threshold = deviation_threshold
+        self.half_life_sessions = half_life_sessions
+        self.low_threshold = low_threshold
+        self.medium_threshold = medium_threshold
+    
+    @property
+    def update_alpha(self) -> float:
+        """EW weight of a new session: its influence halves every `half_life_sessions`."""
+        if self.half_life_sessions <= 0:
+            return 1.0
+        return 1.0 - 0.5 ** (1.0 / self.half_life_sessions)
     
     def create_baseline(self, sessions_data: List[Dict]) -> Optional[Dict]:
         """
@@ -67,6 +107,60 @@ class BaselineManager:
         
         return baseline
     
+    def session_metric_values(self, session: Dict) -> Dict[str, float]:
+        """Metrics of a session that count towards the baseline (same rules as create_baseline)."""
+        values = {}
+        for metric in self.METRIC_KEYS:
+            value = session.get(metric)
+            if metric in self.REQUIRED_METRICS or value:
+                values[metric] = float(value)
+        return values
+    
+    def update_running_stats(self, stats: Dict, session: Dict) -> Dict:
+        """
+        Fold one session into running statistics (Welford's algorithm).
+        
+        `stats` holds `session_count` and per-metric {"n", "mean", "m2"};
+        the variance of a metric is m2 / n.
+        """
+        metrics = stats.setdefault("metrics", {})
+        stats["session_count"] = stats.get("session_count", 0) + 1
+        
+        for metric, value in self.session_metric_values(session).items():
+            running = metrics.setdefault(metric, {"n": 0, "mean": 0.0, "m2": 0.0})
+            running["n"] += 1
+            delta = value - running["mean"]
+            running["mean"] += delta / running["n"]
+            running["m2"] += delta * (value - running["mean"])
+        
+        return stats
+    
+    def baseline_from_running_stats(self, stats: Dict) -> Optional[Dict]:
+        """
+        Baseline metrics from running statistics, matching create_baseline
+        over the same sessions. None until `required_sessions` are recorded.
+        """
+        session_count = stats.get("session_count", 0)
+        if session_count < self.required_sessions:
+            return None
+        
+        metrics = stats.get("metrics", {})
+        baseline = {}
+        for metric, prefix in self.METRIC_KEYS.items():
+            running = metrics.get(metric, {})
+            n = running.get("n", 0)
+            baseline[f"{prefix}_mean"] = float(running["mean"]) if n else 0.0
+            if metric not in self.MEAN_ONLY_METRICS:
+                baseline[f"{prefix}_std"] = float(np.sqrt(running["m2"] / n)) if n > 1 else 0.0
+        
+        baseline.update({
+            "session_count": session_count,
+            "last_updated": datetime.utcnow().isoformat(),
+            "is_calibrated": True
+        })
+        
+        return baseline
+    
     def calculate_deviation_score(self, current_session: Dict, baseline: Dict) -> float:
         """
         Calculate deviation from baseline as z-score.
@@ -145,14 +239,10 @@ class BaselineManager:
                 "message": "Establishing patient baseline. More data needed."
             }
         
-        # Risk thresholds
-        LOW_THRESHOLD = 1.5
-        MEDIUM_THRESHOLD = 3.0
-        
-        if deviation_score < LOW_THRESHOLD:
+        if deviation_score < self.low_threshold:
             classification = "LOW"
-            confidence = 1.0 - (deviation_score / LOW_THRESHOLD)
-        elif deviation_score < MEDIUM_THRESHOLD:
+            confidence = 1.0 - (deviation_score / self.low_threshold)
+        elif deviation_score < self.medium_threshold:
             classification = "MEDIUM"
             confidence = 0.7
         else:
@@ -166,6 +256,96 @@ class BaselineManager:
             "message": f"Neurological status: {classification} risk detected."
         }
     
+    def feature_matrix(self, sessions: List[Dict]) -> np.ndarray:
+        """
+        (sessions, 4) matrix of DEVIATION_FEATURES. Stride length and tremor
+        amplitude are NaN when missing or zero, as calculate_deviation_score
+        skips them.
+        """
+        matrix = np.full((len(sessions), len(self.DEVIATION_FEATURES)), np.nan)
+        for row, session in enumerate(sessions):
+            matrix[row, 0] = session["gait_symmetry"]
+            matrix[row, 1] = session["bradykinesia_score"]
+            if session.get("stride_length"):
+                matrix[row, 2] = session["stride_length"]
+            if session.get("tremor_amplitude"):
+                matrix[row, 3] = session["tremor_amplitude"]
+        return matrix
+    
+    def baseline_vectors(self, baselines: List[Optional[Dict]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (centers, scales) matrices, one row per baseline, for
+        calculate_deviation_scores. Components calculate_deviation_score
+        would skip (zero std, no stride or tremor baseline, uncalibrated
+        baseline) have NaN scale.
+        """
+        centers = np.full((len(baselines), len(self.DEVIATION_FEATURES)), np.nan)
+        scales = np.full_like(centers, np.nan)
+        sym_std, brady_std, stride_std = self.DEFAULT_STDS
+        
+        for row, baseline in enumerate(baselines):
+            if not baseline or not baseline.get("is_calibrated"):
+                continue
+            
+            centers[row, 0] = baseline["gait_symmetry_mean"]
+            scales[row, 0] = baseline.get("gait_symmetry_std", sym_std)
+            centers[row, 1] = baseline["bradykinesia_mean"]
+            scales[row, 1] = baseline.get("bradykinesia_std", brady_std)
+            if baseline.get("stride_length_mean"):
+                centers[row, 2] = baseline["stride_length_mean"]
+                scales[row, 2] = baseline.get("stride_length_std", stride_std)
+            tremor = baseline.get("tremor_amplitude_mean")
+            if tremor and tremor > self.MIN_TREMOR_BASELINE:
+                centers[row, 3] = scales[row, 3] = tremor
+        
+        scales[~(scales > 0)] = np.nan
+        return centers, scales
+    
+    def calculate_deviation_scores(
+        self,
+        features: np.ndarray,
+        centers: np.ndarray,
+        scales: np.ndarray
+    ) -> np.ndarray:
+        """
+        Deviation scores of many sessions at once.
+        
+        `features` is (sessions, 4) from feature_matrix; `centers` and
+        `scales` are (sessions, 4) or a single (4,) baseline broadcast to
+        every session. Matches calculate_deviation_score row by row.
+        """
+        deviations = np.abs(features - centers) / scales
+        valid = np.isfinite(deviations)
+        counts = valid.sum(axis=-1)
+        totals = np.where(valid, deviations, 0.0).sum(axis=-1)
+        
+        scores = np.divide(totals, counts, out=np.zeros(counts.shape), where=counts > 0)
+        return np.minimum(10.0, scores)
+    
+    def classify_risk_batch(self, scores: np.ndarray, baseline_exists: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized classify_risk.
+        Returns: (classifications, confidences) arrays aligned with `scores`.
+        """
+        scores = np.asarray(scores, dtype=np.float64)
+        baseline_exists = np.broadcast_to(np.asarray(baseline_exists, dtype=bool), scores.shape)
+        
+        low = scores < self.low_threshold
+        medium = ~low & (scores < self.medium_threshold)
+        
+        classifications = np.select(
+            [~baseline_exists, low, medium],
+            ["BASELINE_LEARNING", "LOW", "MEDIUM"],
+            default="HIGH"
+        ).astype(object)
+        confidences = np.select(
+            [~baseline_exists, low, medium],
+            [0.0, 1.0 - scores / self.low_threshold, 0.7],
+            default=np.minimum(1.0, scores / 5.0)
+        )
+        
+        return classifications, np.minimum(1.0, confidences)
+    
     def should_flag_for_review(self, risk_classification: Dict) -> bool:
         """Determine if session should be flagged for clinical review."""
         return risk_classification["classification"] in ["MEDIUM", "HIGH"]
@@ -173,32 +353,32 @@ class BaselineManager:
     def update_baseline(self, baseline: Dict, new_session: Dict) -> Dict:
         """
         Incrementally update baseline with new session (online learning).
-        Uses exponential moving average approach.
+        
+        Every baseline metric follows an exponentially weighted mean and
+        variance with weight `update_alpha`. A metric with no baseline data
+        yet (mean 0.0) starts from the session value.
         """
         if not baseline.get("is_calibrated"):
             return baseline
         
-        alpha = 0.1  # Learning rate for incremental updates
+        alpha = self.update_alpha
         
-        # Update gait symmetry
-        baseline["gait_symmetry_mean"] = (
-            (1 - alpha) * baseline["gait_symmetry_mean"] + 
-            alpha * new_session["gait_symmetry"]
-        )
-        
-        # Update bradykinesia
-        baseline["bradykinesia_mean"] = (
-            (1 - alpha) * baseline["bradykinesia_mean"] + 
-            alpha * new_session["bradykinesia_score"]
-        )
-        
-        # Update stride length if available
-        if new_session.get("stride_length") and baseline.get("stride_length_mean"):
-            baseline["stride_length_mean"] = (
-                (1 - alpha) * baseline["stride_length_mean"] + 
-                alpha * new_session["stride_length"]
-            )
+        for metric, value in self.session_metric_values(new_session).items():
+            prefix = self.METRIC_KEYS[metric]
+            mean = baseline.get(f"{prefix}_mean") or 0.0
+            
+            if mean == 0.0:
+                baseline[f"{prefix}_mean"] = value
+                continue
+            
+            delta = value - mean
+            baseline[f"{prefix}_mean"] = mean + alpha * delta
+            
+            if metric not in self.MEAN_ONLY_METRICS:
+                variance = baseline.get(f"{prefix}_std", 0.0) ** 2
+                baseline[f"{prefix}_std"] = float(np.sqrt((1 - alpha) * (variance + alpha * delta * delta)))
         
+        baseline["sessions_since_calibration"] = baseline.get("sessions_since_calibration", 0) + 1
         baseline["last_updated"] = datetime.utcnow().isoformat()
         
         return baseline
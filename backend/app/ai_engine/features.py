@@ -0,0 +1,48 @@
+from typing import Dict, Optional
+from .keypoints import KeypointTensor, KeypointInput
+from .gait_analysis import GaitAnalyzer
+from .tremor_analysis import TremorAnalyzer
+from .preprocessing import PosePreprocessor
+
+# Part of cached feature keys; bump whenever an analyzer or the
+# preprocessing changes the features computed from the same keypoints
+ANALYZER_VERSION = "3"
+
+
+def extract_session_features(
+    keypoints: KeypointInput,
+    sample_rate: float = 30.0,
+    preprocessor: Optional[PosePreprocessor] = None
+) -> Dict:
+    """
+    Run the gait and tremor analyzers over a whole session.
+    Module-level so it can be submitted to a process pool.
+    
+    Keypoints are cleaned once by `preprocessor` (default settings when
+    None; its sample rate is set to `sample_rate`) and its quality report
+    is returned under "signal_quality". SignalQualityError propagates for
+    unusable sessions.
+    """
+    if preprocessor is None:
+        preprocessor = PosePreprocessor(sample_rate)
+    else:
+        preprocessor = preprocessor.for_sample_rate(sample_rate)
+    tensor, quality = preprocessor.process(KeypointTensor.coerce(keypoints, sample_rate))
+    sample_rate = tensor.sample_rate
+    gait_analyzer = GaitAnalyzer(sample_rate=sample_rate)
+    tremor_analyzer = TremorAnalyzer(sample_rate=sample_rate)
+    
+    # Calculate tremor metrics from one batched spectrum
+    tremor_spectrum = tremor_analyzer.compute_spectrum(tensor)
+    
+    # Gait events are detected once and shared by the stride/timing metrics
+    gait_events = gait_analyzer.detect_gait_events(tensor)
+    
+    return {
+        **gait_analyzer.gait_metrics(gait_events),
+        "gait_symmetry": gait_analyzer.calculate_gait_symmetry(tensor),
+        "bradykinesia_score": gait_analyzer.calculate_bradykinesia_score(tensor),
+        "tremor_frequency": tremor_analyzer.extract_tremor_frequency(tremor_spectrum, TremorAnalyzer.LEFT_WRIST),
+        "tremor_amplitude": tremor_analyzer.extract_tremor_amplitude(tremor_spectrum, TremorAnalyzer.LEFT_WRIST),
+        "signal_quality": quality
+    }
@@ -1,6 +1,81 @@
 import numpy as np
-from typing import List, Tuple, Optional
-from scipy.signal import find_peaks
+from typing import Dict, List, Tuple, Optional
+from .keypoints import KeypointTensor, KeypointInput
+
+
+class GaitEvents:
+    """
+    Heel-strike and toe-off frames of both feet for one session.
+    
+    Detected once by GaitAnalyzer and shared by the stride, cadence,
+    variability and asymmetry metrics.
+    """
+    
+    SIDES = ("left", "right")
+    
+    def __init__(
+        self,
+        heel_strikes: Dict[str, np.ndarray],
+        toe_offs: Dict[str, np.ndarray],
+        heel_positions: np.ndarray,
+        sample_rate: float,
+        total_frames: int,
+        view: str
+    ):
+        self.heel_strikes = heel_strikes
+        self.toe_offs = toe_offs
+        # (frames, 2, 3) left and right heel coordinates
+        self.heel_positions = heel_positions
+        self.sample_rate = sample_rate
+        self.total_frames = total_frames
+        self.view = view
+    
+    def strides(self, side: str) -> List[Tuple[int, int]]:
+        """(start_frame, end_frame) between consecutive heel strikes of one foot."""
+        strikes = self.heel_strikes[side]
+        return [(int(start), int(end)) for start, end in zip(strikes[:-1], strikes[1:])]
+    
+    def stride_times(self) -> np.ndarray:
+        """Stride durations in seconds, both feet."""
+        return np.concatenate([np.diff(strikes) for strikes in self.heel_strikes.values()]) / self.sample_rate
+    
+    def step_times(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Durations between heel strikes of alternating feet (seconds), and
+        the foot ending each step (0 = left, 1 = right). Consecutive strikes
+        of the same foot (a missed contralateral strike) are not steps.
+        """
+        frames = np.concatenate([self.heel_strikes["left"], self.heel_strikes["right"]])
+        sides = np.concatenate([
+            np.zeros(len(self.heel_strikes["left"]), dtype=np.int64),
+            np.ones(len(self.heel_strikes["right"]), dtype=np.int64)
+        ])
+        order = np.argsort(frames, kind="stable")
+        frames, sides = frames[order], sides[order]
+        
+        alternating = sides[1:] != sides[:-1]
+        return np.diff(frames)[alternating] / self.sample_rate, sides[1:][alternating]
+    
+    def stance_ratios(self) -> np.ndarray:
+        """Per-stride share of time from heel strike to the same foot's next toe-off."""
+        ratios = []
+        for side in self.SIDES:
+            strikes, toe_offs = self.heel_strikes[side], self.toe_offs[side]
+            if len(strikes) < 2 or len(toe_offs) == 0:
+                continue
+            starts, ends = strikes[:-1], strikes[1:]
+            position = np.searchsorted(toe_offs, starts, side="right")
+            valid = position < len(toe_offs)
+            starts, ends, position = starts[valid], ends[valid], position[valid]
+            toe_off = toe_offs[position]
+            inside = toe_off < ends
+            ratios.append((toe_off[inside] - starts[inside]) / (ends[inside] - starts[inside]))
+        return np.concatenate(ratios) if ratios else np.zeros(0)
+    
+    @property
+    def num_steps(self) -> int:
+        return sum(len(strikes) for strikes in self.heel_strikes.values())
+
 
 class GaitAnalyzer:
     """Analyze gait parameters from pose keypoints."""
@@ -12,6 +87,28 @@ class GaitAnalyzer:
     RIGHT_HIP = 24
     LEFT_KNEE = 25
     RIGHT_KNEE = 26
+    LEFT_SHOULDER = 11
+    RIGHT_SHOULDER = 12
+    LEFT_WRIST = 15
+    RIGHT_WRIST = 16
+    LEFT_HEEL = 29
+    RIGHT_HEEL = 30
+    LEFT_FOOT_INDEX = 31
+    RIGHT_FOOT_INDEX = 32
+    
+    # Landmarks read by gait event detection, in events_from_landmarks order
+    EVENT_LANDMARKS = [LEFT_HIP, RIGHT_HIP, LEFT_HEEL, RIGHT_HEEL, LEFT_FOOT_INDEX, RIGHT_FOOT_INDEX]
+    
+    # Shortest plausible stride (same-foot heel strikes), in seconds
+    MIN_STRIDE_SECONDS = 0.5
+    # Minimum peak prominence as a fraction of the signal's 5-95 percentile range
+    PEAK_PROMINENCE = 0.25
+    # Foot heel->toe vector at least this horizontal => side view
+    SAGITTAL_RATIO = 0.5
+    
+    # Joint groups for distal-vs-proximal slowing
+    PROXIMAL_JOINTS = [LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP]
+    DISTAL_JOINTS = [LEFT_WRIST, RIGHT_WRIST, LEFT_ANKLE, RIGHT_ANKLE]
     
     def __init__(self, sample_rate: float = 30.0):
         self.sample_rate = sample_rate
@@ -25,131 +122,251 @@ class GaitAnalyzer:
             (point1[2] - point2[2])**2
         )
     
-    def detect_gait_cycles(self, keypoints: List[List[List[float]]]) -> List[Tuple[int, int]]:
+    def _as_tensor(self, keypoints: KeypointInput) -> KeypointTensor:
+        return KeypointTensor.coerce(keypoints, self.sample_rate)
+    
+    def _peak_frames(self, signal: np.ndarray, distance: int) -> np.ndarray:
+        """Peaks of one event signal, ignoring wiggles below PEAK_PROMINENCE of its range."""
+        from scipy.signal import find_peaks
+        
+        low, high = np.percentile(signal, [5, 95])
+        if high - low <= 0:
+            return np.zeros(0, dtype=np.int64)
+        peaks, _ = find_peaks(signal, distance=distance, prominence=self.PEAK_PROMINENCE * (high - low))
+        return peaks.astype(np.int64)
+    
+    def events_from_landmarks(self, points: np.ndarray, total_frames: Optional[int] = None) -> "GaitEvents":
         """
-        Detect gait cycles by analyzing ankle positions.
-        Returns list of (start_frame, end_frame) for each stride.
+        Gait events from a (frames, len(EVENT_LANDMARKS), 3) array.
+        
+        When the feet are seen from the side, heel strike is the most
+        anterior heel position and toe-off the most posterior toe position
+        relative to the pelvis (walking direction taken from heel -> toe).
+        Otherwise heel strike is the fastest downward heel movement and
+        toe-off the fastest upward toe movement.
         """
-        if len(keypoints) < 10:
-            return []
+        total_frames = len(points) if total_frames is None else total_frames
+        empty = {side: np.zeros(0, dtype=np.int64) for side in GaitEvents.SIDES}
+        if len(points) < 10:
+            return GaitEvents(empty, dict(empty), np.zeros((len(points), 2, 3)), self.sample_rate, total_frames, "none")
         
-        # Extract vertical ankle positions
-        ankle_y_sequence = []
-        for frame_keypoints in keypoints:
-            if len(frame_keypoints) > self.LEFT_ANKLE:
-                # Use left ankle Y position (vertical)
-                ankle_y = frame_keypoints[self.LEFT_ANKLE][1]
-                ankle_y_sequence.append(ankle_y)
+        points = points.astype(np.float64)
+        pelvis = points[:, 0:2].mean(axis=1)
+        heels = points[:, 2:4]
+        toes = points[:, 4:6]
         
-        if len(ankle_y_sequence) < 10:
-            return []
+        foot = toes - heels
+        along = float(np.median(foot[..., 0]))
+        planar = float(np.median(np.hypot(foot[..., 0], foot[..., 1])))
         
-        # Find peaks (maximum height of ankle)
-        peaks, _ = find_peaks(ankle_y_sequence, distance=10, height=0.1)
+        if planar > 0 and abs(along) >= self.SAGITTAL_RATIO * planar:
+            view = "sagittal"
+            direction = np.sign(along)
+            heel_strike_signal = (heels[..., 0] - pelvis[:, None, 0]) * direction
+            toe_off_signal = -(toes[..., 0] - pelvis[:, None, 0]) * direction
+        else:
+            view = "frontal"
+            # Vertical foot speed over a ~0.1 s central difference (less noisy
+            # than per frame). Image y grows downwards, and the lowest heel
+            # position is a flat plateau during stance, so heel strike is taken
+            # as the fastest downward heel movement just before contact.
+            lag = max(1, int(round(0.1 * self.sample_rate)))
+            heel_y = np.pad(heels[..., 1], ((lag, lag), (0, 0)), mode="edge")
+            heel_strike_signal = heel_y[2 * lag:] - heel_y[:-2 * lag]
+            toe_y = np.pad(toes[..., 1], ((lag, lag), (0, 0)), mode="edge")
+            toe_off_signal = toe_y[:-2 * lag] - toe_y[2 * lag:]
         
-        # Create gait cycles between consecutive peaks
-        gait_cycles = []
-        for i in range(len(peaks) - 1):
-            gait_cycles.append((int(peaks[i]), int(peaks[i + 1])))
+        # Same-foot events are at least one (fast) stride apart
+        distance = max(1, int(round(self.MIN_STRIDE_SECONDS * self.sample_rate)))
+        heel_strikes = {
+            side: self._peak_frames(heel_strike_signal[:, i], distance)
+            for i, side in enumerate(GaitEvents.SIDES)
+        }
+        toe_offs = {
+            side: self._peak_frames(toe_off_signal[:, i], distance)
+            for i, side in enumerate(GaitEvents.SIDES)
+        }
+        
+        return GaitEvents(heel_strikes, toe_offs, heels, self.sample_rate, total_frames, view)
+    
+    def detect_gait_events(self, keypoints: KeypointInput) -> "GaitEvents":
+        """Heel-strike and toe-off frames of both feet, computed once per session."""
+        tensor = self._as_tensor(keypoints)
+        return self.events_from_landmarks(tensor.xyz[:, self.EVENT_LANDMARKS], len(tensor))
+    
+    def detect_gait_cycles(self, keypoints: KeypointInput) -> List[Tuple[int, int]]:
+        """
+        Detect gait cycles of the left foot.
+        Returns list of (start_frame, end_frame) between consecutive heel strikes.
+        """
+        return self.detect_gait_events(keypoints).strides("left")
+    
+    def stride_length_from_events(self, events: "GaitEvents") -> Optional[float]:
+        """Mean heel displacement between consecutive same-foot heel strikes."""
+        lengths = [
+            np.linalg.norm(np.diff(events.heel_positions[strikes, i], axis=0), axis=1)
+            for i, strikes in enumerate(events.heel_strikes.values())
+        ]
+        lengths = np.concatenate(lengths)
+        if len(lengths) < 2:
+            return None
         
-        return gait_cycles
+        return float(np.mean(lengths))
     
-    def calculate_stride_length(self, keypoints: List[List[List[float]]]) -> Optional[float]:
+    def calculate_stride_length(self, keypoints: KeypointInput) -> Optional[float]:
         """
         Calculate average stride length in normalized units.
         Stride = distance between consecutive same-foot ground contact.
         """
-        gait_cycles = self.detect_gait_cycles(keypoints)
-        
-        if len(gait_cycles) < 2:
+        return self.stride_length_from_events(self.detect_gait_events(keypoints))
+    
+    def cadence_from_events(self, events: "GaitEvents") -> Optional[float]:
+        """Steps per minute from step times, or from stride times if steps alternate nowhere."""
+        if events.total_frames * self.frame_duration < 1.0:
             return None
         
-        stride_lengths = []
-        
-        for start, end in gait_cycles:
-            if start < len(keypoints) and end < len(keypoints):
-                left_ankle_start = keypoints[start][self.LEFT_ANKLE]
-                left_ankle_end = keypoints[end][self.LEFT_ANKLE]
-                
-                stride = self.calculate_distance(left_ankle_start, left_ankle_end)
-                stride_lengths.append(stride)
+        step_times, _ = events.step_times()
+        if len(step_times):
+            return float(60.0 / step_times.mean())
         
-        if stride_lengths:
-            return np.mean(stride_lengths)
+        stride_times = events.stride_times()
+        if len(stride_times):
+            # One stride is two steps
+            return float(120.0 / stride_times.mean())
         return None
     
-    def calculate_cadence(self, keypoints: List[List[List[float]]]) -> Optional[float]:
+    def calculate_cadence(self, keypoints: KeypointInput) -> Optional[float]:
         """
         Calculate cadence (steps per minute).
         """
-        gait_cycles = self.detect_gait_cycles(keypoints)
+        return self.cadence_from_events(self.detect_gait_events(keypoints))
+    
+    def gait_metrics(self, events: "GaitEvents") -> Dict[str, Optional[float]]:
+        """
+        Stride, cadence, timing variability and asymmetry metrics from one
+        set of gait events.
         
-        if len(gait_cycles) < 1:
-            return None
+        Variabilities are coefficients of variation (std / mean) of stride
+        and step times. Step time asymmetry is |left - right| over their
+        mean (0 = symmetric). Stance ratio is the mean share of a stride
+        between heel strike and the next toe-off of the same foot.
+        """
+        stride_times = events.stride_times()
+        step_times, step_sides = events.step_times()
         
-        # Total duration in seconds
-        total_frames = len(keypoints)
-        total_duration = total_frames * self.frame_duration
+        def variability(times: np.ndarray) -> Optional[float]:
+            if len(times) < 3 or times.mean() <= 0:
+                return None
+            return float(times.std() / times.mean())
         
-        if total_duration < 1.0:
-            return None
+        asymmetry = None
+        left_steps, right_steps = step_times[step_sides == 0], step_times[step_sides == 1]
+        if len(left_steps) and len(right_steps):
+            left_mean, right_mean = left_steps.mean(), right_steps.mean()
+            asymmetry = float(abs(left_mean - right_mean) / ((left_mean + right_mean) / 2))
         
-        # Number of steps
-        num_steps = len(gait_cycles)
+        stance = events.stance_ratios()
         
-        # Steps per minute
-        cadence = (num_steps / total_duration) * 60
+        return {
+            "stride_length": self.stride_length_from_events(events),
+            "cadence": self.cadence_from_events(events),
+            "stride_time_variability": variability(stride_times),
+            "step_time_variability": variability(step_times),
+            "step_time_asymmetry": asymmetry,
+            "stance_ratio": float(stance.mean()) if len(stance) else None
+        }
+    
+    def limb_lengths(self, keypoints: KeypointInput) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-frame left and right hip-to-ankle distances."""
+        xyz = self._as_tensor(keypoints).xyz.astype(np.float64)
         
-        return cadence
+        left_distances = np.linalg.norm(xyz[:, self.LEFT_HIP] - xyz[:, self.LEFT_ANKLE], axis=1)
+        right_distances = np.linalg.norm(xyz[:, self.RIGHT_HIP] - xyz[:, self.RIGHT_ANKLE], axis=1)
+        
+        return left_distances, right_distances
+    
+    def symmetry_from_limb_lengths(self, left_mean: float, right_mean: float) -> float:
+        """Symmetry ratio (0-1) of mean left and right limb lengths."""
+        if max(left_mean, right_mean) == 0:
+            return 0.5
+        
+        symmetry = 1.0 - (abs(left_mean - right_mean) / max(left_mean, right_mean))
+        return float(max(0.0, min(1.0, symmetry)))
     
-    def calculate_gait_symmetry(self, keypoints: List[List[List[float]]]) -> float:
+    def calculate_gait_symmetry(self, keypoints: KeypointInput) -> float:
         """
         Calculate left-right gait symmetry (0-1).
         1.0 = perfectly symmetric, 0.0 = completely asymmetric
         """
-        if len(keypoints) < 10:
-            return 0.5
+        tensor = self._as_tensor(keypoints)
         
-        left_distances = []
-        right_distances = []
-        
-        # Calculate hip-to-ankle distance for each frame
-        for frame_keypoints in keypoints:
-            if len(frame_keypoints) > max(self.LEFT_ANKLE, self.RIGHT_ANKLE, self.LEFT_HIP, self.RIGHT_HIP):
-                left_distance = self.calculate_distance(
-                    frame_keypoints[self.LEFT_HIP],
-                    frame_keypoints[self.LEFT_ANKLE]
-                )
-                right_distance = self.calculate_distance(
-                    frame_keypoints[self.RIGHT_HIP],
-                    frame_keypoints[self.RIGHT_ANKLE]
-                )
-                
-                left_distances.append(left_distance)
-                right_distances.append(right_distance)
-        
-        if not left_distances or not right_distances:
+        if len(tensor) < 10:
             return 0.5
         
-        left_mean = np.mean(left_distances)
-        right_mean = np.mean(right_distances)
+        # Hip-to-ankle distance for each frame
+        left_distances, right_distances = self.limb_lengths(tensor)
         
-        # Symmetry ratio (0-1)
-        if max(left_mean, right_mean) == 0:
-            return 0.5
+        return self.symmetry_from_limb_lengths(np.mean(left_distances), np.mean(right_distances))
+    
+    def calculate_joint_velocities(self, keypoints: KeypointInput) -> np.ndarray:
+        """
+        Frame-to-frame speed of every joint.
+        Returns (frames - 1, 33) array in normalized units per second.
+        """
+        tensor = self._as_tensor(keypoints)
         
-        symmetry = 1.0 - (abs(left_mean - right_mean) / max(left_mean, right_mean))
-        return max(0.0, min(1.0, symmetry))
+        if len(tensor) < 2:
+            return np.zeros((0, tensor.NUM_LANDMARKS))
+        
+        displacements = np.diff(tensor.xyz.astype(np.float64), axis=0)
+        return np.linalg.norm(displacements, axis=2) / self.frame_duration
     
-    def calculate_bradykinesia_score(self, keypoints: List[List[List[float]]]) -> float:
+    def calculate_velocity_statistics(self, keypoints: KeypointInput) -> Optional[Dict]:
         """
-        Calculate bradykinesia (slowness of movement) score (0-1).
-        Based on velocity of movement between frames.
+        Per-joint velocity statistics for bradykinesia assessment.
+        
+        Returns per-joint mean/std velocity, the distal-to-proximal
+        velocity ratio (distal slowing) and the decrement of movement
+        speed between the first and last third of the session.
         """
-        if len(keypoints) < 5:
-            return 0.5
+        velocities = self.calculate_joint_velocities(keypoints)
         
-        # Calculate movement velocity
+        if len(velocities) < 4:
+            return None
+        
+        joint_means = velocities.mean(axis=0)
+        frame_means = velocities.mean(axis=1)
+        
+        proximal_mean = float(joint_means[self.PROXIMAL_JOINTS].mean())
+        distal_mean = float(joint_means[self.DISTAL_JOINTS].mean())
+        distal_proximal_ratio = distal_mean / proximal_mean if proximal_mean > 0 else None
+        
+        # Sequence effect: progressive slowing over the session
+        third = len(frame_means) // 3
+        early_velocity = float(frame_means[:third].mean())
+        late_velocity = float(frame_means[-third:].mean())
+        velocity_decrement = (early_velocity - late_velocity) / early_velocity if early_velocity > 0 else 0.0
+        
+        # Linear trend of mean velocity in units/s per second
+        times = np.arange(len(frame_means)) * self.frame_duration
+        velocity_trend = float(np.polyfit(times, frame_means, 1)[0])
+        
+        return {
+            "joint_mean_velocity": joint_means.tolist(),
+            "joint_std_velocity": velocities.std(axis=0).tolist(),
+            "mean_velocity": float(frame_means.mean()),
+            "std_velocity": float(frame_means.std()),
+            "proximal_mean_velocity": proximal_mean,
+            "distal_mean_velocity": distal_mean,
+            "distal_proximal_ratio": distal_proximal_ratio,
+            "early_velocity": early_velocity,
+            "late_velocity": late_velocity,
+            "velocity_decrement": velocity_decrement,
+            "velocity_trend": velocity_trend
+        }
+    
+    def _frame_velocities_loop(self, keypoints: List[List[List[float]]]) -> List[float]:
+        """Reference per-frame mean joint velocity using scalar distance calls."""
         velocities = []
         
         for i in range(1, len(keypoints)):
@@ -168,16 +385,38 @@ class GaitAnalyzer:
                 frame_velocity /= point_count
                 velocities.append(frame_velocity)
         
-        if not velocities:
+        return velocities
+    
+    def calculate_bradykinesia_score(self, keypoints: KeypointInput, vectorized: bool = True) -> float:
+        """
+        Calculate bradykinesia (slowness of movement) score (0-1).
+        Based on velocity of movement between frames.
+        
+        vectorized=False runs the original per-joint scalar loop and is
+        kept as a numerical reference for benchmarks.
+        """
+        tensor = self._as_tensor(keypoints)
+        
+        if len(tensor) < 5:
             return 0.5
         
-        mean_velocity = np.mean(velocities)
-        std_velocity = np.std(velocities)
+        # Calculate movement velocity
+        if vectorized:
+            velocities = self.calculate_joint_velocities(tensor).mean(axis=1)
+        else:
+            velocities = self._frame_velocities_loop(tensor.xyz.tolist())
+        
+        if len(velocities) == 0:
+            return 0.5
         
+        return self.bradykinesia_from_velocity(np.mean(velocities))
+    
+    def bradykinesia_from_velocity(self, mean_velocity: float) -> float:
+        """Map mean joint velocity to a bradykinesia score (0-1)."""
         # Normalized bradykinesia score (0-1)
         # Higher score = more slowness (bradykinesia)
         # Assuming normal velocity range is 0.05-0.5
         normalized_velocity = mean_velocity / 0.5
         bradykinesia_score = 1.0 / (1.0 + normalized_velocity)
         
-        return max(0.0, min(1.0, bradykinesia_score))
+        return float(max(0.0, min(1.0, bradykinesia_score)))
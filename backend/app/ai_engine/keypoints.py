@@ -0,0 +1,213 @@
+import numpy as np
+import struct
+from typing import Any, Iterable, List, Optional, Sequence, Union
+
+
+class KeypointTensor:
+    """
+    Columnar pose data shared by every analyzer in the AI engine.
+
+    Holds a (frames, 33, 4) float32 array of x, y, z and visibility so a
+    session is converted and validated once instead of every analyzer
+    walking nested Python lists again.
+    """
+
+    NUM_LANDMARKS = 33
+    NUM_CHANNELS = 4
+
+    # Binary wire format: 16-byte little-endian header followed by
+    # frames x landmarks x channels float32 values (see from_bytes)
+    WIRE_MAGIC = b"NSPF"
+    WIRE_VERSION = 1
+    WIRE_HEADER = struct.Struct("<4sBBHIf")
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        sample_rate: float = 30.0,
+        timestamps: Optional[np.ndarray] = None
+    ):
+        data = np.asarray(data, dtype=np.float32)
+        if data.ndim != 3 or data.shape[1:] != (self.NUM_LANDMARKS, self.NUM_CHANNELS):
+            raise ValueError(
+                f"Keypoint tensor must have shape (frames, {self.NUM_LANDMARKS}, "
+                f"{self.NUM_CHANNELS}), got {data.shape}"
+            )
+        if sample_rate <= 0:
+            raise ValueError("sample_rate must be positive")
+        if timestamps is not None:
+            timestamps = np.asarray(timestamps, dtype=np.float64)
+            if timestamps.shape != (data.shape[0],):
+                raise ValueError("timestamps must have one entry per frame")
+
+        self.data = data
+        self.sample_rate = float(sample_rate)
+        self.timestamps = timestamps
+
+    @classmethod
+    def from_frames(
+        cls,
+        frames: Sequence[Sequence[Sequence[float]]],
+        sample_rate: float = 30.0,
+        visibility: Optional[Sequence[float]] = None,
+        timestamps: Optional[Sequence[float]] = None
+    ) -> "KeypointTensor":
+        """
+        Build a tensor from nested keypoint lists.
+
+        Each landmark may be [x, y, z] or [x, y, z, visibility]. When
+        visibility is missing it is taken from the per-frame `visibility`
+        sequence, defaulting to 1.0.
+        """
+        if len(frames) == 0:
+            return cls(np.zeros((0, cls.NUM_LANDMARKS, cls.NUM_CHANNELS)), sample_rate, timestamps)
+
+        try:
+            raw = np.asarray(frames, dtype=np.float32)
+        except ValueError:
+            raise ValueError("All pose frames must contain the same number of landmarks")
+
+        if raw.ndim != 3 or raw.shape[1] != cls.NUM_LANDMARKS or raw.shape[2] not in (3, 4):
+            raise ValueError(
+                f"Pose frames must contain {cls.NUM_LANDMARKS} landmarks of 3 or 4 values, "
+                f"got shape {raw.shape}"
+            )
+
+        if raw.shape[2] == 4:
+            data = raw
+        else:
+            data = np.empty((raw.shape[0], cls.NUM_LANDMARKS, cls.NUM_CHANNELS), dtype=np.float32)
+            data[:, :, :3] = raw
+            if visibility is not None:
+                data[:, :, 3] = np.asarray(visibility, dtype=np.float32)[:, None]
+            else:
+                data[:, :, 3] = 1.0
+
+        return cls(data, sample_rate, timestamps)
+
+    @classmethod
+    def from_pose_frames(cls, pose_frames: Iterable[Any], sample_rate: float = 30.0) -> "KeypointTensor":
+        """
+        Build a tensor from PoseFrame models or their dict form.
+
+        Visibility comes only from landmarks sent as [x, y, z, visibility].
+        PoseFrame.confidence is a whole-frame score, so it is not copied onto
+        every landmark (where it would mask all of them together); landmarks
+        sent as [x, y, z] get visibility 1.0.
+        """
+        keypoints: List[List[List[float]]] = []
+        timestamps: List[float] = []
+
+        for frame in pose_frames:
+            if isinstance(frame, dict):
+                keypoints.append(frame["keypoints"])
+                timestamps.append(frame.get("timestamp", len(timestamps) / sample_rate))
+            else:
+                keypoints.append(frame.keypoints)
+                timestamps.append(frame.timestamp)
+
+        return cls.from_frames(keypoints, sample_rate, timestamps=timestamps)
+
+    @classmethod
+    def from_bytes(cls, buffer: bytes) -> "KeypointTensor":
+        """
+        Decode the binary pose wire format.
+
+        Header (16 bytes, little-endian): magic b"NSPF", version (uint8),
+        channels per landmark (uint8, 3 or 4), landmark count (uint16),
+        frame count (uint32), fps (float32). The payload is read without
+        copying when it carries 4 channels (x, y, z, visibility).
+        """
+        header_size = cls.WIRE_HEADER.size
+        if len(buffer) < header_size:
+            raise ValueError("Buffer is shorter than the pose frame header")
+
+        magic, version, channels, landmarks, frames, fps = cls.WIRE_HEADER.unpack_from(buffer)
+        if magic != cls.WIRE_MAGIC:
+            raise ValueError("Unrecognized pose frame buffer")
+        if version != cls.WIRE_VERSION:
+            raise ValueError(f"Unsupported pose frame format version {version}")
+        if landmarks != cls.NUM_LANDMARKS or channels not in (3, 4):
+            raise ValueError(f"Expected {cls.NUM_LANDMARKS} landmarks of 3 or 4 values")
+        if not np.isfinite(fps) or fps <= 0:
+            raise ValueError("fps must be positive")
+
+        expected = header_size + frames * landmarks * channels * 4
+        if len(buffer) != expected:
+            raise ValueError(f"Expected {expected} bytes for {frames} frames, got {len(buffer)}")
+
+        values = np.frombuffer(buffer, dtype="<f4", offset=header_size).reshape(frames, landmarks, channels)
+        if channels == 4:
+            return cls(values, fps)
+
+        data = np.empty((frames, landmarks, cls.NUM_CHANNELS), dtype=np.float32)
+        data[:, :, :3] = values
+        data[:, :, 3] = 1.0
+        return cls(data, fps)
+
+    def to_bytes(self) -> bytes:
+        """Encode the tensor in the binary pose wire format."""
+        header = self.WIRE_HEADER.pack(
+            self.WIRE_MAGIC,
+            self.WIRE_VERSION,
+            self.NUM_CHANNELS,
+            self.NUM_LANDMARKS,
+            self.num_frames,
+            self.sample_rate
+        )
+        return header + self.data.astype("<f4", copy=False).tobytes()
+
+    @classmethod
+    def coerce(cls, keypoints: "KeypointInput", sample_rate: float = 30.0) -> "KeypointTensor":
+        """Return `keypoints` as a KeypointTensor, converting only when needed."""
+        if isinstance(keypoints, cls):
+            return keypoints
+        if isinstance(keypoints, np.ndarray) and keypoints.ndim == 3 and keypoints.shape[2] == cls.NUM_CHANNELS:
+            return cls(keypoints, sample_rate)
+        return cls.from_frames(keypoints, sample_rate)
+
+    @classmethod
+    def concatenate(cls, chunks: Sequence["KeypointTensor"], sample_rate: float = 30.0) -> "KeypointTensor":
+        """Consecutive chunks as one tensor; timestamps are kept when every chunk has them."""
+        if not chunks:
+            return cls(np.zeros((0, cls.NUM_LANDMARKS, cls.NUM_CHANNELS)), sample_rate)
+
+        timestamps = None
+        if all(chunk.timestamps is not None for chunk in chunks):
+            timestamps = np.concatenate([chunk.timestamps for chunk in chunks])
+
+        return cls(np.concatenate([chunk.data for chunk in chunks]), sample_rate, timestamps)
+
+    def __len__(self) -> int:
+        return self.data.shape[0]
+
+    @property
+    def num_frames(self) -> int:
+        return self.data.shape[0]
+
+    @property
+    def duration(self) -> float:
+        """Recording length in seconds at the nominal sample rate."""
+        return self.num_frames / self.sample_rate
+
+    @property
+    def xyz(self) -> np.ndarray:
+        """(frames, 33, 3) view of landmark coordinates."""
+        return self.data[:, :, :3]
+
+    @property
+    def visibility(self) -> np.ndarray:
+        """(frames, 33) view of landmark visibility."""
+        return self.data[:, :, 3]
+
+    def landmark(self, idx: int) -> np.ndarray:
+        """(frames, 3) coordinates of a single landmark."""
+        return self.data[:, idx, :3]
+
+    def slice(self, start: int, stop: int) -> "KeypointTensor":
+        """Frames [start, stop) as a tensor sharing memory with this one."""
+        timestamps = self.timestamps[start:stop] if self.timestamps is not None else None
+        return KeypointTensor(self.data[start:stop], self.sample_rate, timestamps)
+
+
+KeypointInput = Union[KeypointTensor, np.ndarray, Sequence[Sequence[Sequence[float]]]]
@@ -5,15 +5,48 @@ from typing import List, Tuple, Optional
 class PoseEstimator:
     """Extract human pose keypoints using MediaPipe."""
     
-    def __init__(self):
+    def __init__(self, model_complexity: int = 1):
         self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose(
+        self.model_complexity = model_complexity
+        self.pose = self._create_pose()
+    
+    def _create_pose(self):
+        return self.mp_pose.Pose(
             static_image_mode=False,
-            model_complexity=1,
+            model_complexity=self.model_complexity,
             smooth_landmarks=True,
             min_detection_confidence=0.5,
             min_tracking_confidence=0.5
         )
+    
+    def reset(self):
+        """Drop tracking state so the next frame starts a new, unrelated sequence."""
+        if hasattr(self.pose, "reset"):
+            self.pose.reset()
+        else:
+            self.pose.close()
+            self.pose = self._create_pose()
+    
+    def close(self):
+        self.pose.close()
+    
+    def extract_into(self, frame_rgb: np.ndarray, out: np.ndarray) -> bool:
+        """
+        Run pose estimation on an RGB frame and write the 33 landmarks as
+        [x, y, z, visibility] rows into `out` (a (33, 4) array view).
+        
+        Returns:
+            True if a pose was detected (`out` is left untouched otherwise)
+        """
+        results = self.pose.process(frame_rgb)
+        if not results.pose_landmarks:
+            return False
+        
+        out[:] = [
+            (landmark.x, landmark.y, landmark.z, landmark.visibility)
+            for landmark in results.pose_landmarks.landmark
+        ]
+        return True
         
     def extract_keypoints(self, frame: np.ndarray) -> Optional[Tuple[List[List[float]], float]]:
         """
@@ -45,9 +78,9 @@ class PoseEstimator:
         
         return keypoints, mean_confidence
     
-    def batch_extract_keypoints(self, frames: List[np.ndarray]) -> List[dict]:
+    def batch_extract_keypoints(self, frames: List[np.ndarray], fps: float = 30.0) -> List[dict]:
         """
-        Extract keypoints from multiple frames.
+        Extract keypoints from multiple consecutive frames recorded at `fps`.
         
         Returns:
             List of dictionaries with frame_number, keypoints, confidence
@@ -59,7 +92,7 @@ class PoseEstimator:
                 keypoints, confidence = extraction
                 results.append({
                     "frame_number": idx,
-                    "timestamp": idx / 30.0,  # Assuming 30 FPS
+                    "timestamp": idx / fps,
                     "keypoints": keypoints,
                     "confidence": confidence
                 })
@@ -0,0 +1,235 @@
+"""
+Pose backend registry.
+Each backend is a named factory of estimators exposing extract_into(frame_rgb,
+out), reset() and close(). Estimators are expensive to build (MediaPipe loads
+its model and graph per instance), so every process keeps one PosePool per
+backend and hands instances out on lease instead of constructing new ones per
+video.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+
+class PoseBackendUnavailable(Exception):
+    """Raised when a backend is unknown or its estimators cannot be created."""
+
+
+class SyntheticPoseEstimator:
+    """
+    Model-free backend returning a standing skeleton with a 5 Hz wrist
+    oscillation. Used by benchmarks and for exercising the pipeline where no
+    pose model is installed.
+    """
+
+    # Normalized (x, y) of the 33 MediaPipe landmarks for an upright person
+    TEMPLATE = np.array([
+        (0.50, 0.12), (0.49, 0.11), (0.48, 0.11), (0.47, 0.11), (0.51, 0.11), (0.52, 0.11),
+        (0.53, 0.11), (0.46, 0.12), (0.54, 0.12), (0.49, 0.14), (0.51, 0.14),
+        (0.44, 0.22), (0.56, 0.22), (0.42, 0.34), (0.58, 0.34), (0.41, 0.45), (0.59, 0.45),
+        (0.40, 0.47), (0.60, 0.47), (0.40, 0.48), (0.60, 0.48), (0.41, 0.47), (0.59, 0.47),
+        (0.46, 0.50), (0.54, 0.50), (0.46, 0.68), (0.54, 0.68), (0.46, 0.86), (0.54, 0.86),
+        (0.45, 0.88), (0.55, 0.88), (0.47, 0.90), (0.53, 0.90)
+    ], dtype=np.float32)
+    HAND_LANDMARKS = [15, 16, 17, 18, 19, 20, 21, 22]
+
+    def __init__(self, fps: float = 30.0, tremor_hz: float = 5.0, amplitude: float = 0.004):
+        self.fps = fps
+        self.tremor_hz = tremor_hz
+        self.amplitude = amplitude
+        self.frame = 0
+
+    def reset(self):
+        self.frame = 0
+
+    def close(self):
+        pass
+
+    def extract_into(self, frame_rgb: np.ndarray, out: np.ndarray) -> bool:
+        phase = 2 * np.pi * self.tremor_hz * self.frame / self.fps
+        self.frame += 1
+        out[:, :2] = self.TEMPLATE
+        out[self.HAND_LANDMARKS, 0] += self.amplitude * np.sin(phase)
+        out[:, 2] = 0.0
+        out[:, 3] = 0.99
+        return True
+
+
+def _mediapipe(model_complexity: int) -> Callable[[], Any]:
+    def factory():
+        from .pose import PoseEstimator
+        return PoseEstimator(model_complexity=model_complexity)
+    return factory
+
+
+class PosePool:
+    """
+    Reusable estimators of one backend.
+
+    Instances are created on demand (or ahead of time by warmup), leased to
+    one caller at a time and reset when they come back, so MediaPipe graphs
+    survive across videos. The pool grows past `size` when more estimators
+    are leased at once; only `size` idle instances are kept.
+    """
+
+    # Frame pushed through new instances so lazy graph setup happens at warmup
+    WARMUP_FRAME_SHAPE = (256, 256, 3)
+
+    def __init__(self, name: str, factory: Callable[[], Any], size: int = 1):
+        self.name = name
+        self.factory = factory
+        self.size = max(1, size)
+        self._idle: List[Any] = []
+        self._leased = 0
+        self._lock = threading.Lock()
+        self.state = "cold"
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+
+    def _create(self) -> Any:
+        try:
+            return self.factory()
+        except Exception as e:
+            self.state = "failed"
+            self.error = str(e)
+            raise PoseBackendUnavailable(f"Pose backend '{self.name}' failed to load: {e}") from e
+
+    def warmup(self, count: Optional[int] = None) -> Dict:
+        """Create (and run one frame through) up to `count` idle instances."""
+        count = self.size if count is None else count
+        self.size = max(self.size, count)
+        self.state = "warming"
+        started = time.perf_counter()
+        frame = np.zeros(self.WARMUP_FRAME_SHAPE, dtype=np.uint8)
+        scratch = np.zeros((33, 4), dtype=np.float32)
+        try:
+            while True:
+                with self._lock:
+                    if len(self._idle) + self._leased >= count:
+                        break
+                estimator = self._create()
+                estimator.extract_into(frame, scratch)
+                estimator.reset()
+                with self._lock:
+                    self._idle.append(estimator)
+        except Exception as e:
+            self.state = "failed"
+            self.error = str(e)
+        else:
+            self.state = "ready"
+            self.error = None
+        self.load_seconds = time.perf_counter() - started
+        return self.status()
+
+    @contextmanager
+    def lease(self, count: int = 1) -> Iterator[List[Any]]:
+        """Borrow `count` estimators for the duration of the block."""
+        estimators: List[Any] = []
+        with self._lock:
+            while self._idle and len(estimators) < count:
+                estimators.append(self._idle.pop())
+            self._leased += len(estimators)
+        try:
+            while len(estimators) < count:
+                estimators.append(self._create())
+                with self._lock:
+                    self._leased += 1
+            yield estimators
+        finally:
+            for estimator in estimators:
+                try:
+                    estimator.reset()
+                except Exception:
+                    estimator = None
+                with self._lock:
+                    self._leased -= 1
+                    if estimator is not None and len(self._idle) < self.size:
+                        self._idle.append(estimator)
+                        continue
+                if estimator is not None and hasattr(estimator, "close"):
+                    estimator.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for estimator in idle:
+            if hasattr(estimator, "close"):
+                estimator.close()
+        self.state = "cold"
+
+    def status(self) -> Dict:
+        with self._lock:
+            idle, leased = len(self._idle), self._leased
+        return {
+            "backend": self.name,
+            "state": self.state,
+            "size": self.size,
+            "idle": idle,
+            "leased": leased,
+            "load_seconds": round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            "error": self.error
+        }
+
+
+class PoseBackendRegistry:
+    """Process-wide backend factories and their pools."""
+
+    _factories: Dict[str, Callable[[], Any]] = {
+        "mediapipe-lite": _mediapipe(0),
+        "mediapipe": _mediapipe(1),
+        "mediapipe-heavy": _mediapipe(2),
+        "synthetic": SyntheticPoseEstimator
+    }
+    _pools: Dict[str, PosePool] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def register(cls, name: str, factory: Callable[[], Any]):
+        """Add or replace a backend; an existing pool for it is discarded."""
+        with cls._lock:
+            cls._factories[name] = factory
+            pool = cls._pools.pop(name, None)
+        if pool is not None:
+            pool.close()
+
+    @classmethod
+    def backends(cls) -> List[str]:
+        return sorted(cls._factories)
+
+    @classmethod
+    def pool(cls, name: str, size: int = 1) -> PosePool:
+        """The backend's pool, created on first use and grown to `size`."""
+        with cls._lock:
+            if name not in cls._factories:
+                raise PoseBackendUnavailable(
+                    f"Unknown pose backend '{name}' (available: {', '.join(sorted(cls._factories))})"
+                )
+            pool = cls._pools.get(name)
+            if pool is None:
+                pool = cls._pools[name] = PosePool(name, cls._factories[name], size)
+            pool.size = max(pool.size, size)
+            return pool
+
+    @classmethod
+    def warmup(cls, name: str, size: int = 1) -> Dict:
+        try:
+            return cls.pool(name, size).warmup(size)
+        except PoseBackendUnavailable as e:
+            return {"backend": name, "state": "failed", "error": str(e)}
+
+    @classmethod
+    def status(cls) -> Dict[str, Dict]:
+        with cls._lock:
+            pools = list(cls._pools.values())
+        return {pool.name: pool.status() for pool in pools}
+
+    @classmethod
+    def close(cls):
+        with cls._lock:
+            pools, cls._pools = list(cls._pools.values()), {}
+        for pool in pools:
+            pool.close()
@@ -0,0 +1,234 @@
+import copy
+import numpy as np
+from typing import Dict, Optional, Tuple
+from .keypoints import KeypointTensor, KeypointInput
+from .gait_analysis import GaitAnalyzer
+from .tremor_analysis import TremorAnalyzer
+
+
+class SignalQualityError(ValueError):
+    """Raised when a session has too little valid pose data to analyze."""
+
+    def __init__(self, message: str, report: Optional[Dict] = None):
+        super().__init__(message)
+        self.report = report or {}
+
+    def __reduce__(self):
+        # Keep the report when the error crosses a process pool boundary
+        return (self.__class__, (str(self), self.report))
+
+
+class PosePreprocessor:
+    """
+    Clean a session's keypoints once before any analyzer reads them.
+
+    1. Mask landmarks below `min_visibility` (or non-finite).
+    2. Resample every landmark onto a uniform 1 / sample_rate grid using the
+       frame timestamps, interpolating over masked samples and dropped
+       frames. Gaps longer than `max_gap_seconds` are filled too but stay
+       marked invisible (visibility 0).
+    3. Savitzky-Golay smoothing. Landmarks used for gait get a
+       `smoothing_seconds` window. Tremor landmarks only get a window whose
+       cutoff stays above the tremor band, and no smoothing if the frame
+       rate leaves no room for one (e.g. at 30 fps).
+
+    Sessions whose quality landmarks are visible less than
+    `min_valid_fraction` of the time, or that last less than
+    `min_duration_seconds`, raise SignalQualityError. So do sessions whose
+    timestamps would resample to more than `MAX_RESAMPLE_RATIO` times their
+    frame count (e.g. milliseconds sent as seconds). The raw visibility and
+    timestamp checks run first, so rejected sessions cost almost nothing.
+    """
+
+    # Landmarks whose visibility decides whether a session is usable
+    QUALITY_LANDMARKS = sorted(set(
+        GaitAnalyzer.EVENT_LANDMARKS + GaitAnalyzer.PROXIMAL_JOINTS + GaitAnalyzer.DISTAL_JOINTS
+    ))
+    SAVGOL_ORDER = 2
+    # Smoothing of tremor landmarks must keep this much of the band untouched
+    TREMOR_CUTOFF_MARGIN = 1.5
+    # Largest resampled length allowed per received frame; bounds the grid
+    # (and its memory) when timestamps do not match the declared rate
+    MAX_RESAMPLE_RATIO = 4.0
+
+    def __init__(
+        self,
+        sample_rate: float = 30.0,
+        min_visibility: float = 0.5,
+        max_gap_seconds: float = 0.5,
+        smoothing: bool = True,
+        smoothing_seconds: float = 0.2,
+        min_valid_fraction: float = 0.5,
+        min_duration_seconds: float = 2.0
+    ):
+        self.sample_rate = sample_rate
+        self.min_visibility = min_visibility
+        self.max_gap_seconds = max_gap_seconds
+        self.smoothing = smoothing
+        self.smoothing_seconds = smoothing_seconds
+        self.min_valid_fraction = min_valid_fraction
+        self.min_duration_seconds = min_duration_seconds
+
+    def settings(self) -> Dict:
+        """Parameters that affect the processed tensor (used in cache keys)."""
+        return {
+            "sample_rate": self.sample_rate,
+            "min_visibility": self.min_visibility,
+            "max_gap_seconds": self.max_gap_seconds,
+            "smoothing": self.smoothing,
+            "smoothing_seconds": self.smoothing_seconds,
+            "min_valid_fraction": self.min_valid_fraction,
+            "min_duration_seconds": self.min_duration_seconds
+        }
+
+    def for_sample_rate(self, sample_rate: float) -> "PosePreprocessor":
+        """Copy of this preprocessor for a session recorded at `sample_rate`."""
+        if sample_rate == self.sample_rate:
+            return self
+        preprocessor = copy.copy(self)
+        preprocessor.sample_rate = sample_rate
+        return preprocessor
+
+    def visibility_mask(self, tensor: KeypointTensor) -> np.ndarray:
+        """(frames, 33) True where a landmark is visible enough and finite."""
+        return (tensor.visibility >= self.min_visibility) & np.isfinite(tensor.data).all(axis=2)
+
+    def _frame_times(self, tensor: KeypointTensor) -> Tuple[np.ndarray, np.ndarray]:
+        """Increasing frame times and the frame index each one comes from."""
+        if tensor.timestamps is None:
+            return np.arange(len(tensor)) / self.sample_rate, np.arange(len(tensor))
+        order = np.argsort(tensor.timestamps, kind="stable")
+        times = tensor.timestamps[order]
+        # Duplicate timestamps: keep the first frame
+        keep = np.concatenate([[True], np.diff(times) > 0])
+        return times[keep], order[keep]
+
+    def smoothing_window(self, landmark_group: str = "gait") -> Optional[int]:
+        """
+        Odd Savitzky-Golay window length for a landmark group, or None when
+        smoothing is off or no window fits.
+        """
+        if not self.smoothing:
+            return None
+        order = self.SAVGOL_ORDER
+        if landmark_group == "tremor":
+            # Cutoff of a Savitzky-Golay filter ~ (order + 1) / (3.2 * window - 4.6) * fs
+            cutoff = self.TREMOR_CUTOFF_MARGIN * TremorAnalyzer.TREMOR_FREQ_MAX
+            longest = ((order + 1) * self.sample_rate / cutoff + 4.6) / 3.2
+        else:
+            longest = self.smoothing_seconds * self.sample_rate
+        window = int(longest)
+        if window % 2 == 0:
+            window -= 1
+        return window if window >= order + 2 else None
+
+    def _resample(
+        self,
+        times: np.ndarray,
+        data: np.ndarray,
+        mask: np.ndarray,
+        grid: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Interpolate each landmark's valid samples onto `grid`; returns (data, valid)."""
+        output = np.zeros((len(grid), data.shape[1], data.shape[2]), dtype=np.float64)
+        valid = np.zeros((len(grid), data.shape[1]), dtype=bool)
+
+        for landmark in range(data.shape[1]):
+            sample_times = times[mask[:, landmark]]
+            if len(sample_times) == 0:
+                continue
+            samples = data[mask[:, landmark], landmark].astype(np.float64)
+            for channel in range(data.shape[2]):
+                output[:, landmark, channel] = np.interp(grid, sample_times, samples[:, channel])
+
+            # A grid point is valid when its surrounding valid samples are close enough
+            position = np.searchsorted(sample_times, grid)
+            left = sample_times[np.clip(position - 1, 0, len(sample_times) - 1)]
+            right = sample_times[np.clip(position, 0, len(sample_times) - 1)]
+            exact = np.isclose(right, grid)
+            inside = (position > 0) & (position < len(sample_times))
+            valid[:, landmark] = exact | (inside & (right - left <= self.max_gap_seconds))
+
+        return output, valid
+
+    def _smooth(self, values: np.ndarray) -> Dict[str, Optional[int]]:
+        """Smooth (frames, 33, 3) coordinates in place; returns the windows used."""
+        from scipy.signal import savgol_filter
+
+        tremor = sorted(set(TremorAnalyzer.TREMOR_LANDMARKS))
+        gait = [idx for idx in range(values.shape[1]) if idx not in tremor]
+        windows = {"gait": self.smoothing_window("gait"), "tremor": self.smoothing_window("tremor")}
+
+        for group, landmarks in (("gait", gait), ("tremor", tremor)):
+            window = windows[group]
+            if window is None or len(values) < window:
+                windows[group] = None
+                continue
+            values[:, landmarks] = savgol_filter(values[:, landmarks], window, self.SAVGOL_ORDER, axis=0)
+        return windows
+
+    def _reject(self, reason: str, report: Dict):
+        report["accepted"] = False
+        report["reason"] = reason
+        raise SignalQualityError(reason, report)
+
+    def process(self, keypoints: KeypointInput) -> Tuple[KeypointTensor, Dict]:
+        """
+        Masked, uniformly resampled and smoothed copy of a session.
+        Returns (tensor, quality report); raises SignalQualityError.
+        """
+        tensor = KeypointTensor.coerce(keypoints, self.sample_rate)
+        mask = self.visibility_mask(tensor)
+        raw_valid = float(mask[:, self.QUALITY_LANDMARKS].mean()) if len(tensor) else 0.0
+        report: Dict = {
+            "frames_in": len(tensor),
+            "valid_fraction": round(raw_valid, 4),
+            "accepted": True,
+            "reason": None
+        }
+
+        if len(tensor) < 2:
+            self._reject("Session has fewer than two pose frames", report)
+        if raw_valid < self.min_valid_fraction:
+            self._reject(
+                f"Only {raw_valid:.0%} of key landmarks are visible "
+                f"(minimum {self.min_valid_fraction:.0%})",
+                report
+            )
+
+        times, frames = self._frame_times(tensor)
+        duration = float(times[-1] - times[0])
+        report["duration"] = round(duration, 3)
+        if duration < self.min_duration_seconds:
+            self._reject(
+                f"Session lasts {duration:.1f}s (minimum {self.min_duration_seconds:.1f}s)",
+                report
+            )
+
+        grid_frames = int(np.floor(duration * self.sample_rate + 1e-6)) + 1
+        if grid_frames > self.MAX_RESAMPLE_RATIO * len(times):
+            interval = float(np.median(np.diff(times)))
+            self._reject(
+                f"Frame timestamps span {duration:.1f}s for {len(times)} frames "
+                f"(median interval {interval:.3g}s at {self.sample_rate:g} fps); "
+                f"timestamps must be in seconds",
+                report
+            )
+
+        grid = times[0] + np.arange(grid_frames) / self.sample_rate
+        values, valid = self._resample(times, tensor.data[frames], mask[frames], grid)
+
+        coverage = float(valid[:, self.QUALITY_LANDMARKS].mean())
+        report["frames_out"] = len(grid)
+        report["coverage"] = round(coverage, 4)
+        if coverage < self.min_valid_fraction:
+            self._reject(
+                f"Key landmarks are tracked for only {coverage:.0%} of the session "
+                f"(minimum {self.min_valid_fraction:.0%})",
+                report
+            )
+
+        report["smoothing_windows"] = self._smooth(values[:, :, :3])
+
+        values[:, :, 3] = np.where(valid, values[:, :, 3], 0.0)
+        return KeypointTensor(values, self.sample_rate, grid), report
@@ -0,0 +1,188 @@
+import numpy as np
+from functools import lru_cache
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+from .keypoints import KeypointTensor
+
+
+@lru_cache(maxsize=32)
+def hann_window(length: int) -> np.ndarray:
+    """Symmetric Hann window, cached per signal length."""
+    from scipy.signal import windows
+    window = windows.hann(length)
+    window.setflags(write=False)
+    return window
+
+
+class TremorSpectrum:
+    """
+    Magnitude spectra of several landmarks from one batched FFT.
+
+    Rows of `magnitudes` follow `landmarks`; bins follow `frequencies`
+    (positive frequencies only, normalized by signal length). Windowed
+    spectra also record the session frame the window starts at.
+    """
+
+    def __init__(
+        self,
+        landmarks: Sequence[int],
+        frequencies: np.ndarray,
+        magnitudes: np.ndarray,
+        num_samples: int,
+        start_frame: int = 0
+    ):
+        self.landmarks = list(landmarks)
+        self.frequencies = frequencies
+        self.magnitudes = magnitudes
+        self.num_samples = num_samples
+        self.start_frame = start_frame
+        self._rows: Dict[int, int] = {idx: row for row, idx in enumerate(self.landmarks)}
+
+    def __contains__(self, landmark_idx: int) -> bool:
+        return landmark_idx in self._rows
+
+    def landmark_magnitudes(self, landmark_idx: int) -> np.ndarray:
+        """Magnitude spectrum of one landmark."""
+        if landmark_idx not in self._rows:
+            raise KeyError(f"Landmark {landmark_idx} not in spectrum")
+        return self.magnitudes[self._rows[landmark_idx]]
+
+    def band_peak(self, landmark_idx: int, freq_min: float, freq_max: float) -> Optional[Tuple[float, float]]:
+        """
+        Strongest bin of a landmark inside [freq_min, freq_max].
+        Returns (frequency, magnitude) or None if the band has no bins.
+        """
+        mask = (self.frequencies >= freq_min) & (self.frequencies <= freq_max)
+        if not np.any(mask):
+            return None
+
+        band_magnitudes = self.landmark_magnitudes(landmark_idx)[mask]
+        peak = np.argmax(band_magnitudes)
+        return float(self.frequencies[mask][peak]), float(band_magnitudes[peak])
+
+
+class SpectralEngine:
+    """Compute detrended, Hann-windowed real FFTs for many landmarks at once."""
+
+    def __init__(self, sample_rate: float = 30.0):
+        self.sample_rate = sample_rate
+
+    def oscillation_matrix(self, tensor: KeypointTensor, landmarks: Sequence[int]) -> np.ndarray:
+        """(landmarks, frames) X-Y displacement magnitude of each landmark."""
+        xy = tensor.data[:, landmarks, :2].astype(np.float64)
+        return np.hypot(xy[:, :, 0], xy[:, :, 1]).T
+
+    def spectrum(self, signals: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Magnitude spectrum of each row of `signals` (already detrended).
+        Returns: (frequencies, magnitudes) with one magnitude row per signal.
+        """
+        signals = np.atleast_2d(signals)
+        num_samples = signals.shape[-1]
+        half = num_samples // 2
+
+        windowed = signals * hann_window(num_samples)
+        magnitudes = np.abs(np.fft.rfft(windowed, axis=-1))[:, :half] / num_samples
+        frequencies = np.fft.rfftfreq(num_samples, 1 / self.sample_rate)[:half]
+
+        return frequencies, magnitudes
+
+    def compute(self, tensor: KeypointTensor, landmarks: Sequence[int]) -> TremorSpectrum:
+        """Detrend and transform all `landmarks` of a session in one pass."""
+        return self.compute_from_oscillations(self.oscillation_matrix(tensor, landmarks), landmarks)
+
+    def compute_from_oscillations(self, oscillations: np.ndarray, landmarks: Sequence[int]) -> TremorSpectrum:
+        """Spectrum from a precomputed (landmarks, frames) oscillation matrix."""
+        landmarks = list(landmarks)
+        num_samples = oscillations.shape[-1]
+
+        if num_samples < 4:
+            return TremorSpectrum(landmarks, np.array([]), np.empty((len(landmarks), 0)), num_samples)
+
+        from scipy.signal import detrend
+        frequencies, magnitudes = self.spectrum(detrend(oscillations, axis=-1))
+
+        return TremorSpectrum(landmarks, frequencies, magnitudes, num_samples)
+
+    def iter_windows(
+        self,
+        tensor: KeypointTensor,
+        landmarks: Sequence[int],
+        window_size: int,
+        hop_size: int
+    ) -> Iterator[TremorSpectrum]:
+        """Short-time spectra of a whole session, computed chunk by chunk."""
+        spectrogram = SlidingSpectrogram(landmarks, self.sample_rate, window_size, hop_size)
+        chunk_size = hop_size * SlidingSpectrogram.WINDOWS_PER_BLOCK
+
+        for start in range(0, len(tensor), chunk_size):
+            yield from spectrogram.push(tensor.slice(start, start + chunk_size))
+
+
+class SlidingSpectrogram:
+    """
+    Short-time (STFT) spectra over a stream of pose frames.
+
+    Frames are pushed in arbitrary chunks; every complete window of
+    `window_size` frames, advancing by `hop_size`, is detrended,
+    Hann-windowed and yielded as a TremorSpectrum. Only the frames still
+    needed by future windows are buffered, so memory is bounded by the
+    window length regardless of session length.
+    """
+
+    WINDOWS_PER_BLOCK = 64
+
+    def __init__(self, landmarks: Sequence[int], sample_rate: float, window_size: int, hop_size: int):
+        if window_size < 4:
+            raise ValueError("window_size must be at least 4 frames")
+        if hop_size < 1:
+            raise ValueError("hop_size must be at least 1 frame")
+
+        self.landmarks = list(landmarks)
+        self.window_size = window_size
+        self.hop_size = hop_size
+        self._engine = SpectralEngine(sample_rate)
+        self._buffer = np.empty((len(self.landmarks), 0))
+        self._buffer_start = 0
+        self._next_window = 0
+
+    @property
+    def frames_seen(self) -> int:
+        return self._buffer_start + self._buffer.shape[1]
+
+    def push(self, tensor: KeypointTensor) -> Iterator[TremorSpectrum]:
+        """Append frames and yield every window they complete."""
+        from scipy.signal import detrend
+
+        if len(tensor):
+            oscillations = self._engine.oscillation_matrix(tensor, self.landmarks)
+            self._buffer = np.concatenate([self._buffer, oscillations], axis=1)
+
+        while True:
+            offset = self._next_window - self._buffer_start
+            available = (self._buffer.shape[1] - offset - self.window_size) // self.hop_size + 1
+            if available <= 0:
+                break
+
+            count = min(available, self.WINDOWS_PER_BLOCK)
+            span = self._buffer[:, offset:offset + (count - 1) * self.hop_size + self.window_size]
+            windows = np.lib.stride_tricks.sliding_window_view(span, self.window_size, axis=1)[:, ::self.hop_size]
+            frequencies, magnitudes = self._engine.spectrum(
+                detrend(windows.reshape(-1, self.window_size), axis=-1)
+            )
+            magnitudes = magnitudes.reshape(len(self.landmarks), count, -1)
+
+            for i in range(count):
+                yield TremorSpectrum(
+                    self.landmarks,
+                    frequencies,
+                    magnitudes[:, i],
+                    self.window_size,
+                    start_frame=self._next_window
+                )
+                self._next_window += self.hop_size
+
+        # Keep only frames that a future window can still use
+        drop = min(self._next_window - self._buffer_start, self._buffer.shape[1])
+        if drop > 0:
+            self._buffer = self._buffer[:, drop:]
+            self._buffer_start += drop
@@ -1,6 +1,9 @@
 import numpy as np
-from scipy import signal
-from typing import List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple, Union
+from .keypoints import KeypointTensor, KeypointInput
+from .spectral import SpectralEngine, TremorSpectrum
+
+SpectrumInput = Union[TremorSpectrum, KeypointInput]
 
 class TremorAnalyzer:
     """Analyze tremor from pose keypoint oscillations."""
@@ -10,27 +13,41 @@ class TremorAnalyzer:
     RIGHT_WRIST = 16
     LEFT_HAND = 17
     RIGHT_HAND = 18
+    LEFT_INDEX = 19
+    RIGHT_INDEX = 20
+    LEFT_THUMB = 21
+    RIGHT_THUMB = 22
+    NOSE = 0
+    
+    # Landmarks transformed together by compute_spectrum
+    TREMOR_LANDMARKS = [
+        LEFT_WRIST, RIGHT_WRIST, LEFT_HAND, RIGHT_HAND,
+        LEFT_INDEX, RIGHT_INDEX, LEFT_THUMB, RIGHT_THUMB, NOSE
+    ]
     
     # Frequency range for Parkinson's tremor (Hz)
     TREMOR_FREQ_MIN = 4.0
     TREMOR_FREQ_MAX = 12.0
     
+    # Per-window tremor presence: band peak must clear an absolute floor
+    # and stand out from the rest of the window spectrum
+    WINDOW_TREMOR_MIN_AMPLITUDE = 0.002
+    WINDOW_TREMOR_PROMINENCE = 3.0
+    
     def __init__(self, sample_rate: float = 30.0):
         self.sample_rate = sample_rate
         self.nyquist_freq = sample_rate / 2.0
+        self.spectral_engine = SpectralEngine(sample_rate)
     
-    def extract_oscillation_sequence(self, keypoints: List[List[List[float]]], landmark_idx: int) -> np.ndarray:
+    def _as_tensor(self, keypoints: KeypointInput) -> KeypointTensor:
+        return KeypointTensor.coerce(keypoints, self.sample_rate)
+    
+    def extract_oscillation_sequence(self, keypoints: KeypointInput, landmark_idx: int) -> np.ndarray:
         """Extract X-Y oscillation magnitude sequence from a landmark."""
-        oscillations = []
-        
-        for frame_keypoints in keypoints:
-            if len(frame_keypoints) > landmark_idx:
-                landmark = frame_keypoints[landmark_idx]
-                # Use magnitude of X-Y displacement
-                magnitude = np.sqrt(landmark[0]**2 + landmark[1]**2)
-                oscillations.append(magnitude)
+        landmark = self._as_tensor(keypoints).landmark(landmark_idx).astype(np.float64)
         
-        return np.array(oscillations)
+        # Use magnitude of X-Y displacement
+        return np.hypot(landmark[:, 0], landmark[:, 1])
     
     def calculate_fft_spectrum(self, signal_data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -40,86 +57,58 @@ class TremorAnalyzer:
         if len(signal_data) < 4:
             return np.array([]), np.array([])
         
-        # Apply Hann window to reduce spectral leakage
-        windowed_signal = signal_data * signal.hann(len(signal_data))
-        
-        # Compute FFT
-        fft_values = np.fft.fft(windowed_signal)
-        magnitudes = np.abs(fft_values) / len(signal_data)
-        
-        # Only positive frequencies
-        frequencies = np.fft.fftfreq(len(signal_data), 1/self.sample_rate)[:len(signal_data)//2]
-        magnitudes = magnitudes[:len(signal_data)//2]
-        
-        return frequencies, magnitudes
+        frequencies, magnitudes = self.spectral_engine.spectrum(signal_data)
+        return frequencies, magnitudes[0]
     
-    def extract_tremor_frequency(self, keypoints: List[List[List[float]]], wrist_idx: int) -> Optional[float]:
+    def compute_spectrum(self, keypoints: KeypointInput, landmarks: Optional[Sequence[int]] = None) -> TremorSpectrum:
+        """
+        Compute the spectra of all tremor landmarks in one batched FFT.
+        The result can be passed to every query method in place of keypoints.
+        """
+        if landmarks is None:
+            landmarks = self.TREMOR_LANDMARKS
+        return self.spectral_engine.compute(self._as_tensor(keypoints), landmarks)
+    
+    def _as_spectrum(self, keypoints: SpectrumInput, landmarks: Sequence[int]) -> TremorSpectrum:
+        if isinstance(keypoints, TremorSpectrum):
+            return keypoints
+        return self.compute_spectrum(keypoints, landmarks)
+    
+    def extract_tremor_frequency(self, keypoints: SpectrumInput, wrist_idx: int) -> Optional[float]:
         """
         Extract dominant tremor frequency from wrist position.
         Returns frequency in Hz or None if no tremor detected.
         """
-        # Extract oscillation sequence
-        oscillations = self.extract_oscillation_sequence(keypoints, wrist_idx)
-        
-        if len(oscillations) < 10:
-            return None
-        
-        # Detrend the signal
-        oscillations = signal.detrend(oscillations)
-        
-        # Calculate FFT
-        frequencies, magnitudes = self.calculate_fft_spectrum(oscillations)
+        spectrum = self._as_spectrum(keypoints, [wrist_idx])
         
-        if len(frequencies) == 0:
+        if spectrum.num_samples < 10:
             return None
         
-        # Filter to tremor frequency range
-        tremor_mask = (frequencies >= self.TREMOR_FREQ_MIN) & (frequencies <= self.TREMOR_FREQ_MAX)
-        
-        if not np.any(tremor_mask):
+        # Frequency with highest magnitude in tremor range
+        peak = spectrum.band_peak(wrist_idx, self.TREMOR_FREQ_MIN, self.TREMOR_FREQ_MAX)
+        if peak is None:
             return None
         
-        tremor_frequencies = frequencies[tremor_mask]
-        tremor_magnitudes = magnitudes[tremor_mask]
-        
-        if len(tremor_frequencies) == 0:
-            return None
-        
-        # Return frequency with highest magnitude in tremor range
-        dominant_idx = np.argmax(tremor_magnitudes)
-        return float(tremor_frequencies[dominant_idx])
+        return peak[0]
     
-    def extract_tremor_amplitude(self, keypoints: List[List[List[float]]], wrist_idx: int) -> Optional[float]:
+    def extract_tremor_amplitude(self, keypoints: SpectrumInput, wrist_idx: int) -> Optional[float]:
         """
         Extract tremor amplitude (magnitude) from wrist position.
         Returns amplitude in normalized units or None.
         """
-        oscillations = self.extract_oscillation_sequence(keypoints, wrist_idx)
-        
-        if len(oscillations) < 5:
-            return None
-        
-        # Detrend
-        oscillations = signal.detrend(oscillations)
-        
-        # Calculate FFT
-        frequencies, magnitudes = self.calculate_fft_spectrum(oscillations)
+        spectrum = self._as_spectrum(keypoints, [wrist_idx])
         
-        if len(frequencies) == 0:
+        if spectrum.num_samples < 5:
             return None
         
         # Get magnitude in tremor range
-        tremor_mask = (frequencies >= self.TREMOR_FREQ_MIN) & (frequencies <= self.TREMOR_FREQ_MAX)
-        
-        if not np.any(tremor_mask):
+        peak = spectrum.band_peak(wrist_idx, self.TREMOR_FREQ_MIN, self.TREMOR_FREQ_MAX)
+        if peak is None:
             return 0.0
         
-        tremor_magnitudes = magnitudes[tremor_mask]
-        amplitude = np.max(tremor_magnitudes)
-        
-        return float(amplitude)
+        return peak[1]
     
-    def detect_resting_tremor(self, keypoints: List[List[List[float]]]) -> Tuple[bool, float]:
+    def detect_resting_tremor(self, keypoints: SpectrumInput) -> Tuple[bool, float]:
         """
         Detect if resting tremor is present.
         Returns: (is_tremor_present, confidence)
@@ -128,48 +117,126 @@ class TremorAnalyzer:
         - 4-6 Hz frequency
         - Present at rest (low overall movement)
         """
-        # Extract both wrists
-        left_oscillations = self.extract_oscillation_sequence(keypoints, self.LEFT_WRIST)
-        right_oscillations = self.extract_oscillation_sequence(keypoints, self.RIGHT_WRIST)
+        spectrum = self._as_spectrum(keypoints, [self.LEFT_WRIST, self.RIGHT_WRIST])
         
-        if len(left_oscillations) < 10 or len(right_oscillations) < 10:
+        if spectrum.num_samples < 10:
             return False, 0.0
         
-        frequencies_left, magnitudes_left = self.calculate_fft_spectrum(signal.detrend(left_oscillations))
-        frequencies_right, magnitudes_right = self.calculate_fft_spectrum(signal.detrend(right_oscillations))
-        
         # Check for resting tremor frequency (4-6 Hz)
         resting_freq_min, resting_freq_max = 4.0, 6.0
         
-        tremor_mask_left = (frequencies_left >= resting_freq_min) & (frequencies_left <= resting_freq_max)
-        tremor_mask_right = (frequencies_right >= resting_freq_min) & (frequencies_right <= resting_freq_max)
-        
         confidence = 0.0
         
-        if np.any(tremor_mask_left):
-            left_amplitude = np.max(magnitudes_left[tremor_mask_left])
-            confidence += left_amplitude / 2.0
-        
-        if np.any(tremor_mask_right):
-            right_amplitude = np.max(magnitudes_right[tremor_mask_right])
-            confidence += right_amplitude / 2.0
+        for wrist_idx in (self.LEFT_WRIST, self.RIGHT_WRIST):
+            peak = spectrum.band_peak(wrist_idx, resting_freq_min, resting_freq_max)
+            if peak is not None:
+                confidence += peak[1] / 2.0
         
         is_present = confidence > 0.05
         
         return is_present, min(1.0, confidence)
     
-    def calculate_tremor_score(self, keypoints: List[List[List[float]]]) -> float:
+    def calculate_tremor_score(self, keypoints: SpectrumInput) -> float:
         """
         Calculate overall tremor severity score (0-1).
         """
-        tremor_freq_left = self.extract_tremor_frequency(keypoints, self.LEFT_WRIST)
-        tremor_freq_right = self.extract_tremor_frequency(keypoints, self.RIGHT_WRIST)
+        spectrum = self._as_spectrum(keypoints, [self.LEFT_WRIST, self.RIGHT_WRIST])
         
-        tremor_amp_left = self.extract_tremor_amplitude(keypoints, self.LEFT_WRIST) or 0.0
-        tremor_amp_right = self.extract_tremor_amplitude(keypoints, self.RIGHT_WRIST) or 0.0
+        tremor_amp_left = self.extract_tremor_amplitude(spectrum, self.LEFT_WRIST) or 0.0
+        tremor_amp_right = self.extract_tremor_amplitude(spectrum, self.RIGHT_WRIST) or 0.0
         
         # Normalize amplitude (assuming max expected is 0.5)
         amp_score = (tremor_amp_left + tremor_amp_right) / 2.0
         amp_score = min(1.0, amp_score / 0.5)
         
         return amp_score
+
+    
+    def iter_spectrogram(
+        self,
+        keypoints: KeypointInput,
+        window_seconds: float = 4.0,
+        hop_seconds: float = 1.0,
+        landmarks: Optional[Sequence[int]] = None
+    ) -> Iterator[TremorSpectrum]:
+        """
+        Stream short-time spectra (STFT) of the tremor landmarks.
+        Each yielded TremorSpectrum covers one window and can be passed to
+        the frequency/amplitude query methods.
+        """
+        if landmarks is None:
+            landmarks = self.TREMOR_LANDMARKS
+        
+        window_size = int(round(window_seconds * self.sample_rate))
+        hop_size = max(1, int(round(hop_seconds * self.sample_rate)))
+        
+        yield from self.spectral_engine.iter_windows(self._as_tensor(keypoints), landmarks, window_size, hop_size)
+    
+    def window_tremor_metrics(self, window: TremorSpectrum, landmark_idx: int) -> Dict:
+        """Dominant tremor frequency, amplitude and presence for one window."""
+        peak = window.band_peak(landmark_idx, self.TREMOR_FREQ_MIN, self.TREMOR_FREQ_MAX)
+        if peak is None:
+            return {"frequency": None, "amplitude": 0.0, "tremor_present": False}
+        
+        frequency, amplitude = peak
+        # Skip the DC bin when estimating the spectral floor
+        floor = float(np.median(window.landmark_magnitudes(landmark_idx)[1:]))
+        is_present = (
+            amplitude >= self.WINDOW_TREMOR_MIN_AMPLITUDE and
+            amplitude >= self.WINDOW_TREMOR_PROMINENCE * floor
+        )
+        
+        return {"frequency": frequency, "amplitude": amplitude, "tremor_present": bool(is_present)}
+    
+    def iter_tremor_windows(
+        self,
+        keypoints: KeypointInput,
+        window_seconds: float = 4.0,
+        hop_seconds: float = 1.0,
+        landmarks: Optional[Sequence[int]] = None
+    ) -> Iterator[Dict]:
+        """
+        Stream time-resolved tremor metrics (Welch/STFT style).
+        Yields one dict per window with start/end time and per-landmark
+        dominant frequency, amplitude and tremor presence.
+        """
+        if landmarks is None:
+            landmarks = [self.LEFT_WRIST, self.RIGHT_WRIST]
+        
+        for window in self.iter_spectrogram(keypoints, window_seconds, hop_seconds, landmarks):
+            start_time = window.start_frame / self.sample_rate
+            yield {
+                "start_time": start_time,
+                "end_time": start_time + window.num_samples / self.sample_rate,
+                "landmarks": {idx: self.window_tremor_metrics(window, idx) for idx in landmarks}
+            }
+    
+    def summarize_tremor_windows(self, windows: Iterable[Dict]) -> Dict:
+        """
+        Aggregate windows from iter_tremor_windows.
+        Returns per-landmark fraction of time with tremor present, median
+        tremor frequency over tremor windows and mean/max amplitude.
+        """
+        window_count = 0
+        stats: Dict[int, Dict] = {}
+        
+        for window in windows:
+            window_count += 1
+            for idx, metrics in window["landmarks"].items():
+                entry = stats.setdefault(idx, {"present": 0, "frequencies": [], "amplitude_sum": 0.0, "amplitude_max": 0.0})
+                entry["amplitude_sum"] += metrics["amplitude"]
+                entry["amplitude_max"] = max(entry["amplitude_max"], metrics["amplitude"])
+                if metrics["tremor_present"]:
+                    entry["present"] += 1
+                    entry["frequencies"].append(metrics["frequency"])
+        
+        summary = {}
+        for idx, entry in stats.items():
+            summary[idx] = {
+                "tremor_fraction": entry["present"] / window_count,
+                "median_frequency": float(np.median(entry["frequencies"])) if entry["frequencies"] else None,
+                "mean_amplitude": entry["amplitude_sum"] / window_count,
+                "max_amplitude": entry["amplitude_max"]
+            }
+        
+        return {"window_count": window_count, "landmarks": summary}
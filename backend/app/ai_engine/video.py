@@ -0,0 +1,479 @@
+import os
+import queue
+import threading
+import time
+import cv2
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .keypoints import KeypointTensor
+from .pose_backends import PoseBackendRegistry, PosePool
+from .preprocessing import PosePreprocessor, SignalQualityError
+from .tremor_analysis import TremorAnalyzer
+
+
+class VideoPoseResult:
+    """Keypoints of the frames with a detected pose, plus decode statistics."""
+
+    def __init__(
+        self,
+        keypoints: KeypointTensor,
+        frame_numbers: np.ndarray,
+        total_frames: int,
+        fps: float,
+        elapsed: float,
+        processed_frames: Optional[int] = None,
+        interpolated_frames: int = 0
+    ):
+        self.keypoints = keypoints
+        self.frame_numbers = frame_numbers
+        self.total_frames = total_frames
+        self.fps = fps
+        self.elapsed = elapsed
+        self.processed_frames = total_frames if processed_frames is None else processed_frames
+        self.interpolated_frames = interpolated_frames
+
+    @property
+    def detected_frames(self) -> int:
+        return len(self.frame_numbers)
+
+    @property
+    def frames_per_second(self) -> float:
+        """Processing throughput (decoded frames per wall-clock second)."""
+        return self.total_frames / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class RoiTracker:
+    """
+    Run pose estimation on a crop around the previously detected person.
+
+    The crop is kept while the pose stays inside it, so the estimator keeps
+    tracking in one coordinate frame; it is re-centred (and the estimator
+    reset) only when landmarks approach the crop edge or the person is lost.
+    Crops larger than `roi_side` are downscaled, so the processed
+    resolution adapts to how large the person appears. Landmarks are always
+    returned normalized to the full frame.
+    """
+
+    MARGIN = 0.35
+    EDGE = 0.05
+    MIN_VISIBILITY = 0.5
+    MAX_AREA_FRACTION = 0.8
+
+    def __init__(self, roi_side: int = 384):
+        self.roi_side = roi_side
+        self.box: Optional[Tuple[int, int, int, int]] = None
+
+    def reset(self):
+        self.box = None
+
+    def _visible(self, landmarks: np.ndarray) -> np.ndarray:
+        visible = landmarks[:, 3] > self.MIN_VISIBILITY
+        return landmarks[visible] if visible.any() else landmarks
+
+    def _box_around(self, landmarks: np.ndarray, width: int, height: int) -> Optional[Tuple[int, int, int, int]]:
+        points = self._visible(landmarks)
+        xs, ys = points[:, 0] * width, points[:, 1] * height
+        center_x, center_y = (xs.min() + xs.max()) / 2, (ys.min() + ys.max()) / 2
+        side = max(xs.max() - xs.min(), ys.max() - ys.min()) * (1 + 2 * self.MARGIN)
+
+        x0, x1 = int(max(0, center_x - side / 2)), int(min(width, center_x + side / 2))
+        y0, y1 = int(max(0, center_y - side / 2)), int(min(height, center_y + side / 2))
+        if x1 - x0 < 16 or y1 - y0 < 16:
+            return None
+        if (x1 - x0) * (y1 - y0) > self.MAX_AREA_FRACTION * width * height:
+            return None
+        return x0, y0, x1, y1
+
+    def _near_edge(self, landmarks: np.ndarray) -> bool:
+        points = self._visible(landmarks)[:, :2]
+        return bool(np.any(points < self.EDGE) or np.any(points > 1 - self.EDGE))
+
+    def _scaled(self, image: np.ndarray) -> np.ndarray:
+        scale = self.roi_side / max(image.shape[:2])
+        if scale >= 1:
+            return np.ascontiguousarray(image)
+        return cv2.resize(
+            image,
+            (max(1, round(image.shape[1] * scale)), max(1, round(image.shape[0] * scale))),
+            interpolation=cv2.INTER_AREA
+        )
+
+    def process(self, estimator: Any, frame: np.ndarray, out: np.ndarray) -> bool:
+        """Estimate the pose in `frame`, writing full-frame landmarks into `out`."""
+        height, width = frame.shape[:2]
+
+        if self.box is not None:
+            x0, y0, x1, y1 = self.box
+            if estimator.extract_into(self._scaled(frame[y0:y1, x0:x1]), out):
+                recenter = self._near_edge(out)
+                crop_width, crop_height = x1 - x0, y1 - y0
+                out[:, 0] = (out[:, 0] * crop_width + x0) / width
+                out[:, 1] = (out[:, 1] * crop_height + y0) / height
+                out[:, 2] *= crop_width / width
+                if recenter:
+                    self.box = self._box_around(out, width, height)
+                    estimator.reset()
+                return True
+            # Person left the crop: retry this frame on the full image
+            self.box = None
+            estimator.reset()
+
+        if not estimator.extract_into(frame, out):
+            return False
+
+        self.box = self._box_around(out, width, height)
+        if self.box is not None:
+            # The next frame is a crop, i.e. a new coordinate frame
+            estimator.reset()
+        return True
+
+
+class VideoPoseExtractor:
+    """
+    Extract pose keypoints from a video file with a pool of PoseEstimators.
+
+    One producer thread decodes the video with OpenCV and hands out
+    contiguous segments of `segment_frames` frames round-robin to worker
+    threads, each owning one estimator (MediaPipe releases the GIL while
+    a graph runs). Estimators are leased from the `backend` pool of
+    PoseBackendRegistry, or from a private pool of `estimator_factory`. A worker resets its estimator at every segment start and
+    then sees the segment's frames in order, so landmark tracking and
+    smoothing stay continuous within a segment and never bridge a gap.
+    Landmarks are written straight into a preallocated (frames, 33, 4)
+    array; at most `queue_segments` decoded segments wait per worker.
+
+    With `roi_tracking`, workers estimate on a downscaled crop around the
+    person (RoiTracker). With `motion_threshold` > 0, frames that barely
+    differ from the last processed one are skipped and later filled by
+    linear interpolation; at most max_stride(fps) - 1 frames are skipped in
+    a row so the processed frames still sample the tremor band above its
+    Nyquist rate.
+    """
+
+    # Thumbnail used to measure frame-to-frame motion
+    MOTION_THUMBNAIL = (64, 36)
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        segment_frames: int = 30,
+        max_side: int = 640,
+        queue_segments: int = 2,
+        estimator_factory: Optional[Callable[[], Any]] = None,
+        backend: str = "mediapipe",
+        roi_tracking: bool = True,
+        roi_side: int = 384,
+        motion_threshold: float = 0.0,
+        max_frequency: float = TremorAnalyzer.TREMOR_FREQ_MAX
+    ):
+        if segment_frames < 1:
+            raise ValueError("segment_frames must be at least 1")
+
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.segment_frames = segment_frames
+        self.max_side = max_side
+        self.queue_segments = max(1, queue_segments)
+        self.estimator_factory = estimator_factory
+        self.backend = backend
+        self.roi_tracking = roi_tracking
+        self.roi_side = roi_side
+        self.motion_threshold = motion_threshold
+        self.max_frequency = max_frequency
+        self._own_pool: Optional[PosePool] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> PosePool:
+        if self.estimator_factory is None:
+            return PoseBackendRegistry.pool(self.backend, self.workers)
+        if self._own_pool is None:
+            self._own_pool = PosePool("custom", self.estimator_factory, self.workers)
+        return self._own_pool
+
+    def close(self):
+        """Close estimators of a private pool; registry pools stay warm."""
+        with self._lock:
+            if self._own_pool is not None:
+                self._own_pool.close()
+                self._own_pool = None
+
+    def max_stride(self, fps: float) -> int:
+        """Largest gap between processed frames that keeps fps / gap >= 2 * max_frequency."""
+        return max(1, int(fps // (2 * self.max_frequency)))
+
+    def _motion_thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return cv2.resize(gray, self.MOTION_THUMBNAIL, interpolation=cv2.INTER_AREA).astype(np.int16)
+
+    @staticmethod
+    def _fill_skipped(landmarks: np.ndarray, detected: np.ndarray, skipped: np.ndarray, max_stride: int) -> int:
+        """Interpolate skipped frames between detected neighbours at most `max_stride` apart."""
+        targets = np.flatnonzero(skipped)
+        anchors = np.flatnonzero(detected)
+        if len(targets) == 0 or len(anchors) < 2:
+            return 0
+
+        position = np.searchsorted(anchors, targets)
+        inside = (position > 0) & (position < len(anchors))
+        targets, position = targets[inside], position[inside]
+        left, right = anchors[position - 1], anchors[position]
+        close = (right - left) <= max_stride
+        targets, left, right = targets[close], left[close], right[close]
+
+        weight = ((targets - left) / (right - left)).astype(np.float32)[:, None, None]
+        landmarks[targets] = (1 - weight) * landmarks[left] + weight * landmarks[right]
+        detected[targets] = True
+        return len(targets)
+
+    def _prepare(self, frame: np.ndarray) -> np.ndarray:
+        """Downscale oversized frames and convert BGR to contiguous RGB."""
+        height, width = frame.shape[:2]
+        if self.max_side and max(height, width) > self.max_side:
+            scale = self.max_side / max(height, width)
+            frame = cv2.resize(
+                frame,
+                (max(1, round(width * scale)), max(1, round(height * scale))),
+                interpolation=cv2.INTER_AREA
+            )
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+    def extract(self, path: str) -> VideoPoseResult:
+        """Decode `path` and return keypoints of every frame with a detected pose."""
+        with self._lock, self._pool().lease(self.workers) as estimators:
+            return self._extract(path, estimators)
+
+    def _extract(self, path: str, estimators: List[Any]) -> VideoPoseResult:
+        started = time.perf_counter()
+        capture = cv2.VideoCapture(path)
+        if not capture.isOpened():
+            raise ValueError(f"Cannot open video: {path}")
+
+        fps = capture.get(cv2.CAP_PROP_FPS)
+        if not np.isfinite(fps) or fps <= 0:
+            fps = 30.0
+
+        # Container frame counts can be missing or wrong; segments past the
+        # preallocated capacity are collected separately and appended
+        capacity = max(int(capture.get(cv2.CAP_PROP_FRAME_COUNT)), 0)
+        output = np.zeros((capacity, KeypointTensor.NUM_LANDMARKS, KeypointTensor.NUM_CHANNELS), dtype=np.float32)
+        detected = np.zeros(capacity, dtype=bool)
+        skipped = np.zeros(capacity, dtype=bool)
+        overflow: Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        timestamps: List[float] = []
+        max_stride = self.max_stride(fps)
+        skip_static = self.motion_threshold > 0 and max_stride > 1
+
+        worker_count = len(estimators)
+        queues = [queue.Queue(maxsize=self.queue_segments) for _ in range(worker_count)]
+        stop = threading.Event()
+        errors: List[BaseException] = []
+        decoded = [0]
+
+        def put(target: queue.Queue, item) -> bool:
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            segment = 0
+            frames: List[Optional[np.ndarray]] = []
+            reference = None
+            run = 0
+            try:
+                while not stop.is_set():
+                    ok, frame = capture.read()
+                    if not ok:
+                        break
+                    timestamps.append(capture.get(cv2.CAP_PROP_POS_MSEC) / 1000.0)
+
+                    if skip_static:
+                        thumbnail = self._motion_thumbnail(frame)
+                        # Never skip a segment's first frame or more than max_stride - 1 in a row
+                        if (
+                            frames and reference is not None and run < max_stride - 1
+                            and np.abs(thumbnail - reference).mean() < self.motion_threshold
+                        ):
+                            frames.append(None)
+                            run += 1
+                        else:
+                            frames.append(self._prepare(frame))
+                            reference = thumbnail
+                            run = 0
+                    else:
+                        frames.append(self._prepare(frame))
+
+                    if len(frames) == self.segment_frames:
+                        put(queues[segment % worker_count], (decoded[0], frames))
+                        decoded[0] += len(frames)
+                        segment += 1
+                        frames = []
+                if frames and not stop.is_set():
+                    put(queues[segment % worker_count], (decoded[0], frames))
+                    decoded[0] += len(frames)
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+            finally:
+                capture.release()
+                for target in queues:
+                    # Sentinel; workers drain remaining segments first
+                    while True:
+                        try:
+                            target.put(None, timeout=0.1)
+                            break
+                        except queue.Full:
+                            if stop.is_set():
+                                try:
+                                    target.get_nowait()
+                                except queue.Empty:
+                                    pass
+
+        def consume(worker: int):
+            estimator = estimators[worker]
+            roi = RoiTracker(self.roi_side) if self.roi_tracking else None
+            processed = 0
+            while True:
+                item = queues[worker].get()
+                if item is None:
+                    processed_counts[worker] = processed
+                    return
+                if stop.is_set():
+                    continue
+
+                start, frames = item
+                count = len(frames)
+                try:
+                    if start + count <= capacity:
+                        rows = output[start:start + count]
+                        mask = detected[start:start + count]
+                        skip = skipped[start:start + count]
+                    else:
+                        rows = np.zeros((count,) + output.shape[1:], dtype=np.float32)
+                        mask = np.zeros(count, dtype=bool)
+                        skip = np.zeros(count, dtype=bool)
+                        overflow[start] = (rows, mask, skip)
+
+                    estimator.reset()
+                    if roi is not None:
+                        roi.reset()
+                    for i, frame in enumerate(frames):
+                        if frame is None:
+                            skip[i] = True
+                        elif roi is not None:
+                            mask[i] = roi.process(estimator, frame, rows[i])
+                            processed += 1
+                        else:
+                            mask[i] = estimator.extract_into(frame, rows[i])
+                            processed += 1
+                except BaseException as e:
+                    errors.append(e)
+                    stop.set()
+
+        processed_counts = [0] * worker_count
+        threads = [threading.Thread(target=produce, name="video-decode", daemon=True)]
+        threads += [
+            threading.Thread(target=consume, args=(worker,), name=f"video-pose-{worker}", daemon=True)
+            for worker in range(worker_count)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if errors:
+            raise errors[0]
+
+        total = decoded[0]
+        if overflow:
+            # Overflow segments are contiguous from the first one onwards
+            first = min(overflow)
+            ordered = [overflow[start] for start in sorted(overflow)]
+            landmarks = np.concatenate([output[:first]] + [part[0] for part in ordered])
+            mask = np.concatenate([detected[:first]] + [part[1] for part in ordered])
+            skip = np.concatenate([skipped[:first]] + [part[2] for part in ordered])
+        else:
+            landmarks = output[:total]
+            mask = detected[:total]
+            skip = skipped[:total]
+
+        interpolated = self._fill_skipped(landmarks, mask, skip, max_stride)
+
+        # Container timestamps when they are usable, else the nominal frame rate
+        frame_times = np.asarray(timestamps[:total], dtype=np.float64)
+        if len(frame_times) != total or total < 2 or np.any(np.diff(frame_times) <= 0):
+            frame_times = np.arange(total) / fps
+
+        frame_numbers = np.flatnonzero(mask)
+        keypoints = KeypointTensor(landmarks[mask], fps, frame_times[frame_numbers])
+
+        return VideoPoseResult(
+            keypoints,
+            frame_numbers,
+            total,
+            fps,
+            time.perf_counter() - started,
+            processed_frames=sum(processed_counts),
+            interpolated_frames=interpolated
+        )
+
+
+_extractors: Dict[Tuple, VideoPoseExtractor] = {}
+
+
+def extract_video_session(
+    path: str,
+    workers: Optional[int] = None,
+    segment_frames: int = 30,
+    max_side: int = 640,
+    roi_tracking: bool = True,
+    roi_side: int = 384,
+    motion_threshold: float = 0.0,
+    backend: str = "mediapipe",
+    preprocessor: Optional[PosePreprocessor] = None
+) -> Dict:
+    """
+    Pose keypoints and session features of a video file.
+
+    Module-level so it can run in the analysis process pool; each process
+    keeps its extractor, and the backend pool its warm graphs, between videos.
+    """
+    from .features import extract_session_features
+
+    key = (workers, segment_frames, max_side, roi_tracking, roi_side, motion_threshold, backend)
+    if key not in _extractors:
+        _extractors[key] = VideoPoseExtractor(
+            workers,
+            segment_frames,
+            max_side,
+            backend=backend,
+            roi_tracking=roi_tracking,
+            roi_side=roi_side,
+            motion_threshold=motion_threshold
+        )
+
+    result = _extractors[key].extract(path)
+    features = None
+    signal_quality = None
+    if result.detected_frames:
+        try:
+            features = extract_session_features(result.keypoints, result.fps, preprocessor)
+            signal_quality = features["signal_quality"]
+        except SignalQualityError as e:
+            signal_quality = e.report
+
+    return {
+        "keypoints": result.keypoints,
+        "frame_numbers": result.frame_numbers.tolist(),
+        "total_frames": result.total_frames,
+        "detected_frames": result.detected_frames,
+        "fps": result.fps,
+        "duration": result.total_frames / result.fps,
+        "processing_fps": result.frames_per_second,
+        "processed_frames": result.processed_frames,
+        "interpolated_frames": result.interpolated_frames,
+        "features": features,
+        "signal_quality": signal_quality
+    }
@@ -0,0 +1,270 @@
+"""
+Process pool for CPU-bound AI analysis.
+Keeps GaitAnalyzer/TremorAnalyzer work off the event loop so other requests
+are not blocked while a session is analyzed.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+
+class AnalysisUnavailable(Exception):
+    """Raised when the analysis pool cannot take a job right now (HTTP 503)."""
+
+
+class AnalysisQueueFull(AnalysisUnavailable):
+    """Raised when the analysis queue stays full for longer than the timeout."""
+
+
+class AnalysisWorkerLost(AnalysisUnavailable):
+    """Raised when a job's worker process died twice in a row."""
+
+
+def _init_worker(pose_backend: Optional[str], pose_instances: int):
+    # Runs once in every worker process before it accepts jobs, so each
+    # process holds its own warm pose pool
+    if pose_backend:
+        from app.ai_engine.pose_backends import PoseBackendRegistry
+        PoseBackendRegistry.warmup(pose_backend, pose_instances)
+
+
+def _warmup() -> Dict:
+    # Import the analyzers (and the scipy.signal pieces they load lazily) in
+    # the worker so the first real job does not pay for it
+    import app.ai_engine.features  # noqa: F401
+    import scipy.signal  # noqa: F401
+    from app.ai_engine.pose_backends import PoseBackendRegistry
+    return {"pid": os.getpid(), "pose_backends": PoseBackendRegistry.status()}
+
+
+class AnalysisService:
+    """Managed process pool with bounded queue and latency metrics."""
+
+    executor: Optional[ProcessPoolExecutor] = None
+    workers = 0
+    max_pending = 0
+    queue_timeout = 0.0
+    pose_backend: Optional[str] = None
+    pose_instances = 0
+
+    _slots: Optional[asyncio.Semaphore] = None
+    _pending = 0
+    _running = 0
+    _completed = 0
+    _failed = 0
+    _rejected = 0
+    _restarts = 0
+    _restart_lock: Optional[asyncio.Lock] = None
+    _latencies: deque = deque(maxlen=500)
+    _waits: deque = deque(maxlen=500)
+    _warmup_task: Optional[asyncio.Task] = None
+    _warmup_state = "disabled"
+    _warmup_seconds: Optional[float] = None
+    _warmup_processes: List[Dict] = []
+
+    @classmethod
+    async def start(
+        cls,
+        workers: int,
+        max_pending: int,
+        queue_timeout: float,
+        pose_backend: Optional[str] = None,
+        pose_instances: int = 1
+    ):
+        """
+        Start the pool; workers <= 0 runs jobs inline on the event loop.
+
+        With `pose_backend`, every process that runs jobs preloads a pool of
+        `pose_instances` estimators in the background; see warmup_status().
+        The pose backend only serves video uploads, so a failed preload
+        leaves the service "degraded" but ready.
+        """
+        cls.workers = workers
+        cls.max_pending = max(1, max_pending)
+        cls.queue_timeout = queue_timeout
+        cls.pose_backend = pose_backend
+        cls.pose_instances = max(1, pose_instances)
+        cls._slots = asyncio.Semaphore(cls.max_pending)
+        cls._restart_lock = asyncio.Lock()
+
+        if workers <= 0:
+            print("Analysis service running inline (ANALYSIS_WORKERS=0)")
+        else:
+            cls.executor = cls._create_executor()
+            print(f"Analysis service started with {workers} worker processes")
+
+        cls._warmup_state = "warming"
+        cls._warmup_task = asyncio.create_task(cls._warm())
+
+    @classmethod
+    def _create_executor(cls) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=cls.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(cls.pose_backend, cls.pose_instances)
+        )
+
+    @classmethod
+    async def _restart(cls, broken: ProcessPoolExecutor):
+        """Replace `broken` with a new pool unless another job already did."""
+        async with cls._restart_lock:
+            if cls.executor is not broken:
+                return
+            broken.shutdown(wait=False, cancel_futures=True)
+            cls.executor = cls._create_executor()
+            cls._restarts += 1
+            print(f"Analysis pool restarted after a worker died ({cls._restarts} restarts)")
+
+    @classmethod
+    async def _submit(cls, fn: Callable, *args: Any) -> Any:
+        """
+        Run `fn(*args)` in the pool. A dead worker breaks the whole pool, so
+        the pool is rebuilt and the job retried once before AnalysisWorkerLost.
+        """
+        loop = asyncio.get_running_loop()
+        for _ in range(2):
+            executor = cls.executor
+            try:
+                return await loop.run_in_executor(executor, fn, *args)
+            except BrokenProcessPool:
+                await cls._restart(executor)
+        raise AnalysisWorkerLost("Analysis worker process died; try again")
+
+    @classmethod
+    async def _warm(cls):
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            if cls.executor is not None:
+                results = await asyncio.gather(*[
+                    loop.run_in_executor(cls.executor, _warmup) for _ in range(cls.workers)
+                ])
+            else:
+                if cls.pose_backend:
+                    from app.ai_engine.pose_backends import PoseBackendRegistry
+                    await loop.run_in_executor(
+                        None, PoseBackendRegistry.warmup, cls.pose_backend, cls.pose_instances
+                    )
+                results = [await loop.run_in_executor(None, _warmup)]
+        except Exception as e:
+            print(f"Analysis warmup failed: {e}")
+            cls._warmup_state = "failed"
+            return
+        finally:
+            cls._warmup_seconds = time.perf_counter() - started
+
+        # Several warmup jobs may land on the same process
+        cls._warmup_processes = list({result["pid"]: result for result in results}.values())
+        states = [
+            result["pose_backends"].get(cls.pose_backend, {}).get("state")
+            for result in cls._warmup_processes
+        ] if cls.pose_backend else []
+        cls._warmup_state = "degraded" if "failed" in states else "ready"
+        print(f"Analysis warmup {cls._warmup_state} in {cls._warmup_seconds:.2f}s")
+
+    @classmethod
+    def warmup_status(cls) -> Dict:
+        """Whether workers have loaded the analyzers and pose backend."""
+        return {
+            "state": cls._warmup_state,
+            "ready": cls._warmup_state in ("ready", "degraded"),
+            "pose_backend": cls.pose_backend,
+            "pose_instances": cls.pose_instances,
+            "seconds": round(cls._warmup_seconds, 3) if cls._warmup_seconds is not None else None,
+            "processes": cls._warmup_processes
+        }
+
+    @classmethod
+    async def stop(cls):
+        """Shut down the pool, cancelling jobs that have not started."""
+        if cls._warmup_task is not None:
+            cls._warmup_task.cancel()
+            cls._warmup_task = None
+        if cls.executor is None and cls.pose_backend:
+            from app.ai_engine.pose_backends import PoseBackendRegistry
+            PoseBackendRegistry.close()
+        if cls.executor is not None:
+            cls.executor.shutdown(wait=False, cancel_futures=True)
+            cls.executor = None
+            print("Analysis service stopped")
+
+    @classmethod
+    async def run(cls, fn: Callable, *args: Any) -> Any:
+        """
+        Run `fn(*args)` in the pool and return its result.
+
+        At most `max_pending` jobs are admitted at once; further callers wait
+        up to `queue_timeout` seconds for a slot before AnalysisQueueFull.
+        A job whose worker dies again after a pool restart raises
+        AnalysisWorkerLost.
+        """
+        if cls._slots is None:
+            # Service not started (scripts, one-off jobs): run inline
+            return fn(*args)
+
+        submitted = time.perf_counter()
+        cls._pending += 1
+        try:
+            await asyncio.wait_for(cls._slots.acquire(), timeout=cls.queue_timeout)
+        except asyncio.TimeoutError:
+            cls._rejected += 1
+            raise AnalysisQueueFull(
+                f"Analysis queue full ({cls.max_pending} jobs in progress)"
+            )
+        finally:
+            cls._pending -= 1
+
+        started = time.perf_counter()
+        cls._waits.append(started - submitted)
+        cls._running += 1
+        try:
+            if cls.executor is None:
+                result = fn(*args)
+            else:
+                result = await cls._submit(fn, *args)
+            cls._completed += 1
+            return result
+        except Exception:
+            cls._failed += 1
+            raise
+        finally:
+            cls._running -= 1
+            cls._latencies.append(time.perf_counter() - started)
+            cls._slots.release()
+
+    @classmethod
+    def stats(cls) -> Dict:
+        """Queue depth, throughput counters and job latency percentiles (ms)."""
+        def _summary(samples: deque) -> Dict:
+            if not samples:
+                return {"mean_ms": None, "p50_ms": None, "p95_ms": None}
+            values = np.array(samples) * 1000
+            return {
+                "mean_ms": round(float(values.mean()), 2),
+                "p50_ms": round(float(np.percentile(values, 50)), 2),
+                "p95_ms": round(float(np.percentile(values, 95)), 2)
+            }
+
+        return {
+            "mode": "process_pool" if cls.executor is not None else "inline",
+            "workers": cls.workers,
+            "max_pending": cls.max_pending,
+            # Jobs not yet executing: waiting for a slot or for a free worker
+            "queue_depth": cls._pending + max(0, cls._running - max(cls.workers, 1)),
+            "in_flight": cls._running,
+            "completed": cls._completed,
+            "failed": cls._failed,
+            "rejected": cls._rejected,
+            "restarts": cls._restarts,
+            "job_latency": _summary(cls._latencies),
+            "queue_wait": _summary(cls._waits)
+        }
@@ -60,7 +60,11 @@ async def get_current_user_context(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> Dict[str, str]:
     """Verify JWT token and return user context."""
-    token = credentials.credentials
+    return decode_access_token(credentials.credentials)
+
+
+def decode_access_token(token: str) -> Dict[str, str]:
+    """Decode a JWT access token into user context (user_id, role)."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
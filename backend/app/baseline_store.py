@@ -0,0 +1,166 @@
+"""
+Incremental baseline calibration and tracking.
+Each patient has one baseline_stats document with Welford running mean and
+variance per metric. Every new session folds into it with a single atomic
+update, and once BASELINE_SESSIONS sessions are recorded the statistics are
+promoted to the patient's calibrated baseline. Later sessions move the
+calibrated baseline by exponentially weighted updates.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pymongo import ReturnDocument
+
+from app.ai_engine.baseline import BaselineManager
+from app.session_repository import SessionRepository
+
+
+class BaselineStore:
+    """Running baseline statistics and their promotion to `baselines`."""
+
+    STATS_COLLECTION = "baseline_stats"
+
+    @staticmethod
+    def _welford_pipeline(values: Dict[str, float]) -> List[Dict]:
+        """Update pipeline applying one Welford step per metric server-side."""
+        fields: Dict = {
+            "session_count": {"$add": [{"$ifNull": ["$session_count", 0]}, 1]},
+            "updated_at": datetime.utcnow()
+        }
+        for metric, value in values.items():
+            n = {"$ifNull": [f"$metrics.{metric}.n", 0]}
+            mean = {"$ifNull": [f"$metrics.{metric}.mean", 0.0]}
+            m2 = {"$ifNull": [f"$metrics.{metric}.m2", 0.0]}
+            fields[f"metrics.{metric}"] = {"$let": {
+                "vars": {"n": {"$add": [n, 1]}, "delta": {"$subtract": [value, mean]}},
+                "in": {
+                    "n": "$$n",
+                    "mean": {"$add": [mean, {"$divide": ["$$delta", "$$n"]}]},
+                    # m2 += delta * (value - new_mean) == delta^2 * (n - 1) / n
+                    "m2": {"$add": [m2, {"$divide": [
+                        {"$multiply": ["$$delta", "$$delta", {"$subtract": ["$$n", 1]}]},
+                        "$$n"
+                    ]}]}
+                }
+            }}
+        return [{"$set": fields}]
+
+    @staticmethod
+    def _ew_pipeline(values: Dict[str, float], manager: BaselineManager) -> List[Dict]:
+        """Update pipeline applying BaselineManager.update_baseline server-side."""
+        alpha = manager.update_alpha
+        fields: Dict = {
+            "metrics.sessions_since_calibration": {
+                "$add": [{"$ifNull": ["$metrics.sessions_since_calibration", 0]}, 1]
+            },
+            "metrics.last_updated": datetime.utcnow().isoformat()
+        }
+        for metric, value in values.items():
+            prefix = manager.METRIC_KEYS[metric]
+            mean = {"$ifNull": [f"$metrics.{prefix}_mean", 0.0]}
+            delta = {"$subtract": [value, mean]}
+            is_new = {"$eq": [mean, 0.0]}
+
+            fields[f"metrics.{prefix}_mean"] = {"$cond": [
+                is_new, value, {"$add": [mean, {"$multiply": [alpha, delta]}]}
+            ]}
+            if metric not in manager.MEAN_ONLY_METRICS:
+                std = {"$ifNull": [f"$metrics.{prefix}_std", 0.0]}
+                fields[f"metrics.{prefix}_std"] = {"$cond": [
+                    is_new,
+                    std,
+                    {"$sqrt": {"$multiply": [
+                        1 - alpha,
+                        {"$add": [{"$multiply": [std, std]}, {"$multiply": [alpha, delta, delta]}]}
+                    ]}}
+                ]}
+        return [{"$set": fields}]
+
+    @classmethod
+    async def _seed(cls, db, patient_id: str, manager: BaselineManager) -> Dict:
+        """
+        Build the statistics document from sessions stored before it existed.
+        Returns the stored document, which a concurrent first upload may have
+        inserted instead.
+        """
+        sessions = await SessionRepository.list_for_patient(
+            db, patient_id, view="features", limit=manager.required_sessions, include_fallback=False
+        )
+        stats: Dict = {"patient_id": patient_id, "session_count": 0, "metrics": {}}
+        for session in reversed(sessions):
+            manager.update_running_stats(stats, session.get("extracted_features", {}))
+        stats["updated_at"] = datetime.utcnow()
+
+        return await db[cls.STATS_COLLECTION].find_one_and_update(
+            {"patient_id": patient_id},
+            {"$setOnInsert": stats},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+
+    @classmethod
+    async def record_session(
+        cls,
+        db,
+        patient_id: str,
+        features: Dict,
+        manager: BaselineManager
+    ) -> Optional[Dict]:
+        """
+        Fold a stored session into the patient's running statistics.
+
+        Returns the baseline document once `required_sessions` sessions are
+        recorded, otherwise None. Statistics stop changing at that point, so
+        the baseline reflects the same sessions create_baseline used.
+        """
+        collection = db[cls.STATS_COLLECTION]
+        stats = await collection.find_one({"patient_id": patient_id})
+
+        if stats is None:
+            # First session seen by the store; includes the session just stored
+            stats = await cls._seed(db, patient_id, manager)
+        elif stats.get("session_count", 0) < manager.required_sessions:
+            stats = await collection.find_one_and_update(
+                {"patient_id": patient_id, "session_count": {"$lt": manager.required_sessions}},
+                cls._welford_pipeline(manager.session_metric_values(features)),
+                return_document=ReturnDocument.AFTER
+            )
+
+        if not stats:
+            return None
+
+        metrics = manager.baseline_from_running_stats(stats)
+        if metrics is None:
+            return None
+
+        baseline_doc = {
+            "patient_id": patient_id,
+            "metrics": metrics,
+            "is_calibrated": True
+        }
+        await db["baselines"].update_one(
+            {"patient_id": patient_id},
+            {"$setOnInsert": baseline_doc},
+            upsert=True
+        )
+        return baseline_doc
+
+    @classmethod
+    async def update_baseline(
+        cls,
+        db,
+        patient_id: str,
+        features: Dict,
+        manager: BaselineManager
+    ) -> Optional[Dict]:
+        """
+        Move a calibrated baseline towards a new session (exponentially
+        weighted mean and variance, half-life in sessions). Returns the
+        updated baseline document.
+        """
+        return await db["baselines"].find_one_and_update(
+            {"patient_id": patient_id, "is_calibrated": True},
+            cls._ew_pipeline(manager.session_metric_values(features), manager),
+            return_document=ReturnDocument.AFTER
+        )
@@ -39,8 +39,49 @@ class Settings(BaseSettings):
     FFT_SAMPLE_RATE: float = 30.0
     BASELINE_SESSIONS: int = 7
     DEVIATION_THRESHOLD: float = 2.5
+    BASELINE_HALF_LIFE_SESSIONS: float = 20.0
+    STREAM_MAX_CHUNK_FRAMES: int = 900
+    STREAM_MAX_SESSION_FRAMES: int = 54000
+    ANALYSIS_WORKERS: int = 2
+    ANALYSIS_MAX_PENDING: int = 8
+    ANALYSIS_QUEUE_TIMEOUT: float = 30.0
+    VIDEO_POSE_WORKERS: int = 0
+    VIDEO_SEGMENT_FRAMES: int = 30
+    VIDEO_MAX_SIDE: int = 640
+    VIDEO_ROI_TRACKING: bool = True
+    VIDEO_ROI_SIDE: int = 384
+    VIDEO_MOTION_THRESHOLD: float = 1.5
+    VIDEO_MAX_UPLOAD_MB: int = 50
+    UPLOAD_CHUNK_BYTES: int = 1048576
+    QUALITY_MIN_VISIBILITY: float = 0.5
+    QUALITY_MAX_GAP_SECONDS: float = 0.5
+    QUALITY_SMOOTHING: bool = True
+    QUALITY_SMOOTHING_SECONDS: float = 0.2
+    QUALITY_MIN_VALID_FRACTION: float = 0.5
+    QUALITY_MIN_SECONDS: float = 2.0
+    FEATURE_CACHE_SIZE: int = 256
+    FEATURE_CACHE_TTL_DAYS: int = 30
+    POSE_BACKEND: str = "mediapipe"
+    POSE_WARMUP: bool = False
+    POSE_CHUNK_FRAMES: int = 900
+    POSE_STORAGE_DTYPE: str = "float32"
     GEMINI_API_KEY: str = ""
     GEMINI_MODEL: str = "gemini-1.5-flash"
+    GEMINI_BASE_URL: str = "https://generativelanguage.googleapis.com/v1beta"
+    GEMINI_TIMEOUT: float = 30.0
+    GEMINI_MAX_RETRIES: int = 2
+    GEMINI_MAX_CONNECTIONS: int = 8
+    LLM_CACHE_SIZE: int = 512
+    LLM_CACHE_TTL_SECONDS: float = 86400.0
+    LLM_CACHE_ENDPOINTS: str = "report,chatbot,pdf_report,fitness,medication"
+    JOB_QUEUE_BACKEND: str = "mongo"
+    JOB_WORKERS: int = 2
+    JOB_POLL_INTERVAL: float = 2.0
+    JOB_LEASE_SECONDS: float = 600.0
+    JOB_MAX_ATTEMPTS: int = 2
+    JOB_PINNED_TIMEOUT_SECONDS: float = 3600.0
+    JOB_RETENTION_DAYS: int = 7
+    JOB_SPOOL_DIR: str = ""
     MEDICATION_DATA_PATH: str = "backend/data/medications_sample.json"
     ALLOW_SAMPLE_MEDICATIONS: bool = False
     KAGGLE_API_TOKEN: str = ""
@@ -186,10 +227,38 @@ class Database:
             await sessions_collection.create_index("patient_id")
             await sessions_collection.create_index("created_at")
             await sessions_collection.create_index([("patient_id", 1), ("created_at", -1)])
+            # Retried uploads of the same pose data map to one session
+            await sessions_collection.create_index(
+                [("patient_id", 1), ("content_hash", 1)],
+                unique=True,
+                partialFilterExpression={"content_hash": {"$exists": True}}
+            )
+
+            # Cached features expire so old analyzer versions do not pile up
+            await cls.db["feature_cache"].create_index(
+                "created_at",
+                expireAfterSeconds=settings.FEATURE_CACHE_TTL_DAYS * 86400
+            )
+
+            # Cached LLM responses are removed once expires_at passes
+            await cls.db["llm_cache"].create_index("expires_at", expireAfterSeconds=0)
+
+            # Workers claim the oldest queued job; finished jobs expire
+            jobs_collection = cls.db["jobs"]
+            await jobs_collection.create_index([("status", 1), ("created_at", 1)])
+            await jobs_collection.create_index(
+                "finished_at",
+                expireAfterSeconds=settings.JOB_RETENTION_DAYS * 86400
+            )
+
+            # Pose chunks are always read per session in sequence order
+            pose_chunks_collection = cls.db["pose_chunks"]
+            await pose_chunks_collection.create_index([("session_id", 1), ("seq", 1)], unique=True)
 
             # Baselines collection indexes
             baselines_collection = cls.db["baselines"]
             await baselines_collection.create_index("patient_id", unique=True)
+            await cls.db["baseline_stats"].create_index("patient_id", unique=True)
 
             # Risk assessments collection indexes
             risk_collection = cls.db["risk_assessments"]
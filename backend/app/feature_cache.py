@@ -0,0 +1,121 @@
+"""
+Content-addressed cache of session features.
+Features depend only on the pose tensor, the analyzer code and the
+preprocessing settings, so they are keyed by a hash of all three. Lookups go
+through an in-process LRU first and then the feature_cache collection; cache
+errors never fail an analysis.
+"""
+
+import hashlib
+import json
+import struct
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.ai_engine.features import ANALYZER_VERSION
+from app.ai_engine.keypoints import KeypointTensor
+from app.ai_engine.preprocessing import PosePreprocessor
+
+
+class FeatureCache:
+    """Session features by content hash: in-process LRU in front of MongoDB."""
+
+    COLLECTION = "feature_cache"
+
+    max_entries = 256
+    _entries: "OrderedDict[str, Dict]" = OrderedDict()
+    _hits = 0
+    _db_hits = 0
+    _misses = 0
+
+    @classmethod
+    def configure(cls, max_entries: int):
+        cls.max_entries = max(0, max_entries)
+        while len(cls._entries) > cls.max_entries:
+            cls._entries.popitem(last=False)
+
+    @staticmethod
+    def content_key(tensor: KeypointTensor, preprocessor: Optional[PosePreprocessor] = None) -> str:
+        """
+        SHA-256 of the canonical tensor (little-endian float32 keypoints and
+        float64 timestamps, frame index / sample_rate when absent), the
+        analyzer version and the preprocessing settings.
+        """
+        digest = hashlib.sha256()
+        digest.update(ANALYZER_VERSION.encode())
+        settings = preprocessor.settings() if preprocessor is not None else None
+        digest.update(json.dumps(settings, sort_keys=True).encode())
+        digest.update(struct.pack("<dII", tensor.sample_rate, *tensor.data.shape[:2]))
+
+        timestamps = tensor.timestamps
+        if timestamps is None:
+            timestamps = np.arange(len(tensor)) / tensor.sample_rate
+        digest.update(memoryview(np.ascontiguousarray(tensor.data, dtype="<f4")).cast("B"))
+        digest.update(memoryview(np.ascontiguousarray(timestamps, dtype="<f8")).cast("B"))
+        return digest.hexdigest()
+
+    @classmethod
+    def _remember(cls, key: str, features: Dict):
+        if cls.max_entries <= 0:
+            return
+        cls._entries[key] = features
+        cls._entries.move_to_end(key)
+        while len(cls._entries) > cls.max_entries:
+            cls._entries.popitem(last=False)
+
+    @classmethod
+    async def get(cls, db, key: str) -> Optional[Dict]:
+        """Cached features for `key`, or None."""
+        features = cls._entries.get(key)
+        if features is not None:
+            cls._entries.move_to_end(key)
+            cls._hits += 1
+            return dict(features)
+
+        try:
+            doc = await db[cls.COLLECTION].find_one({"_id": key})
+        except Exception as e:
+            print(f"Feature cache read error: {str(e)}")
+            doc = None
+        if doc is None or doc.get("analyzer_version") != ANALYZER_VERSION:
+            cls._misses += 1
+            return None
+
+        cls._db_hits += 1
+        cls._remember(key, doc["features"])
+        return dict(doc["features"])
+
+    @classmethod
+    async def put(cls, db, key: str, features: Dict):
+        cls._remember(key, dict(features))
+        try:
+            await db[cls.COLLECTION].update_one(
+                {"_id": key},
+                {"$setOnInsert": {
+                    "analyzer_version": ANALYZER_VERSION,
+                    "features": features,
+                    "created_at": datetime.utcnow()
+                }},
+                upsert=True
+            )
+        except Exception as e:
+            print(f"Feature cache write error: {str(e)}")
+
+    @classmethod
+    def clear(cls):
+        cls._entries.clear()
+
+    @classmethod
+    def stats(cls) -> Dict:
+        lookups = cls._hits + cls._db_hits + cls._misses
+        return {
+            "entries": len(cls._entries),
+            "max_entries": cls.max_entries,
+            "memory_hits": cls._hits,
+            "db_hits": cls._db_hits,
+            "misses": cls._misses,
+            "hit_rate": round((cls._hits + cls._db_hits) / lookups, 4) if lookups else None
+        }
@@ -0,0 +1,396 @@
+"""
+Background jobs for long-running AI analyses.
+
+Endpoints submit a job and return its id at once instead of holding the
+request open while Gemini responds. Worker tasks started in the app lifespan
+claim queued jobs oldest first, run the handler registered for the job kind
+and store its result (or error) on the job; the patient is told through the
+notifications collection when a job finishes. Jobs live in the MongoDB jobs
+collection so status is visible from every replica and survives restarts;
+the in-memory backend serves tests and scripts.
+
+A job submitted with a `host` (e.g. one whose payload is a file spooled to
+node-local disk) is only claimed by workers on that host; other jobs go to
+any replica. If that host never comes back, the job fails once it has been
+waiting for `pinned_timeout` seconds.
+
+A running job holds a lease that its worker renews while the handler runs.
+Workers periodically requeue jobs whose lease expired (their replica died),
+failing those that ran out of attempts. Resources a job's payload refers to
+(spooled uploads) are released by the kind's cleanup callback once the job
+is finished for good, never between attempts.
+"""
+
+import asyncio
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+JobHandler = Callable[..., Awaitable[Dict]]
+JobCleanup = Callable[[Dict], None]
+
+INTERRUPTED = "Job was interrupted"
+STRANDED = "Job expired waiting for the replica holding its upload"
+
+
+class MongoJobBackend:
+    """Jobs in the MongoDB jobs collection, claimed atomically."""
+
+    COLLECTION = "jobs"
+
+    def __init__(self, db):
+        self.collection = db[self.COLLECTION]
+
+    async def insert(self, job: Dict):
+        await self.collection.insert_one(job)
+
+    async def claim(self, lease_seconds: float, host: str) -> Optional[Dict]:
+        now = datetime.utcnow()
+        return await self.collection.find_one_and_update(
+            # host: None also matches jobs without the field
+            {"status": "queued", "host": {"$in": [None, host]}},
+            {
+                "$set": {
+                    "status": "running",
+                    "started_at": now,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds)
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def update(self, job_id: str, fields: Dict):
+        await self.collection.update_one({"_id": job_id}, {"$set": fields})
+
+    async def renew(self, job_id: str, attempt: int, lease_seconds: float):
+        """Extend the lease of a job still running as `attempt`."""
+        await self.collection.update_one(
+            {"_id": job_id, "status": "running", "attempts": attempt},
+            {"$set": {"lease_expires_at": datetime.utcnow() + timedelta(seconds=lease_seconds)}}
+        )
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        return await self.collection.find_one({"_id": job_id})
+
+    async def recover(self, max_attempts: int, pinned_timeout: float) -> Tuple[int, List[Dict]]:
+        """
+        Requeue running jobs whose lease expired; fail those out of attempts
+        and pinned jobs queued longer than `pinned_timeout` seconds. Returns
+        the requeued count and the jobs this call failed.
+        """
+        now = datetime.utcnow()
+        expired = {"status": "running", "lease_expires_at": {"$lt": now}}
+        stranded = {
+            "status": "queued",
+            "host": {"$ne": None},
+            "created_at": {"$lt": now - timedelta(seconds=pinned_timeout)}
+        }
+        failed = []
+        for query, error in (({**expired, "attempts": {"$gte": max_attempts}}, INTERRUPTED), (stranded, STRANDED)):
+            async for job in self.collection.find(query, projection={"kind": 1, "payload": 1}):
+                # Conditional per job, so only one replica fails (and cleans up) each
+                result = await self.collection.update_one(
+                    {**query, "_id": job["_id"]},
+                    {"$set": {"status": "failed", "error": error, "finished_at": now}}
+                )
+                if result.modified_count:
+                    failed.append(job)
+        requeued = await self.collection.update_many(expired, {"$set": {"status": "queued"}})
+        return requeued.modified_count, failed
+
+
+class MemoryJobBackend:
+    """Jobs in a dict, for tests and single-process scripts."""
+
+    def __init__(self):
+        self.jobs: Dict[str, Dict] = {}
+
+    async def insert(self, job: Dict):
+        self.jobs[job["_id"]] = dict(job)
+
+    async def claim(self, lease_seconds: float, host: str) -> Optional[Dict]:
+        queued = [
+            job for job in self.jobs.values()
+            if job["status"] == "queued" and job.get("host") in (None, host)
+        ]
+        if not queued:
+            return None
+        job = min(queued, key=lambda item: item["created_at"])
+        now = datetime.utcnow()
+        job.update(
+            status="running",
+            started_at=now,
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+            attempts=job.get("attempts", 0) + 1
+        )
+        return dict(job)
+
+    async def update(self, job_id: str, fields: Dict):
+        self.jobs[job_id].update(fields)
+
+    async def renew(self, job_id: str, attempt: int, lease_seconds: float):
+        job = self.jobs.get(job_id)
+        if job and job["status"] == "running" and job.get("attempts") == attempt:
+            job["lease_expires_at"] = datetime.utcnow() + timedelta(seconds=lease_seconds)
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        job = self.jobs.get(job_id)
+        return dict(job) if job else None
+
+    async def recover(self, max_attempts: int, pinned_timeout: float) -> Tuple[int, List[Dict]]:
+        now = datetime.utcnow()
+        stranded_before = now - timedelta(seconds=pinned_timeout)
+        requeued, failed = 0, []
+        for job in self.jobs.values():
+            if job["status"] == "queued" and job.get("host") is not None and job["created_at"] < stranded_before:
+                job.update(status="failed", error=STRANDED, finished_at=now)
+                failed.append(dict(job))
+            if job["status"] != "running" or job["lease_expires_at"] >= now:
+                continue
+            if job.get("attempts", 0) >= max_attempts:
+                job.update(status="failed", error=INTERRUPTED, finished_at=now)
+                failed.append(dict(job))
+            else:
+                job["status"] = "queued"
+                requeued += 1
+        return requeued, failed
+
+
+class JobQueue:
+    """Submit/poll API over a job backend, with worker tasks on the event loop."""
+
+    backend = None
+    db = None
+    workers = 0
+    poll_interval = 2.0
+    lease_seconds = 600.0
+    max_attempts = 2
+    pinned_timeout = 3600.0
+    # Identifies this replica for jobs pinned to the host that submitted them
+    host = socket.gethostname()
+
+    # kind -> (handler, label used in notifications, notify on completion, cleanup)
+    _handlers: Dict[str, Tuple[JobHandler, str, bool, Optional[JobCleanup]]] = {}
+    _tasks: List[asyncio.Task] = []
+    _wakeup: Optional[asyncio.Event] = None
+    _last_recovery = 0.0
+    _submitted = 0
+    _completed = 0
+    _failed = 0
+
+    @classmethod
+    def register(cls, kind: str, label: str, notify: bool = True, cleanup: Optional[JobCleanup] = None):
+        """
+        Decorator registering `async handler(db, payload) -> Dict` for a job
+        kind. The returned dict is stored as the job result; pass
+        notify=False when the handler already notifies the patient itself.
+        `cleanup(payload)` runs once the job has completed or failed for
+        good, so a retried attempt still finds what the payload refers to.
+        """
+        def decorator(handler: JobHandler) -> JobHandler:
+            cls._handlers[kind] = (handler, label, notify, cleanup)
+            return handler
+        return decorator
+
+    @classmethod
+    async def start(
+        cls,
+        db,
+        backend: str = "mongo",
+        workers: int = 2,
+        poll_interval: float = 2.0,
+        lease_seconds: float = 600.0,
+        max_attempts: int = 2,
+        pinned_timeout: float = 3600.0
+    ):
+        """
+        Pick the backend, recover interrupted jobs and start the workers.
+        Running jobs renew their lease every lease_seconds / 3; workers look
+        for expired leases and stranded pinned jobs every lease_seconds / 2.
+        """
+        await cls.stop()
+        cls.db = db
+        cls.backend = MemoryJobBackend() if backend == "memory" else MongoJobBackend(db)
+        cls.workers = max(0, workers)
+        cls.poll_interval = poll_interval
+        cls.lease_seconds = lease_seconds
+        cls.max_attempts = max(1, max_attempts)
+        cls.pinned_timeout = pinned_timeout
+        cls._wakeup = asyncio.Event()
+
+        await cls.recover()
+
+        cls._tasks = [asyncio.create_task(cls._worker()) for _ in range(cls.workers)]
+        print(f"Job queue started ({backend}, {cls.workers} workers)")
+
+    @classmethod
+    async def stop(cls):
+        for task in cls._tasks:
+            task.cancel()
+        await asyncio.gather(*cls._tasks, return_exceptions=True)
+        cls._tasks = []
+
+    @classmethod
+    async def submit(
+        cls,
+        kind: str,
+        payload: Dict,
+        patient_id: Optional[str] = None,
+        created_by: Optional[str] = None,
+        host: Optional[str] = None
+    ) -> str:
+        """Queue a job and return its id; with `host`, only that host runs it."""
+        if cls.backend is None:
+            raise RuntimeError("Job queue not started")
+        if kind not in cls._handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'")
+
+        job_id = str(ObjectId())
+        await cls.backend.insert({
+            "_id": job_id,
+            "kind": kind,
+            "status": "queued",
+            "payload": payload,
+            "patient_id": patient_id,
+            "created_by": created_by,
+            "host": host,
+            "attempts": 0,
+            "created_at": datetime.utcnow()
+        })
+        cls._submitted += 1
+        # Wake an idle local worker; other replicas pick it up on their next poll
+        if cls._wakeup is not None:
+            cls._wakeup.set()
+        return job_id
+
+    @classmethod
+    async def get(cls, job_id: str) -> Optional[Dict]:
+        if cls.backend is None:
+            raise RuntimeError("Job queue not started")
+        return await cls.backend.get(job_id)
+
+    @classmethod
+    async def recover(cls):
+        """
+        Requeue (or fail) jobs whose lease expired on any replica, and fail
+        pinned jobs whose host has not claimed them within pinned_timeout.
+        """
+        cls._last_recovery = time.monotonic()
+        requeued, failed = await cls.backend.recover(cls.max_attempts, cls.pinned_timeout)
+        for job in failed:
+            cls._cleanup(job)
+        if requeued or failed:
+            print(f"Job queue recovered interrupted jobs ({requeued} requeued, {len(failed)} failed)")
+
+    @classmethod
+    def _cleanup(cls, job: Dict):
+        cleanup = cls._handlers.get(job["kind"], (None, None, None, None))[3]
+        if cleanup is None:
+            return
+        try:
+            cleanup(job["payload"])
+        except Exception as e:
+            print(f"Job {job['_id']} cleanup error: {type(e).__name__} {str(e)}")
+
+    @classmethod
+    async def _heartbeat(cls, job: Dict):
+        while True:
+            await asyncio.sleep(cls.lease_seconds / 3)
+            try:
+                await cls.backend.renew(job["_id"], job["attempts"], cls.lease_seconds)
+            except Exception as e:
+                print(f"Job {job['_id']} lease renewal error: {type(e).__name__} {str(e)}")
+
+    @classmethod
+    async def run_next(cls) -> bool:
+        """Claim and run one queued job; False when none was queued."""
+        job = await cls.backend.claim(cls.lease_seconds, cls.host)
+        if job is None:
+            return False
+
+        handler, label, notify, _ = cls._handlers.get(job["kind"], (None, job["kind"], True, None))
+        # Cancellation (shutdown) skips cleanup: the job is requeued once its lease expires
+        heartbeat = asyncio.create_task(cls._heartbeat(job))
+        try:
+            if handler is None:
+                raise ValueError(f"No handler registered for job kind '{job['kind']}'")
+            result = await handler(cls.db, job["payload"])
+        except Exception as e:
+            print(f"Job {job['_id']} ({job['kind']}) failed: {type(e).__name__} {str(e)}")
+            detail = getattr(e, "detail", None) or str(e) or type(e).__name__
+            await cls.backend.update(job["_id"], {
+                "status": "failed",
+                "error": str(detail),
+                "finished_at": datetime.utcnow()
+            })
+            cls._failed += 1
+            cls._cleanup(job)
+            await cls._notify(job, f"{label} Failed", f"{label} could not be completed. Please try again.")
+            return True
+        finally:
+            heartbeat.cancel()
+
+        await cls.backend.update(job["_id"], {
+            "status": "completed",
+            "result": result,
+            "finished_at": datetime.utcnow()
+        })
+        cls._completed += 1
+        cls._cleanup(job)
+        if notify:
+            await cls._notify(job, f"{label} Complete", f"{label} is ready. View the result now.")
+        return True
+
+    @classmethod
+    async def _notify(cls, job: Dict, title: str, message: str):
+        if not job.get("patient_id") or cls.db is None:
+            return
+        try:
+            await cls.db["notifications"].insert_one({
+                "patient_id": job["patient_id"],
+                "title": title,
+                "message": message,
+                "category": "job",
+                "job_id": job["_id"],
+                "job_kind": job["kind"],
+                "is_read": False,
+                "created_at": datetime.utcnow()
+            })
+        except Exception as e:
+            print(f"Job notification error: {str(e)}")
+
+    @classmethod
+    async def _worker(cls):
+        while True:
+            # Cleared before claiming, so a submit that lands after an empty
+            # claim still wakes this worker
+            cls._wakeup.clear()
+            try:
+                if time.monotonic() - cls._last_recovery >= cls.lease_seconds / 2:
+                    await cls.recover()
+                if await cls.run_next():
+                    continue
+            except Exception as e:
+                # Backend errors (e.g. a lost connection) should not kill the worker
+                print(f"Job worker error: {type(e).__name__} {str(e)}")
+            try:
+                await asyncio.wait_for(cls._wakeup.wait(), timeout=cls.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    @classmethod
+    def stats(cls) -> Dict:
+        return {
+            "backend": type(cls.backend).__name__ if cls.backend is not None else None,
+            "workers": len(cls._tasks),
+            "kinds": sorted(cls._handlers),
+            "submitted": cls._submitted,
+            "completed": cls._completed,
+            "failed": cls._failed
+        }
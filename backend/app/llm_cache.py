@@ -0,0 +1,136 @@
+"""
+Response cache for Gemini-backed endpoints.
+
+Responses are keyed by the whitespace-normalized prompt, the model and the
+generation config. Lookups go through an in-process LRU first and then the
+shared llm_cache collection, so replicas reuse each other's answers. Entries
+expire after a TTL; endpoints opt in by name. Cache errors never fail a
+request.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+
+class LLMResponseCache:
+    """Gemini response texts by request hash: in-process LRU in front of MongoDB."""
+
+    COLLECTION = "llm_cache"
+
+    max_entries = 512
+    ttl_seconds = 86400.0
+    endpoints = frozenset()
+    # key -> (monotonic expiry, text)
+    _entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+    _counters: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def configure(cls, max_entries: int, ttl_seconds: float, endpoints: Iterable[str]):
+        cls.max_entries = max(0, max_entries)
+        cls.ttl_seconds = ttl_seconds
+        cls.endpoints = frozenset(name.strip() for name in endpoints if name.strip())
+        while len(cls._entries) > cls.max_entries:
+            cls._entries.popitem(last=False)
+
+    @classmethod
+    def enabled(cls, endpoint: Optional[str]) -> bool:
+        return bool(endpoint) and endpoint in cls.endpoints and cls.ttl_seconds > 0
+
+    @staticmethod
+    def normalize_prompt(prompt: str) -> str:
+        """Collapse whitespace so re-indented or re-wrapped prompts share an entry."""
+        return " ".join(prompt.split())
+
+    @classmethod
+    def key(cls, prompt: str, model: str, generation_config: Optional[Dict] = None) -> str:
+        request = {
+            "prompt": cls.normalize_prompt(prompt),
+            "model": model,
+            "config": generation_config or {}
+        }
+        return hashlib.sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()
+
+    @classmethod
+    def _count(cls, endpoint: str, outcome: str):
+        counters = cls._counters.setdefault(endpoint, {"memory_hits": 0, "db_hits": 0, "misses": 0})
+        counters[outcome] += 1
+
+    @classmethod
+    def _remember(cls, key: str, text: str, ttl_seconds: float):
+        if cls.max_entries <= 0 or ttl_seconds <= 0:
+            return
+        cls._entries[key] = (time.monotonic() + ttl_seconds, text)
+        cls._entries.move_to_end(key)
+        while len(cls._entries) > cls.max_entries:
+            cls._entries.popitem(last=False)
+
+    @classmethod
+    async def get(cls, db, endpoint: str, key: str) -> Optional[str]:
+        """Cached response text for `key`, or None."""
+        entry = cls._entries.get(key)
+        if entry is not None:
+            expires, text = entry
+            if expires > time.monotonic():
+                cls._entries.move_to_end(key)
+                cls._count(endpoint, "memory_hits")
+                return text
+            del cls._entries[key]
+
+        doc = None
+        if db is not None:
+            try:
+                doc = await db[cls.COLLECTION].find_one({"_id": key})
+            except Exception as e:
+                print(f"LLM cache read error: {str(e)}")
+        # The TTL monitor runs about once a minute, so check expiry here too
+        now = datetime.utcnow()
+        if doc is None or doc.get("expires_at") is None or doc["expires_at"] <= now:
+            cls._count(endpoint, "misses")
+            return None
+
+        cls._count(endpoint, "db_hits")
+        cls._remember(key, doc["text"], (doc["expires_at"] - now).total_seconds())
+        return doc["text"]
+
+    @classmethod
+    async def put(cls, db, endpoint: str, key: str, text: str):
+        cls._remember(key, text, cls.ttl_seconds)
+        if db is None:
+            return
+        now = datetime.utcnow()
+        try:
+            await db[cls.COLLECTION].update_one(
+                {"_id": key},
+                {"$set": {
+                    "endpoint": endpoint,
+                    "text": text,
+                    "created_at": now,
+                    "expires_at": now + timedelta(seconds=cls.ttl_seconds)
+                }},
+                upsert=True
+            )
+        except Exception as e:
+            print(f"LLM cache write error: {str(e)}")
+
+    @classmethod
+    def clear(cls):
+        cls._entries.clear()
+
+    @classmethod
+    def stats(cls) -> Dict:
+        endpoints = {}
+        for endpoint, counters in cls._counters.items():
+            lookups = sum(counters.values())
+            hits = counters["memory_hits"] + counters["db_hits"]
+            endpoints[endpoint] = {**counters, "hit_rate": round(hits / lookups, 4) if lookups else None}
+        return {
+            "entries": len(cls._entries),
+            "max_entries": cls.max_entries,
+            "ttl_seconds": cls.ttl_seconds,
+            "enabled_endpoints": sorted(cls.endpoints),
+            "endpoints": endpoints
+        }
@@ -0,0 +1,284 @@
+"""
+Shared HTTP client for Gemini requests.
+
+One aiohttp session is opened in the app lifespan and reused by every
+caller, so requests share pooled keep-alive connections instead of opening
+a new TCP+TLS connection each. Connections per host are capped, every
+request has a timeout, and transient failures (connection errors, timeouts,
+429 and 5xx responses) are retried with exponential backoff and full
+jitter. The base URL is a setting so the client can be pointed at a local
+stub server.
+
+Files sent as inline data (InlineFile parts) are base64-encoded chunk by
+chunk while the request body is written, so a 50 MB video never exists in
+memory as one encoded string.
+"""
+
+import asyncio
+import base64
+import json
+import os
+import random
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
+
+import aiohttp
+
+from app.database import Database, settings
+from app.llm_cache import LLMResponseCache
+
+
+class LLMError(Exception):
+    """A Gemini request failed, after retries where the failure was transient."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class InlineFile:
+    """An inline_data request part whose bytes are read from disk as the request is sent."""
+
+    # A multiple of 3, so the base64 of consecutive chunks concatenates cleanly
+    CHUNK_BYTES = 3 * 256 * 1024
+
+    def __init__(self, path: str, mime_type: str):
+        self.path = path
+        self.mime_type = mime_type
+        self.size = os.path.getsize(path)
+
+    @property
+    def encoded_size(self) -> int:
+        return 4 * ((self.size + 2) // 3)
+
+    async def encoded_chunks(self) -> AsyncIterator[bytes]:
+        with open(self.path, "rb") as source:
+            while True:
+                chunk = await asyncio.to_thread(source.read, self.CHUNK_BYTES)
+                if not chunk:
+                    return
+                yield base64.b64encode(chunk)
+
+
+class LLMClient:
+    """Pooled Gemini generateContent client shared by all routers."""
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    INLINE_PLACEHOLDER = "@@inline-file@@"
+    BACKOFF_BASE = 0.5
+    BACKOFF_MAX = 8.0
+
+    base_url = "https://generativelanguage.googleapis.com/v1beta"
+    timeout = 30.0
+    max_retries = 2
+    max_connections = 8
+    keepalive_seconds = 60.0
+
+    _session: Optional[aiohttp.ClientSession] = None
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _requests = 0
+    _retries = 0
+    _failures = 0
+
+    @classmethod
+    async def start(
+        cls,
+        base_url: Optional[str] = None,
+        timeout: float = 30.0,
+        max_retries: int = 2,
+        max_connections: int = 8,
+        keepalive_seconds: float = 60.0
+    ):
+        """Open the shared session (called from the app lifespan)."""
+        await cls.stop()
+        if base_url:
+            cls.base_url = base_url.rstrip("/")
+        cls.timeout = timeout
+        cls.max_retries = max(0, max_retries)
+        cls.max_connections = max(1, max_connections)
+        cls.keepalive_seconds = keepalive_seconds
+        cls._open()
+        print(f"LLM client ready ({cls.base_url}, {cls.max_connections} connections per host)")
+
+    @classmethod
+    async def stop(cls):
+        if cls._session is not None and not cls._session.closed:
+            await cls._session.close()
+        cls._session = None
+        cls._loop = None
+
+    @classmethod
+    def _open(cls) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit_per_host=cls.max_connections,
+            keepalive_timeout=cls.keepalive_seconds,
+            ttl_dns_cache=300
+        )
+        cls._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=cls.timeout)
+        )
+        cls._loop = asyncio.get_running_loop()
+        return cls._session
+
+    @classmethod
+    def _get_session(cls) -> aiohttp.ClientSession:
+        # Opened lazily outside the lifespan (scripts, tests); a session
+        # belongs to the event loop that created it
+        if cls._session is None or cls._session.closed or cls._loop is not asyncio.get_running_loop():
+            return cls._open()
+        return cls._session
+
+    @classmethod
+    def _backoff(cls, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return min(retry_after, cls.BACKOFF_MAX)
+        return random.uniform(0.0, min(cls.BACKOFF_MAX, cls.BACKOFF_BASE * 2 ** attempt))
+
+    @staticmethod
+    def _retry_after(response: aiohttp.ClientResponse) -> Optional[float]:
+        try:
+            return float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            return None
+
+    @classmethod
+    def _streamed_body(
+        cls,
+        payload: Dict,
+        files: List[InlineFile]
+    ) -> Tuple[int, Callable[[], AsyncIterator[bytes]]]:
+        """
+        Content length and body factory for a payload whose inline files were
+        replaced by INLINE_PLACEHOLDER; a new body is needed for every retry.
+        """
+        # Quotes inside JSON strings are escaped, so the quoted placeholder
+        # only matches the data fields themselves
+        segments = [
+            segment.encode()
+            for segment in json.dumps(payload).split(f'"{cls.INLINE_PLACEHOLDER}"')
+        ]
+        length = sum(len(segment) for segment in segments) + sum(f.encoded_size + 2 for f in files)
+
+        async def body() -> AsyncIterator[bytes]:
+            yield segments[0]
+            for inline_file, segment in zip(files, segments[1:]):
+                yield b'"'
+                async for chunk in inline_file.encoded_chunks():
+                    yield chunk
+                yield b'"' + segment
+
+        return length, body
+
+    @classmethod
+    async def generate_content(
+        cls,
+        parts: List[Union[Dict, InlineFile]],
+        generation_config: Optional[Dict] = None,
+        model: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> Dict:
+        """
+        POST models/{model}:generateContent with one user turn.
+        Returns the response JSON; raises LLMError.
+        """
+        files = [part for part in parts if isinstance(part, InlineFile)]
+        if not settings.GEMINI_API_KEY:
+            raise LLMError("Gemini API key is not configured")
+
+        url = f"{cls.base_url}/models/{model or settings.GEMINI_MODEL}:generateContent"
+        payload: Dict = {"contents": [{"role": "user", "parts": [
+            {"inline_data": {"mime_type": part.mime_type, "data": cls.INLINE_PLACEHOLDER}}
+            if isinstance(part, InlineFile) else part
+            for part in parts
+        ]}]}
+        if generation_config:
+            payload["generationConfig"] = generation_config
+        # Key in a header rather than the query string, so it stays out of URLs in logs
+        headers = {"x-goog-api-key": settings.GEMINI_API_KEY}
+        body = None
+        if files:
+            length, body = cls._streamed_body(payload, files)
+            headers.update({"Content-Type": "application/json", "Content-Length": str(length)})
+        request_timeout = aiohttp.ClientTimeout(total=timeout or cls.timeout)
+
+        cls._requests += 1
+        for attempt in range(cls.max_retries + 1):
+            retry_after = None
+            try:
+                request_body = {"data": body()} if body else {"json": payload}
+                async with cls._get_session().post(
+                    url, headers=headers, timeout=request_timeout, **request_body
+                ) as response:
+                    if response.status == 200:
+                        return await response.json()
+                    detail = (await response.text())[:200]
+                    error = LLMError(f"Gemini API returned {response.status}: {detail}", response.status)
+                    if response.status not in cls.RETRY_STATUSES:
+                        cls._failures += 1
+                        raise error
+                    retry_after = cls._retry_after(response)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = LLMError(f"Gemini request failed: {type(e).__name__} {str(e)}".strip())
+
+            if attempt < cls.max_retries:
+                cls._retries += 1
+                await asyncio.sleep(cls._backoff(attempt, retry_after))
+
+        cls._failures += 1
+        raise error
+
+    @staticmethod
+    def response_text(data: Dict) -> str:
+        """Text of the first candidate, or "" when there is none."""
+        candidates = data.get("candidates") or []
+        if not candidates:
+            return ""
+        parts = candidates[0].get("content", {}).get("parts") or [{}]
+        return parts[0].get("text", "")
+
+    @classmethod
+    async def generate_text(
+        cls,
+        prompt: str,
+        temperature: float = 0.4,
+        max_output_tokens: int = 800,
+        timeout: Optional[float] = None,
+        cache: Optional[str] = None
+    ) -> str:
+        """
+        Completion of a text prompt, or "" when Gemini is not configured or
+        fails. `cache` names the calling endpoint; endpoints enabled in
+        LLMResponseCache reuse earlier responses to the same request.
+        """
+        if not settings.GEMINI_API_KEY:
+            return ""
+
+        generation_config = {"temperature": temperature, "maxOutputTokens": max_output_tokens}
+        cache_key = None
+        if LLMResponseCache.enabled(cache):
+            cache_key = LLMResponseCache.key(prompt, settings.GEMINI_MODEL, generation_config)
+            cached = await LLMResponseCache.get(Database.db, cache, cache_key)
+            if cached is not None:
+                return cached
+
+        try:
+            data = await cls.generate_content([{"text": prompt}], generation_config, timeout=timeout)
+        except LLMError as e:
+            print(f"Gemini API error: {str(e)}")
+            return ""
+
+        text = cls.response_text(data)
+        if cache_key is not None and text:
+            await LLMResponseCache.put(Database.db, cache, cache_key, text)
+        return text
+
+    @classmethod
+    def stats(cls) -> Dict:
+        return {
+            "base_url": cls.base_url,
+            "connected": cls._session is not None and not cls._session.closed,
+            "max_connections_per_host": cls.max_connections,
+            "requests": cls._requests,
+            "retries": cls._retries,
+            "failures": cls._failures
+        }
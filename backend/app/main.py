@@ -7,6 +7,11 @@ from contextlib import asynccontextmanager
 from bson import ObjectId
 import os
 from app.database import Database, settings
+from app.analysis_service import AnalysisService
+from app.feature_cache import FeatureCache
+from app.job_queue import JobQueue
+from app.llm_cache import LLMResponseCache
+from app.llm_client import LLMClient
 from app.routers import patients_router, analysis_router, doctors_router, health_router
 import json
 from datetime import datetime
@@ -44,11 +49,42 @@ class CustomJSONEncoder(json.JSONEncoder):
 async def lifespan(app: FastAPI):
     # Startup
     await Database.connect_db()
+    FeatureCache.configure(settings.FEATURE_CACHE_SIZE)
+    LLMResponseCache.configure(
+        settings.LLM_CACHE_SIZE,
+        settings.LLM_CACHE_TTL_SECONDS,
+        settings.LLM_CACHE_ENDPOINTS.split(",")
+    )
+    await LLMClient.start(
+        base_url=settings.GEMINI_BASE_URL,
+        timeout=settings.GEMINI_TIMEOUT,
+        max_retries=settings.GEMINI_MAX_RETRIES,
+        max_connections=settings.GEMINI_MAX_CONNECTIONS
+    )
+    await AnalysisService.start(
+        workers=settings.ANALYSIS_WORKERS,
+        max_pending=settings.ANALYSIS_MAX_PENDING,
+        queue_timeout=settings.ANALYSIS_QUEUE_TIMEOUT,
+        pose_backend=settings.POSE_BACKEND if settings.POSE_WARMUP else None,
+        pose_instances=settings.VIDEO_POSE_WORKERS or 1
+    )
+    await JobQueue.start(
+        Database.get_db(),
+        backend=settings.JOB_QUEUE_BACKEND,
+        workers=settings.JOB_WORKERS,
+        poll_interval=settings.JOB_POLL_INTERVAL,
+        lease_seconds=settings.JOB_LEASE_SECONDS,
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+        pinned_timeout=settings.JOB_PINNED_TIMEOUT_SECONDS
+    )
     print("NEURO-SHIELD AI Backend Started")
     print(f"Environment: {settings.ENVIRONMENT}")
     print(f"Database: {settings.MONGODB_DB}")
     yield
     # Shutdown
+    await JobQueue.stop()
+    await AnalysisService.stop()
+    await LLMClient.stop()
     await Database.close_db()
     print("NEURO-SHIELD AI Backend Stopped")
 
@@ -135,10 +171,26 @@ async def health_check():
         "status": "healthy",
         "database": db_status,
         "demo_mode": Database.demo_mode,
+        "analysis_service": AnalysisService.stats(),
+        "warmup": AnalysisService.warmup_status(),
+        "feature_cache": FeatureCache.stats(),
+        "llm_client": LLMClient.stats(),
+        "llm_cache": LLMResponseCache.stats(),
+        "jobs": JobQueue.stats(),
         "timestamp": __import__("datetime").datetime.utcnow().isoformat()
     }
 
 
+@app.get("/health/warmup")
+async def warmup_status():
+    """Readiness probe: 503 until analysis workers have loaded the analyzers."""
+    warmup = AnalysisService.warmup_status()
+    return JSONResponse(
+        status_code=200 if warmup["ready"] else 503,
+        content=jsonable_encoder(warmup)
+    )
+
+
 @app.get("/cors-debug")
 async def cors_debug():
     """Debug endpoint to inspect active CORS origin settings."""
@@ -4,12 +4,11 @@ Analyzes symptoms, age, and patient profile to recommend medications with proper
 Uses healthcare_dataset.csv (Kaggle-style) and Gemini AI for intelligent recommendations.
 """
 
-import pandas as pd
 import os
 from typing import List, Dict, Optional
 from datetime import datetime
-import aiohttp
 from app.database import settings
+from app.llm_client import LLMClient
 
 # Resolve project root: backend/app/medication_engine.py -> go up to project root
 _APP_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -34,6 +33,7 @@ class MedicationEngine:
             print(f"⚠ Healthcare dataset not found at {dataset_path}")
             return
         try:
+            import pandas as pd
             self.dataset = pd.read_csv(dataset_path)
             print(f"✓ Loaded {len(self.dataset)} healthcare records from {dataset_path}")
         except Exception as e:
@@ -154,21 +154,7 @@ Provide:
 
 Write in clear, professional but concise paragraphs. Do not diagnose; recommend consulting a doctor for confirmation."""
 
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/{getattr(settings, 'GEMINI_MODEL', 'gemini-1.5-flash')}:generateContent?key={settings.GEMINI_API_KEY}"
-        payload = {
-            "contents": [{"role": "user", "parts": [{"text": prompt}]}],
-            "generationConfig": {"temperature": 0.3, "maxOutputTokens": 1000}
-        }
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload, timeout=30) as response:
-                    data = await response.json()
-            candidates = data.get("candidates", [])
-            if candidates:
-                return candidates[0]["content"]["parts"][0].get("text", "")
-        except Exception as e:
-            print(f"Gemini API error: {e}")
-        return ""
+        return await LLMClient.generate_text(prompt, temperature=0.3, max_output_tokens=1000, cache="medication")
     
     def _match_symptoms_to_condition(self, symptoms: str) -> Optional[str]:
         """Match patient symptoms to medical conditions in dataset (including fever, cold, etc.)."""
@@ -0,0 +1,166 @@
+"""
+Chunked storage for raw pose frames.
+Keeps keypoints out of analysis_sessions so session documents stay small and
+feature queries never transfer frame data. Frames are split into fixed-size
+chunks, packed as float16/float32 arrays and compressed (zstd when available,
+zlib otherwise) in the pose_chunks collection.
+"""
+
+import zlib
+from typing import AsyncIterator, Dict, List, Optional, Sequence
+
+import numpy as np
+from bson import Binary
+
+from app.ai_engine.keypoints import KeypointTensor
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+class PoseFrameStore:
+    """Write and lazily read session pose frames in compressed chunks."""
+
+    COLLECTION = "pose_chunks"
+    DTYPES = {"float16": "<f2", "float32": "<f4"}
+    ZSTD_LEVEL = 3
+    ZLIB_LEVEL = 6
+
+    @staticmethod
+    def default_codec() -> str:
+        return "zstd" if zstandard is not None else "zlib"
+
+    @classmethod
+    def _compress(cls, payload: bytes, codec: str) -> bytes:
+        if codec == "zstd":
+            return zstandard.ZstdCompressor(level=cls.ZSTD_LEVEL).compress(payload)
+        return zlib.compress(payload, cls.ZLIB_LEVEL)
+
+    @classmethod
+    def _decompress(cls, payload: bytes, codec: str) -> bytes:
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("Pose chunks are zstd-compressed but zstandard is not installed")
+            return zstandard.ZstdDecompressor().decompress(payload)
+        return zlib.decompress(payload)
+
+    @classmethod
+    def encode_chunks(
+        cls,
+        tensor: KeypointTensor,
+        frame_numbers: Sequence[int],
+        chunk_frames: int = 900,
+        dtype: str = "float32",
+        codec: Optional[str] = None
+    ) -> List[Dict]:
+        """Split a tensor into compressed chunk documents (without session_id)."""
+        if dtype not in cls.DTYPES:
+            raise ValueError(f"Unsupported pose storage dtype: {dtype}")
+        codec = codec or cls.default_codec()
+        chunk_frames = max(1, chunk_frames)
+
+        frame_numbers = np.asarray(frame_numbers, dtype=np.int64)
+        timestamps = tensor.timestamps
+        if timestamps is None:
+            timestamps = frame_numbers / tensor.sample_rate
+
+        chunks = []
+        for seq, start in enumerate(range(0, len(tensor), chunk_frames)):
+            stop = min(start + chunk_frames, len(tensor))
+            values = tensor.data[start:stop].astype(cls.DTYPES[dtype])
+            chunks.append({
+                "seq": seq,
+                "start_frame": start,
+                "frame_count": stop - start,
+                "dtype": dtype,
+                "codec": codec,
+                "keypoints": Binary(cls._compress(values.tobytes(), codec)),
+                "frame_numbers": Binary(cls._compress(frame_numbers[start:stop].astype("<i8").tobytes(), codec)),
+                "timestamps": Binary(cls._compress(np.asarray(timestamps[start:stop], dtype="<f8").tobytes(), codec))
+            })
+        return chunks
+
+    @classmethod
+    def decode_chunk(cls, chunk: Dict, sample_rate: float) -> KeypointTensor:
+        """Rebuild the frames of one chunk document as a tensor."""
+        codec = chunk.get("codec", "zlib")
+        count = chunk["frame_count"]
+        values = np.frombuffer(
+            cls._decompress(chunk["keypoints"], codec),
+            dtype=cls.DTYPES[chunk.get("dtype", "float32")]
+        ).reshape(count, KeypointTensor.NUM_LANDMARKS, KeypointTensor.NUM_CHANNELS)
+        timestamps = np.frombuffer(cls._decompress(chunk["timestamps"], codec), dtype="<f8")
+        return KeypointTensor(values, sample_rate, timestamps)
+
+    @classmethod
+    def decode_frame_numbers(cls, chunk: Dict) -> np.ndarray:
+        return np.frombuffer(cls._decompress(chunk["frame_numbers"], chunk.get("codec", "zlib")), dtype="<i8")
+
+    @classmethod
+    async def save(
+        cls,
+        db,
+        session_id: str,
+        tensor: KeypointTensor,
+        frame_numbers: Sequence[int],
+        chunk_frames: int = 900,
+        dtype: str = "float32"
+    ) -> Dict:
+        """
+        Store a session's frames and return the `pose_storage` summary kept
+        on the session document.
+        """
+        chunks = cls.encode_chunks(tensor, frame_numbers, chunk_frames, dtype)
+        for chunk in chunks:
+            chunk["session_id"] = session_id
+        if chunks:
+            await db[cls.COLLECTION].insert_many(chunks, ordered=True)
+
+        return {
+            "collection": cls.COLLECTION,
+            "chunks": len(chunks),
+            "frames": len(tensor),
+            "sample_rate": tensor.sample_rate,
+            "dtype": dtype,
+            "codec": chunks[0]["codec"] if chunks else cls.default_codec(),
+            "stored_bytes": sum(
+                len(chunk["keypoints"]) + len(chunk["frame_numbers"]) + len(chunk["timestamps"])
+                for chunk in chunks
+            )
+        }
+
+    @classmethod
+    async def iter_chunks(cls, db, session_id: str, sample_rate: float = 30.0) -> AsyncIterator[KeypointTensor]:
+        """Yield a session's frames chunk by chunk, in recording order."""
+        cursor = db[cls.COLLECTION].find({"session_id": session_id}).sort("seq", 1)
+        async for chunk in cursor:
+            yield cls.decode_chunk(chunk, sample_rate)
+
+    @classmethod
+    async def load(cls, db, session_id: str, sample_rate: float = 30.0) -> Optional[KeypointTensor]:
+        """All frames of a session as one tensor, or None if none are stored."""
+        parts = [part async for part in cls.iter_chunks(db, session_id, sample_rate)]
+        if not parts:
+            return None
+        return KeypointTensor(
+            np.concatenate([part.data for part in parts]),
+            sample_rate,
+            np.concatenate([part.timestamps for part in parts])
+        )
+
+    @classmethod
+    async def load_session(cls, db, session: Dict) -> Optional[KeypointTensor]:
+        """Frames of a session document, including sessions stored before chunking."""
+        storage = session.get("pose_storage")
+        if storage:
+            return await cls.load(db, str(session["_id"]), storage.get("sample_rate", 30.0))
+        if session.get("pose_frames"):
+            return KeypointTensor.from_pose_frames(session["pose_frames"])
+        return None
+
+    @classmethod
+    async def delete(cls, db, session_id: str) -> int:
+        result = await db[cls.COLLECTION].delete_many({"session_id": session_id})
+        return result.deleted_count
@@ -0,0 +1,171 @@
+"""
+Bulk re-scoring of stored risk assessments.
+Recomputes deviation scores and risk classes against each patient's current
+baseline with the vectorized BaselineManager API and writes changes back with
+bulk_write. Run after baselines or risk thresholds change:
+
+    python -m app.risk_rescoring [--patient-id ID] [--dry-run]
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+from pymongo import UpdateOne
+
+from app.ai_engine.baseline import BaselineManager
+from app.database import Database, settings
+from app.session_repository import SessionRepository
+
+
+def _scorable(session: Dict) -> bool:
+    # Older documents may lack features; fallback features are placeholders
+    features = session.get("extracted_features") or {}
+    return not session.get("features_fallback") and all(
+        isinstance(features.get(name), (int, float)) for name in BaselineManager.REQUIRED_METRICS
+    )
+
+
+async def _rescore_batch(db, manager: BaselineManager, assessments: List[Dict], dry_run: bool) -> Dict:
+    sessions = await SessionRepository.get_many(db, [a["session_id"] for a in assessments])
+    patient_ids = list({a["patient_id"] for a in assessments})
+    baselines = {
+        doc["patient_id"]: doc
+        for doc in await db["baselines"].find({"patient_id": {"$in": patient_ids}}).to_list(None)
+    }
+
+    # Only sessions whose patient has a baseline can be scored
+    rows = [
+        a for a in assessments
+        if a["session_id"] in sessions and a["patient_id"] in baselines
+    ]
+    scorable = [a for a in rows if _scorable(sessions[a["session_id"]])]
+    skipped = len(rows) - len(scorable)
+    rows = scorable
+    if not rows:
+        return {"scored": 0, "updated": 0, "skipped": skipped, "classes": Counter()}
+
+    features = manager.feature_matrix([
+        sessions[a["session_id"]]["extracted_features"] for a in rows
+    ])
+    centers, scales = manager.baseline_vectors([baselines[a["patient_id"]].get("metrics") for a in rows])
+    scores = manager.calculate_deviation_scores(features, centers, scales)
+    calibrated = np.array([bool(baselines[a["patient_id"]].get("is_calibrated")) for a in rows])
+    classifications, confidences = manager.classify_risk_batch(scores, calibrated)
+
+    now = datetime.utcnow()
+    operations = []
+    for assessment, score, classification, confidence in zip(rows, scores, classifications, confidences):
+        current = assessment.get("risk_score", {})
+        flagged = manager.should_flag_for_review({"classification": classification})
+        if (
+            current.get("classification") == classification
+            and np.isclose(current.get("score", np.nan), score)
+            and np.isclose(current.get("confidence", np.nan), confidence)
+            and assessment.get("flagged_for_review", False) == flagged
+        ):
+            continue
+        operations.append(UpdateOne(
+            {"_id": assessment["_id"]},
+            {"$set": {
+                "risk_score.score": float(score),
+                "risk_score.classification": classification,
+                "risk_score.confidence": float(confidence),
+                "flagged_for_review": flagged,
+                "rescored_at": now
+            }}
+        ))
+
+    if operations and not dry_run:
+        await db["risk_assessments"].bulk_write(operations, ordered=False)
+
+    return {
+        "scored": len(rows),
+        "updated": len(operations),
+        "skipped": skipped,
+        "classes": Counter(classifications.tolist())
+    }
+
+
+async def rescore_risk_assessments(
+    db,
+    manager: BaselineManager,
+    patient_id: Optional[str] = None,
+    batch_size: int = 1000,
+    dry_run: bool = False
+) -> Dict:
+    """
+    Re-score risk assessments (optionally of one patient) in batches.
+    Returns counts of assessments read, scored, updated and skipped (session
+    without usable features), and the resulting risk class distribution.
+    """
+    query = {"patient_id": patient_id} if patient_id else {}
+    cursor = db["risk_assessments"].find(
+        query,
+        projection={"session_id": 1, "patient_id": 1, "risk_score": 1, "flagged_for_review": 1}
+    ).batch_size(batch_size)
+
+    totals = {"read": 0, "scored": 0, "updated": 0, "skipped": 0, "classes": Counter()}
+    batch: List[Dict] = []
+
+    async def flush():
+        result = await _rescore_batch(db, manager, batch, dry_run)
+        totals["scored"] += result["scored"]
+        totals["updated"] += result["updated"]
+        totals["skipped"] += result["skipped"]
+        totals["classes"].update(result["classes"])
+        batch.clear()
+
+    async for assessment in cursor:
+        totals["read"] += 1
+        batch.append(assessment)
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+
+    totals["classes"] = dict(totals["classes"])
+    return totals
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Re-score stored risk assessments in bulk")
+    parser.add_argument("--patient-id", help="Only re-score this patient's assessments")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--low-threshold", type=float, default=BaselineManager.LOW_THRESHOLD)
+    parser.add_argument("--medium-threshold", type=float, default=BaselineManager.MEDIUM_THRESHOLD)
+    parser.add_argument("--dry-run", action="store_true", help="Compute scores without writing them")
+    args = parser.parse_args()
+
+    manager = BaselineManager(
+        required_sessions=settings.BASELINE_SESSIONS,
+        deviation_threshold=settings.DEVIATION_THRESHOLD,
+        low_threshold=args.low_threshold,
+        medium_threshold=args.medium_threshold
+    )
+
+    await Database.connect_db()
+    try:
+        totals = await rescore_risk_assessments(
+            Database.get_db(),
+            manager,
+            patient_id=args.patient_id,
+            batch_size=args.batch_size,
+            dry_run=args.dry_run
+        )
+    finally:
+        await Database.close_db()
+
+    mode = "would update" if args.dry_run else "updated"
+    print(
+        f"Read {totals['read']} assessments, scored {totals['scored']}, {mode} {totals['updated']}, "
+        f"skipped {totals['skipped']} without usable features"
+    )
+    print(f"Risk classes: {totals['classes']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,46 +1,79 @@
-from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File
+from fastapi import APIRouter, HTTPException, Depends, status, UploadFile, File, WebSocket, WebSocketDisconnect, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional
 from app.database import Database, settings
 from app.schemas import (
     AnalysisSessionCreate, SessionResponse,
     SessionFeatures, AnalysisSessionResponse
 )
-from app.auth import get_current_user, require_roles
-import aiohttp
+from app.auth import get_current_user, require_roles, decode_access_token
 import json
-from app.ai_engine import GaitAnalyzer, TremorAnalyzer, BaselineManager
+import os
+from app.ai_engine import (
+    BaselineManager,
+    KeypointTensor,
+    PosePreprocessor,
+    SignalQualityError,
+    extract_session_features
+)
+from app.analysis_service import AnalysisService, AnalysisUnavailable
+from app.baseline_store import BaselineStore
+from app.feature_cache import FeatureCache
+from app.llm_client import LLMClient
+from app.pose_store import PoseFrameStore
+from app.session_repository import SessionRepository
+from app.uploads import spool_upload, discard_upload
 
 router = APIRouter(prefix="/api/analysis", tags=["analysis"])
 
-
-async def _call_gemini(prompt: str) -> str:
-    if not settings.GEMINI_API_KEY:
-        return ""
-
-    url = (
-        f"https://generativelanguage.googleapis.com/v1beta/models/"
-        f"{settings.GEMINI_MODEL}:generateContent?key={settings.GEMINI_API_KEY}"
+# Content type of the packed float32 pose frame upload format
+POSE_FRAMES_CONTENT_TYPE = "application/x-pose-frames"
+
+# Feature values used when AI calculation fails
+DEFAULT_FEATURES = {
+    "stride_length": 0.5,
+    "cadence": 1.0,
+    "gait_symmetry": 0.8,
+    "bradykinesia_score": 0.5,
+    "tremor_frequency": 5.0,
+    "tremor_amplitude": 0.1
+}
+
+
+def _pose_preprocessor() -> PosePreprocessor:
+    """Session preprocessing and quality gate configured from settings."""
+    return PosePreprocessor(
+        sample_rate=settings.FFT_SAMPLE_RATE,
+        min_visibility=settings.QUALITY_MIN_VISIBILITY,
+        max_gap_seconds=settings.QUALITY_MAX_GAP_SECONDS,
+        smoothing=settings.QUALITY_SMOOTHING,
+        smoothing_seconds=settings.QUALITY_SMOOTHING_SECONDS,
+        min_valid_fraction=settings.QUALITY_MIN_VALID_FRACTION,
+        min_duration_seconds=settings.QUALITY_MIN_SECONDS
     )
-    payload = {
-        "contents": [{"role": "user", "parts": [{"text": prompt}]}],
-        "generationConfig": {
-            "temperature": 0.4,
-            "maxOutputTokens": 700
-        }
-    }
 
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload, timeout=30) as response:
-                data = await response.json()
-        candidates = data.get("candidates", [])
-        if not candidates:
-            return ""
-        return candidates[0]["content"]["parts"][0].get("text", "")
-    except Exception:
-        return ""
+
+async def _session_features(
+    db,
+    pose_keypoints: KeypointTensor,
+    preprocessor: PosePreprocessor,
+    content_hash: str
+) -> Dict:
+    """Features for a session, computed in the analysis pool only on a cache miss."""
+    features = await FeatureCache.get(db, content_hash)
+    if features is None:
+        features = await AnalysisService.run(
+            extract_session_features,
+            pose_keypoints,
+            pose_keypoints.sample_rate,
+            preprocessor
+        )
+        await FeatureCache.put(db, content_hash, features)
+    return features
 
 
 async def _verify_doctor_patient_access(db, patient_id: str, doctor_id: str):
@@ -52,15 +85,300 @@ async def _verify_doctor_patient_access(db, patient_id: str, doctor_id: str):
     if not assignment:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
 
-@router.post("/upload-session", response_model=AnalysisSessionResponse)
+async def _store_analysis_session(
+    db,
+    patient_id: str,
+    user_id: str,
+    video_duration: float,
+    frame_count: int,
+    pose_keypoints: Optional[KeypointTensor],
+    frame_numbers: List[int],
+    features: Dict,
+    content_hash: Optional[str] = None,
+    features_fallback: bool = False
+) -> AnalysisSessionResponse:
+    """
+    Persist a session, update baseline and risk, and build the response.
+    Sessions with a content_hash are stored once per patient; a repeated
+    upload returns the session stored first.
+
+    With features_fallback (DEFAULT_FEATURES after a failed analysis) the
+    session is stored without content_hash, so a retry is analyzed again,
+    and it is neither folded into the baseline nor risk-scored.
+    """
+    features = dict(features)
+    signal_quality = features.pop("signal_quality", None)
+    extracted_features = SessionFeatures(
+        **features,
+        deviation_from_baseline=None,
+        risk_score=0.5,
+        risk_level="Low"
+    )
+    
+    # Raw frames go to the chunk store first so a session never points at missing frames
+    session_oid = ObjectId()
+    session_id = str(session_oid)
+    pose_storage = None
+    if pose_keypoints is not None:
+        pose_storage = await PoseFrameStore.save(
+            db,
+            session_id,
+            pose_keypoints,
+            frame_numbers,
+            chunk_frames=settings.POSE_CHUNK_FRAMES,
+            dtype=settings.POSE_STORAGE_DTYPE
+        )
+    
+    # Store session in database (features and metadata only)
+    session_doc = {
+        "_id": session_oid,
+        "patient_id": patient_id,
+        "user_id": user_id,
+        "video_duration": video_duration,
+        "frame_count": frame_count,
+        "pose_storage": pose_storage,
+        "signal_quality": signal_quality,
+        "features_fallback": features_fallback,
+        "extracted_features": extracted_features.dict(),
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
+    }
+    if content_hash is not None and not features_fallback:
+        session_doc["content_hash"] = content_hash
+    
+    try:
+        await SessionRepository.insert(db, session_doc)
+    except DuplicateKeyError:
+        # A concurrent retry of the same upload stored the session first
+        await PoseFrameStore.delete(db, session_id)
+        existing = await SessionRepository.find_by_content(db, patient_id, content_hash)
+        if existing is None:
+            raise
+        return await _existing_session_response(db, existing)
+    
+    if features_fallback:
+        # Placeholder features say nothing about the patient
+        return _session_response(
+            session_id,
+            patient_id,
+            video_duration,
+            frame_count,
+            extracted_features,
+            {"score": 0.5, "classification": "Low", "confidence": 0.0},
+            session_doc["created_at"]
+        )
+    
+    # Calculate deviation and risk
+    baseline_manager = BaselineManager(
+        required_sessions=settings.BASELINE_SESSIONS,
+        deviation_threshold=settings.DEVIATION_THRESHOLD,
+        half_life_sessions=settings.BASELINE_HALF_LIFE_SESSIONS
+    )
+    
+    # Get baseline, or fold this session into the running calibration statistics
+    baseline_doc = await db["baselines"].find_one({"patient_id": patient_id})
+    baseline_existed = baseline_doc is not None
+    if not baseline_doc:
+        baseline_doc = await BaselineStore.record_session(
+            db,
+            patient_id,
+            extracted_features.dict(),
+            baseline_manager
+        )
+    
+    # Calculate risk
+    deviation_score = 0.0
+    risk_class = {"score": 0.5, "classification": "Low", "confidence": 0.8}
+    
+    if baseline_doc:
+        try:
+            deviation_score = baseline_manager.calculate_deviation_score(
+                extracted_features.dict(),
+                baseline_doc.get("metrics", {})
+            )
+            risk_class = baseline_manager.classify_risk(
+                deviation_score,
+                baseline_doc.get("is_calibrated", False)
+            )
+        except Exception as e:
+            print(f"Risk calculation error: {str(e)}")
+    
+    # Track the calibrated baseline after scoring against it; a baseline
+    # promoted by this session already includes it
+    if baseline_existed and baseline_doc.get("is_calibrated"):
+        try:
+            await BaselineStore.update_baseline(
+                db,
+                patient_id,
+                extracted_features.dict(),
+                baseline_manager
+            )
+        except Exception as e:
+            print(f"Baseline update error: {str(e)}")
+    
+    # Store risk assessment
+    risk_doc = {
+        "patient_id": patient_id,
+        "session_id": session_id,
+        "risk_score": {
+            "score": risk_class.get("score", 0.5),
+            "classification": risk_class.get("classification", "Low"),
+            "confidence": risk_class.get("confidence", 0.8),
+            "components": {
+                "gait_symmetry": extracted_features.gait_symmetry,
+                "bradykinesia": extracted_features.bradykinesia_score,
+                "tremor_amplitude": extracted_features.tremor_amplitude
+            }
+        },
+        "flagged_for_review": baseline_manager.should_flag_for_review(risk_class),
+        "created_at": datetime.utcnow()
+    }
+    
+    await db["risk_assessments"].insert_one(risk_doc)
+    
+    return _session_response(
+        session_id,
+        patient_id,
+        video_duration,
+        frame_count,
+        extracted_features,
+        risk_class,
+        session_doc["created_at"]
+    )
+
+
+def _session_response(
+    session_id: str,
+    patient_id: str,
+    video_duration: float,
+    frame_count: int,
+    extracted_features: SessionFeatures,
+    risk_class: Dict,
+    created_at: datetime
+) -> AnalysisSessionResponse:
+    """Build the analysis response with recommendations for a stored session."""
+    gait_symmetry = extracted_features.gait_symmetry
+    bradykinesia = extracted_features.bradykinesia_score
+    tremor_amp = extracted_features.tremor_amplitude
+    
+    # Generate recommendations based on analysis
+    recommendations = []
+    if gait_symmetry < 0.7:
+        recommendations.append("Improve gait symmetry by consulting a physical therapist")
+    if bradykinesia > 0.6:
+        recommendations.append("Bradykinesia detected - consider medication review with your doctor")
+    if tremor_amp > 0.3:
+        recommendations.append("Tremor activity detected - may require assessment and adjustment of treatment")
+    if risk_class.get("classification") in ["High", "Critical"]:
+        recommendations.append("Urgent: Consult with your healthcare provider immediately")
+    if risk_class.get("classification") == "Moderate":
+        recommendations.append("Schedule follow-up consultation with your neurology team")
+    if not recommendations:
+        recommendations.append("Continue current treatment plan and regular monitoring")
+    
+    # Create analysis summary
+    analysis_summary = (
+        f"Analysis Results: Video of {video_duration:.1f}s processed with "
+        f"{frame_count} frames. Gait Symmetry: {gait_symmetry:.2%} | "
+        f"Bradykinesia Score: {bradykinesia:.2f}/1.0 | "
+        f"Tremor Amplitude: {tremor_amp:.3f} | "
+        f"Overall Risk Level: {risk_class.get('classification', 'Unknown')}"
+    )
+    
+    return AnalysisSessionResponse(
+        id=session_id,
+        patient_id=patient_id,
+        session_id=session_id,
+        video_duration=video_duration,
+        frame_count=frame_count,
+        extracted_features=extracted_features,
+        risk_score=risk_class.get("score", 0.5),
+        risk_level=risk_class.get("classification", "Low"),
+        recommendations=recommendations,
+        analysis_summary=analysis_summary,
+        created_at=created_at.isoformat(),
+        success=True
+    )
+
+
+async def _existing_session_response(db, session: Dict) -> AnalysisSessionResponse:
+    """Response for a session stored by an earlier, identical upload."""
+    session_id = str(session["_id"])
+    risk_doc = await db["risk_assessments"].find_one({"session_id": session_id})
+    # A concurrent retry may not have stored its risk assessment yet
+    risk_class = (risk_doc or {}).get("risk_score") or {"score": 0.5, "classification": "Low"}
+    
+    return _session_response(
+        session_id,
+        session["patient_id"],
+        session.get("video_duration", 0.0),
+        session.get("frame_count", 0),
+        SessionFeatures(**session["extracted_features"]),
+        risk_class,
+        session.get("created_at") or datetime.utcnow()
+    )
+
+
+@router.post(
+    "/upload-session",
+    response_model=AnalysisSessionResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"type": "object", "description": "AnalysisSessionCreate"}
+                },
+                POSE_FRAMES_CONTENT_TYPE: {
+                    "schema": {"type": "string", "format": "binary"}
+                }
+            }
+        }
+    }
+)
 async def upload_analysis_session(
-    session_data: AnalysisSessionCreate,
+    request: Request,
     context: dict = Depends(require_roles(["patient"]))
 ):
     """
     Upload pose data from video analysis session.
     Performs AI analysis and stores results.
+    
+    Accepts AnalysisSessionCreate as JSON, or packed float32 frames with
+    Content-Type application/x-pose-frames (KeypointTensor wire format).
     """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    
+    if content_type == POSE_FRAMES_CONTENT_TYPE:
+        try:
+            pose_keypoints = KeypointTensor.from_bytes(await request.body())
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid pose frame buffer: {str(e)}"
+            )
+        if len(pose_keypoints) == 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Pose frame buffer contains no frames"
+            )
+        session_data = None
+        video_duration = pose_keypoints.duration
+        frame_count = len(pose_keypoints)
+    else:
+        try:
+            session_data = AnalysisSessionCreate.parse_obj(await request.json())
+        except json.JSONDecodeError:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Request body is not valid JSON"
+            )
+        except ValidationError as e:
+            raise RequestValidationError(e.errors())
+        pose_keypoints = None
+        video_duration = session_data.video_duration
+        frame_count = session_data.frame_count
+    
     try:
         db = Database.get_db()
         user_id = context["user_id"]
@@ -75,165 +393,55 @@ async def upload_analysis_session(
         
         patient_id = str(patient.get("_id", user_id))
         
-        # Extract features from pose data
-        pose_keypoints = []
-        for frame in session_data.pose_frames:
-            pose_keypoints.append(frame.keypoints)
+        # Convert pose data once; every analyzer reads the same tensor
+        if pose_keypoints is None:
+            pose_keypoints = KeypointTensor.from_pose_frames(
+                session_data.pose_frames,
+                sample_rate=settings.FFT_SAMPLE_RATE
+            )
+        preprocessor = _pose_preprocessor()
+        content_hash = FeatureCache.content_key(pose_keypoints, preprocessor)
         
-        # Initialize AI engines
-        gait_analyzer = GaitAnalyzer(sample_rate=settings.FFT_SAMPLE_RATE)
-        tremor_analyzer = TremorAnalyzer(sample_rate=settings.FFT_SAMPLE_RATE)
+        # A retried upload returns the session its first attempt stored
+        existing = await SessionRepository.find_by_content(db, patient_id, content_hash)
+        if existing is not None:
+            return await _existing_session_response(db, existing)
         
+        features_fallback = False
         try:
-            # Calculate gait metrics
-            stride_length = gait_analyzer.calculate_stride_length(pose_keypoints)
-            cadence = gait_analyzer.calculate_cadence(pose_keypoints)
-            gait_symmetry = gait_analyzer.calculate_gait_symmetry(pose_keypoints)
-            bradykinesia = gait_analyzer.calculate_bradykinesia_score(pose_keypoints)
-            
-            # Calculate tremor metrics
-            tremor_freq = tremor_analyzer.extract_tremor_frequency(pose_keypoints, 15)
-            tremor_amp = tremor_analyzer.extract_tremor_amplitude(pose_keypoints, 15)
+            features = await _session_features(db, pose_keypoints, preprocessor, content_hash)
+        except AnalysisUnavailable as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e)
+            )
+        except SignalQualityError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Pose data quality too low: {str(e)}"
+            )
         except Exception as e:
             print(f"AI calculation error: {str(e)}")
             # Use default values if AI calculation fails
-            stride_length = 0.5
-            cadence = 1.0
-            gait_symmetry = 0.8
-            bradykinesia = 0.5
-            tremor_freq = 5.0
-            tremor_amp = 0.1
-        
-        # Create extracted features
-        extracted_features = SessionFeatures(
-            stride_length=stride_length,
-            cadence=cadence,
-            gait_symmetry=gait_symmetry,
-            tremor_frequency=tremor_freq,
-            tremor_amplitude=tremor_amp,
-            bradykinesia_score=bradykinesia,
-            deviation_from_baseline=None,
-            risk_score=0.5,
-            risk_level="Low"
-        )
-        
-        # Store session in database
-        session_doc = {
-            "patient_id": patient_id,
-            "user_id": user_id,
-            "video_duration": session_data.video_duration,
-            "frame_count": session_data.frame_count,
-            "pose_frames": [frame.dict() for frame in session_data.pose_frames],
-            "extracted_features": extracted_features.dict(),
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
-        }
+            features = dict(DEFAULT_FEATURES)
+            features_fallback = True
         
-        result = await db["analysis_sessions"].insert_one(session_doc)
-        session_id = str(result.inserted_id)
+        if session_data is not None:
+            frame_numbers = [frame.frame_number for frame in session_data.pose_frames]
+        else:
+            frame_numbers = list(range(frame_count))
         
-        # Get or create baseline
-        baseline_doc = await db["baselines"].find_one({"patient_id": patient_id})
-        
-        # Get all sessions for baseline calculation
-        all_sessions = await db["analysis_sessions"].find({
-            "patient_id": patient_id
-        }).sort("created_at", -1).to_list(100)
-        
-        # Calculate deviation and risk
-        baseline_manager = BaselineManager(
-            required_sessions=settings.BASELINE_SESSIONS,
-            deviation_threshold=settings.DEVIATION_THRESHOLD
-        )
-        
-        if not baseline_doc and len(all_sessions) >= settings.BASELINE_SESSIONS:
-            # Try to create new baseline
-            sessions_data = [sess.get("extracted_features", {}) for sess in all_sessions]
-            new_baseline = baseline_manager.create_baseline(sessions_data)
-            
-            if new_baseline:
-                baseline_insert = {
-                    "patient_id": patient_id,
-                    "metrics": new_baseline,
-                    "is_calibrated": True
-                }
-                await db["baselines"].insert_one(baseline_insert)
-                baseline_doc = baseline_insert
-        
-        # Calculate risk
-        deviation_score = 0.0
-        risk_class = {"score": 0.5, "classification": "Low", "confidence": 0.8}
-        
-        if baseline_doc:
-            try:
-                deviation_score = baseline_manager.calculate_deviation_score(
-                    extracted_features.dict(),
-                    baseline_doc.get("metrics", {})
-                )
-                risk_class = baseline_manager.classify_risk(
-                    deviation_score,
-                    baseline_doc.get("is_calibrated", False)
-                )
-            except Exception as e:
-                print(f"Risk calculation error: {str(e)}")
-        
-        # Store risk assessment
-        risk_doc = {
-            "patient_id": patient_id,
-            "session_id": session_id,
-            "risk_score": {
-                "score": risk_class.get("score", 0.5),
-                "classification": risk_class.get("classification", "Low"),
-                "confidence": risk_class.get("confidence", 0.8),
-                "components": {
-                    "gait_symmetry": gait_symmetry,
-                    "bradykinesia": bradykinesia,
-                    "tremor_amplitude": tremor_amp
-                }
-            },
-            "flagged_for_review": risk_class.get("should_flag", False),
-            "created_at": datetime.utcnow()
-        }
-        
-        await db["risk_assessments"].insert_one(risk_doc)
-        
-        # Generate recommendations based on analysis
-        recommendations = []
-        if gait_symmetry < 0.7:
-            recommendations.append("Improve gait symmetry by consulting a physical therapist")
-        if bradykinesia > 0.6:
-            recommendations.append("Bradykinesia detected - consider medication review with your doctor")
-        if tremor_amp > 0.3:
-            recommendations.append("Tremor activity detected - may require assessment and adjustment of treatment")
-        if risk_class.get("classification") in ["High", "Critical"]:
-            recommendations.append("Urgent: Consult with your healthcare provider immediately")
-        if risk_class.get("classification") == "Moderate":
-            recommendations.append("Schedule follow-up consultation with your neurology team")
-        if not recommendations:
-            recommendations.append("Continue current treatment plan and regular monitoring")
-        
-        # Create analysis summary
-        analysis_summary = (
-            f"Analysis Results: Video of {session_data.video_duration:.1f}s processed with "
-            f"{session_data.frame_count} frames. Gait Symmetry: {gait_symmetry:.2%} | "
-            f"Bradykinesia Score: {bradykinesia:.2f}/1.0 | "
-            f"Tremor Amplitude: {tremor_amp:.3f} | "
-            f"Overall Risk Level: {risk_class.get('classification', 'Unknown')}"
-        )
-        
-        return AnalysisSessionResponse(
-            id=session_id,
-            patient_id=patient_id,
-            session_id=session_id,
-            video_duration=session_data.video_duration,
-            frame_count=session_data.frame_count,
-            extracted_features=extracted_features,
-            risk_score=risk_class.get("score", 0.5),
-            risk_level=risk_class.get("classification", "Low"),
-            recommendations=recommendations,
-            analysis_summary=analysis_summary,
-            created_at=datetime.utcnow().isoformat(),
-            success=True
+        return await _store_analysis_session(
+            db,
+            patient_id,
+            user_id,
+            video_duration,
+            frame_count,
+            pose_keypoints,
+            frame_numbers,
+            features,
+            content_hash,
+            features_fallback
         )
     except HTTPException:
         raise
@@ -245,6 +453,157 @@ async def upload_analysis_session(
         )
 
 
+@router.websocket("/stream-session")
+async def stream_analysis_session(websocket: WebSocket, token: str):
+    """
+    Stream pose frames in chunks while a session is recorded.
+    
+    Chunks are validated and buffered as they arrive (up to
+    STREAM_MAX_SESSION_FRAMES frames); on "end" the whole session goes
+    through the same preprocessing, quality gate and analysis as
+    upload-session.
+    
+    Messages are JSON objects:
+      -> {"type": "frames", "frames": [PoseFrame, ...]}   (repeat per chunk)
+      <- {"type": "ack", "frames_received": n}
+      -> {"type": "end", "video_duration": seconds}
+      <- {"type": "result", "session": AnalysisSessionResponse}
+    Errors are reported as {"type": "error", "detail": ...}.
+    """
+    try:
+        context = decode_access_token(token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    if context["role"] != "patient":
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await websocket.accept()
+    
+    db = Database.get_db()
+    user_id = context["user_id"]
+    
+    patient = await db["patients"].find_one({"user_id": user_id})
+    if not patient:
+        await websocket.send_json({"type": "error", "detail": "Patient not found"})
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    patient_id = str(patient.get("_id", user_id))
+    chunks: List[KeypointTensor] = []
+    frame_numbers: List[int] = []
+    
+    try:
+        while True:
+            try:
+                # Binary frames raise KeyError, malformed text ValueError
+                message = await websocket.receive_json()
+            except (KeyError, ValueError):
+                await websocket.send_json({"type": "error", "detail": "Messages must be JSON text frames"})
+                continue
+            if not isinstance(message, dict):
+                await websocket.send_json({"type": "error", "detail": "Messages must be JSON objects"})
+                continue
+            message_type = message.get("type")
+            
+            if message_type == "end":
+                break
+            
+            if message_type != "frames":
+                await websocket.send_json({"type": "error", "detail": f"Unknown message type: {message_type}"})
+                continue
+            
+            frames = message.get("frames") or []
+            if len(frames) > settings.STREAM_MAX_CHUNK_FRAMES:
+                await websocket.send_json({
+                    "type": "error",
+                    "detail": f"Chunk exceeds {settings.STREAM_MAX_CHUNK_FRAMES} frames"
+                })
+                continue
+            if len(frame_numbers) + len(frames) > settings.STREAM_MAX_SESSION_FRAMES:
+                await websocket.send_json({
+                    "type": "error",
+                    "detail": f"Session exceeds {settings.STREAM_MAX_SESSION_FRAMES} frames"
+                })
+                continue
+            
+            try:
+                chunk = KeypointTensor.from_pose_frames(frames, sample_rate=settings.FFT_SAMPLE_RATE)
+                numbers = [
+                    int(frame.get("frame_number", len(frame_numbers) + i))
+                    for i, frame in enumerate(frames)
+                ]
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                await websocket.send_json({"type": "error", "detail": f"Invalid pose frames: {str(e)}"})
+                continue
+            
+            chunks.append(chunk)
+            frame_numbers.extend(numbers)
+            await websocket.send_json({"type": "ack", "frames_received": len(frame_numbers)})
+    except WebSocketDisconnect:
+        return
+    
+    frame_count = len(frame_numbers)
+    if frame_count == 0:
+        await websocket.send_json({"type": "error", "detail": "No pose frames received"})
+        await websocket.close()
+        return
+    
+    # Analyze the collected frames once so streamed sessions get the same
+    # preprocessing and quality gate as uploads
+    session_frames = KeypointTensor.concatenate(chunks, settings.FFT_SAMPLE_RATE)
+    chunks.clear()
+    preprocessor = _pose_preprocessor()
+    content_hash = FeatureCache.content_key(session_frames, preprocessor)
+    existing = await SessionRepository.find_by_content(db, patient_id, content_hash)
+    if existing is not None:
+        response = await _existing_session_response(db, existing)
+        await websocket.send_json({"type": "result", "session": response.dict()})
+        return
+    
+    features_fallback = False
+    try:
+        features = await _session_features(db, session_frames, preprocessor, content_hash)
+    except AnalysisUnavailable as e:
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+    except SignalQualityError as e:
+        await websocket.send_json({"type": "error", "detail": f"Pose data quality too low: {str(e)}"})
+        await websocket.close()
+        return
+    except Exception as e:
+        print(f"AI calculation error: {str(e)}")
+        features = dict(DEFAULT_FEATURES)
+        features_fallback = True
+    
+    video_duration = message.get("video_duration") or frame_count / settings.FFT_SAMPLE_RATE
+    
+    try:
+        response = await _store_analysis_session(
+            db,
+            patient_id,
+            user_id,
+            video_duration,
+            frame_count,
+            session_frames,
+            frame_numbers,
+            features,
+            content_hash,
+            features_fallback
+        )
+    except Exception as e:
+        print(f"Stream session error: {str(e)}")
+        await websocket.send_json({"type": "error", "detail": f"Failed to process session: {str(e)}"})
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+        return
+    
+    await websocket.send_json({"type": "result", "session": response.dict()})
+    await websocket.close()
+
+
 @router.post("/upload-video")
 async def upload_video_analysis(
     file: UploadFile = File(...),
@@ -259,15 +618,65 @@ async def upload_video_analysis(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found")
 
     patient_id = str(patient.get("_id", user_id))
-    content = await file.read()
-    file_size = len(content)
+    suffix = os.path.splitext(file.filename or "")[1] or ".mp4"
+    video_path = await spool_upload(
+        file,
+        settings.VIDEO_MAX_UPLOAD_MB * 1024 * 1024,
+        f"Video too large (max {settings.VIDEO_MAX_UPLOAD_MB} MB)",
+        suffix=suffix
+    )
+    file_size = os.path.getsize(video_path)
+
+    # Extract pose keypoints from the video and run the regular session analysis
+    # (imported here so OpenCV/MediaPipe stay out of API startup)
+    from app.ai_engine import extract_video_session
+
+    analysis_session = None
+    pose_metrics = ""
+    try:
+        extraction = await AnalysisService.run(
+            extract_video_session,
+            video_path,
+            settings.VIDEO_POSE_WORKERS or None,
+            settings.VIDEO_SEGMENT_FRAMES,
+            settings.VIDEO_MAX_SIDE,
+            settings.VIDEO_ROI_TRACKING,
+            settings.VIDEO_ROI_SIDE,
+            settings.VIDEO_MOTION_THRESHOLD,
+            settings.POSE_BACKEND,
+            _pose_preprocessor()
+        )
+    except Exception as e:
+        print(f"Video pose extraction error: {str(e)}")
+        extraction = None
+    finally:
+        discard_upload(video_path)
+
+    if extraction and extraction["features"]:
+        analysis_session = await _store_analysis_session(
+            db,
+            patient_id,
+            user_id,
+            extraction["duration"],
+            extraction["detected_frames"],
+            extraction["keypoints"],
+            extraction["frame_numbers"],
+            extraction["features"]
+        )
+        features = analysis_session.extracted_features
+        pose_metrics = (
+            f" Measured from the video: gait symmetry {features.gait_symmetry:.2f}, "
+            f"cadence {features.cadence or 0:.0f} steps/min, "
+            f"bradykinesia score {features.bradykinesia_score:.2f}/1.0, "
+            f"tremor amplitude {features.tremor_amplitude or 0:.3f}."
+        )
 
     prompt = (
         "You are a clinical gait review assistant. Provide a patient-friendly analysis. "
         "Do not diagnose. Provide sections: Summary, Possible Pain Areas, Risk Flags, "
         "Precautions, Doctor Guidance. Keep it concise."
-    )
-    ai_text = await _call_gemini(prompt)
+    ) + pose_metrics
+    ai_text = await LLMClient.generate_text(prompt, temperature=0.4, max_output_tokens=700)
 
     if not ai_text:
         ai_text = (
@@ -285,6 +694,7 @@ async def upload_video_analysis(
         "content_type": file.content_type,
         "file_size": file_size,
         "analysis_text": ai_text,
+        "session_id": analysis_session.session_id if analysis_session else None,
         "created_at": datetime.utcnow()
     }
 
@@ -295,6 +705,8 @@ async def upload_video_analysis(
         "patient_id": patient_id,
         "file_name": file.filename,
         "analysis_text": ai_text,
+        "analysis_session": analysis_session.dict() if analysis_session else None,
+        "signal_quality": extraction["signal_quality"] if extraction else None,
         "created_at": analysis_doc["created_at"].isoformat()
     }
 
@@ -396,7 +808,7 @@ async def get_baseline_status(
     baseline = await db["baselines"].find_one({"patient_id": patient_id})
     
     # Count sessions
-    session_count = await db["analysis_sessions"].count_documents({"patient_id": patient_id})
+    session_count = await SessionRepository.count_for_patient(db, patient_id)
     
     if baseline:
         return {
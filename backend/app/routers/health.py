@@ -10,10 +10,14 @@ from app.schemas import (
 )
 from app.auth import require_roles
 import json
+import asyncio
 import aiohttp
 from app.medications import recommend_medications
-from app.medication_engine import medication_engine
-from app.pdf_generator import pdf_generator
+from app.llm_client import InlineFile, LLMClient, LLMError
+from app.uploads import spool_upload, discard_upload
+from app.job_queue import JobQueue
+# medication_engine (pandas) and pdf_generator (reportlab) are imported by the
+# endpoints that use them so they stay out of API worker startup
 from fastapi.responses import Response
 import base64
 import tempfile
@@ -62,33 +66,6 @@ async def _create_notification(db, patient_id: str, title: str, message: str, ca
     })
 
 
-async def _call_gemini(prompt: str) -> str:
-    if not settings.GEMINI_API_KEY:
-        return ""
-
-    url = (
-        f"https://generativelanguage.googleapis.com/v1beta/models/"
-        f"{settings.GEMINI_MODEL}:generateContent?key={settings.GEMINI_API_KEY}"
-    )
-    payload = {
-        "contents": [{"role": "user", "parts": [{"text": prompt}]}],
-        "generationConfig": {
-            "temperature": 0.4,
-            "maxOutputTokens": 800
-        }
-    }
-
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload, timeout=30) as response:
-                data = await response.json()
-        candidates = data.get("candidates", [])
-        if not candidates:
-            return ""
-        return candidates[0]["content"]["parts"][0].get("text", "")
-    except Exception:
-        return ""
-
 @router.post("/risk-assessment")
 async def create_risk_assessment(
     assessment: HealthRiskAssessment,
@@ -328,7 +305,7 @@ async def generate_ai_report(
         f"Assessments: {json.dumps(assessments, default=str)}."
     )
 
-    ai_report = await _call_gemini(report_prompt)
+    ai_report = await LLMClient.generate_text(report_prompt, cache="report")
     report_content = ai_report.strip() if ai_report else (
         f"""
 ## {report_type} - {patient.get('first_name')} {patient.get('last_name')}
@@ -507,7 +484,7 @@ Latest risk: {json.dumps(latest_assessment, default=str) if latest_assessment el
 
 Respond as the Assistant. Be warm and professional. If the user's concern suggests a specialist, add [SUGGESTED_SPECIALTY: ...] at the end of your message."""
 
-    response_text = await _call_gemini(prompt)
+    response_text = await LLMClient.generate_text(prompt, cache="chatbot")
     if not response_text:
         response_text = generate_chatbot_response(message, patient, latest_assessment)
     response_text, suggested_specialty = _parse_suggested_specialty(response_text)
@@ -551,6 +528,7 @@ async def get_medication_recommendations(
     symptoms_text = ', '.join(request.symptoms) if request.symptoms else ''
     
     # Get recommendations from advanced medication engine
+    from app.medication_engine import medication_engine
     recommendations = await medication_engine.recommend_medications(
         symptoms=symptoms_text,
         age=request.age or patient_profile['age'] or 0,
@@ -627,6 +605,11 @@ async def analyze_pdf_report(
     content = await file.read()
     if len(content) > 20 * 1024 * 1024:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="PDF too large (max 20 MB).")
+    return await _analyze_pdf_content(content)
+
+
+async def _analyze_pdf_content(content: bytes) -> Dict:
+    """Gemini analysis of PDF bytes; shared by the endpoint and the pdf_report job."""
     text = _extract_text_from_pdf(content)
     if not text:
         text = "[No text could be extracted from this PDF. It may be scanned or image-based.]"
@@ -657,7 +640,7 @@ Provide a clear, patient-friendly analysis. Use these exact section headers in y
 
 Format your reply so we can parse it. After your narrative for 1-5, add a line "OVERALL_RISK: <word>" and "RECOMMENDED_SPECIALIST: <name>". Then add "FINDINGS_JSON: " followed by the JSON array only."""
 
-    ai_response = await _call_gemini(prompt)
+    ai_response = await LLMClient.generate_text(prompt, cache="pdf_report")
     if not ai_response:
         ai_response = (
             "SHORT_DESCRIPTION: This appears to be a medical report. We could not analyze it automatically. "
@@ -850,13 +833,18 @@ async def mark_notifications_read(
 @router.post("/video/analyze")
 async def analyze_video_with_gemini(
     patient_id: str,
-    video_base64: str,
+    video_base64: Optional[str] = None,
     analysis_type: str = "gait",
+    file: Optional[UploadFile] = File(None),
     context: dict = Depends(require_roles(["patient", "doctor"]))
 ):
     """
     Analyze patient video using Gemini AI for neurological assessment.
     Supports: gait analysis, tremor detection, pose analysis
+
+    Send the video as a multipart `file`; it is spooled to disk in chunks
+    and streamed to Gemini with the report prompt. The `video_base64` query
+    parameter is still accepted for older clients.
     """
     db = Database.get_db()
     patient = await _verify_patient_access(db, patient_id, context)
@@ -864,21 +852,50 @@ async def analyze_video_with_gemini(
     if not settings.GEMINI_API_KEY:
         raise HTTPException(status_code=500, detail="Gemini API not configured")
     
-    # Decode video from base64
-    try:
-        video_data = base64.b64decode(video_base64)
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Invalid video data: {str(e)}")
-    
-    # Save video temporarily
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.mp4') as tmp_file:
-        tmp_file.write(video_data)
-        video_path = tmp_file.name
+    if file is not None and file.filename:
+        video_path = await spool_upload(file, _video_max_bytes(), _video_too_large(), suffix=".mp4")
+        mime = _video_mime(file)
+    elif video_base64:
+        # Legacy path: the whole video arrives in the query string
+        if len(video_base64) > 4 * ((_video_max_bytes() + 2) // 3):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=_video_too_large())
+        try:
+            video_data = base64.b64decode(video_base64)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid video data: {str(e)}")
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp4') as tmp_file:
+            tmp_file.write(video_data)
+            video_path = tmp_file.name
+        del video_data
+        mime = "video/mp4"
+    else:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Please upload a video to analyze")
     
     try:
-        # Prepare analysis prompt based on type
-        analysis_prompts = {
-            "gait": """Analyze this video for gait abnormalities commonly seen in Parkinson's disease and other neurological conditions:
+        return await _generate_video_report(
+            db, patient, patient_id, analysis_type, context["user_id"], InlineFile(video_path, mime)
+        )
+    finally:
+        # Clean up temporary file
+        discard_upload(video_path)
+
+
+async def _generate_video_report(
+    db,
+    patient: dict,
+    patient_id: str,
+    analysis_type: str,
+    analyzed_by: str,
+    video: Optional[InlineFile] = None
+) -> Dict:
+    """
+    Gemini neurological report for a video analysis; shared by /video/analyze
+    and the video_report job. The video, when given, is sent inline with the
+    prompt; without it the report is written from the patient details alone.
+    """
+    # Prepare analysis prompt based on type
+    analysis_prompts = {
+        "gait": """Analyze this video for gait abnormalities commonly seen in Parkinson's disease and other neurological conditions:
             
 1. **Gait Characteristics:**
    - Step length and symmetry
@@ -905,7 +922,7 @@ async def analyze_video_with_gemini(
 
 Provide a detailed, professional medical analysis report.""",
 
-            "tremor": """Analyze this video for tremor characteristics:
+        "tremor": """Analyze this video for tremor characteristics:
 
 1. **Tremor Properties:**
    - Type: Resting, postural, or action tremor
@@ -931,7 +948,7 @@ Provide a detailed, professional medical analysis report.""",
 
 Provide comprehensive tremor analysis report.""",
 
-            "pose": """Analyze body posture and movement patterns:
+        "pose": """Analyze body posture and movement patterns:
 
 1. **Posture Analysis:**
    - Spinal alignment
@@ -957,16 +974,11 @@ Provide comprehensive tremor analysis report.""",
    - Rehabilitation needs
 
 Provide detailed postural and movement analysis."""
-        }
-        
-        prompt = analysis_prompts.get(analysis_type, analysis_prompts["gait"])
-        
-        # Call Gemini Vision API for video analysis
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={settings.GEMINI_API_KEY}"
-        
-        # For now, use text-based analysis with frame description
-        # In production, you'd upload the video file to Gemini File API
-        enhanced_prompt = f"""
+    }
+    
+    prompt = analysis_prompts.get(analysis_type, analysis_prompts["gait"])
+    
+    enhanced_prompt = f"""
 {prompt}
 
 **Patient Information:**
@@ -1014,80 +1026,69 @@ Based on findings, suggest appropriate medications with dosages:
 ---
 *This is an AI-assisted analysis. All findings should be confirmed by a licensed neurologist.*
 """
-        
-        payload = {
-            "contents": [{
-                "role": "user",
-                "parts": [{"text": enhanced_prompt}]
-            }],
-            "generationConfig": {
+    
+    # Call Gemini for the report
+    try:
+        data = await LLMClient.generate_content(
+            [{"text": enhanced_prompt}] + ([video] if video is not None else []),
+            {
                 "temperature": 0.2,
                 "maxOutputTokens": 2048,
                 "topP": 0.8,
                 "topK": 40
-            }
-        }
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload, timeout=60) as response:
-                if response.status != 200:
-                    raise HTTPException(status_code=500, detail="Gemini API error")
-                data = await response.json()
-        
-        candidates = data.get("candidates", [])
-        if not candidates:
-            raise HTTPException(status_code=500, detail="No analysis generated")
-        
-        analysis_report = candidates[0]["content"]["parts"][0].get("text", "")
-        
-        # Extract medication recommendations from the report
-        medications_mentioned = []
-        for med in ["Paracetamol", "Ibuprofen", "Aspirin", "Lipitor", "Penicillin", "Levodopa", "Carbidopa", "Pramipexole"]:
-            if med.lower() in analysis_report.lower():
-                medications_mentioned.append(med)
-        
-        # Save analysis to database
-        analysis_doc = {
-            "patient_id": patient_id,
-            "video_path": f"video_{datetime.utcnow().timestamp()}.mp4",
-            "analysis_type": analysis_type,
-            "ai_model": "Gemini 1.5 Flash",
-            "report_content": analysis_report,
-            "medications_recommended": medications_mentioned,
-            "created_at": datetime.utcnow(),
-            "analyzed_by": context["user_id"],
-            "patient_name": f"{patient.get('first_name', '')} {patient.get('last_name', '')}",
-            "patient_age": patient.get('age')
-        }
-        
-        result = await db["video_analyses"].insert_one(analysis_doc)
-        
-        # Create notification
-        await _create_notification(
-            db,
-            patient_id,
-            "Video Analysis Complete",
-            f"AI analysis completed for {analysis_type} assessment. View detailed report now.",
-            "report"
+            },
+            timeout=120 if video is not None else 60
         )
-        
-        return {
-            "success": True,
-            "analysis_id": str(result.inserted_id),
-            "patient_id": patient_id,
-            "analysis_type": analysis_type,
-            "report": analysis_report,
-            "medications_recommended": medications_mentioned,
-            "created_at": datetime.utcnow().isoformat(),
-            "ai_model": "Gemini 1.5 Flash"
-        }
-        
-    finally:
-        # Clean up temporary file
-        try:
-            os.unlink(video_path)
-        except:
-            pass
+    except LLMError as e:
+        print(f"Gemini API error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Gemini API error")
+    
+    if not data.get("candidates"):
+        raise HTTPException(status_code=500, detail="No analysis generated")
+    
+    analysis_report = LLMClient.response_text(data)
+    
+    # Extract medication recommendations from the report
+    medications_mentioned = []
+    for med in ["Paracetamol", "Ibuprofen", "Aspirin", "Lipitor", "Penicillin", "Levodopa", "Carbidopa", "Pramipexole"]:
+        if med.lower() in analysis_report.lower():
+            medications_mentioned.append(med)
+    
+    # Save analysis to database
+    analysis_doc = {
+        "patient_id": patient_id,
+        "video_path": f"video_{datetime.utcnow().timestamp()}.mp4",
+        "analysis_type": analysis_type,
+        "ai_model": "Gemini 1.5 Flash",
+        "report_content": analysis_report,
+        "medications_recommended": medications_mentioned,
+        "created_at": datetime.utcnow(),
+        "analyzed_by": analyzed_by,
+        "patient_name": f"{patient.get('first_name', '')} {patient.get('last_name', '')}",
+        "patient_age": patient.get('age')
+    }
+    
+    result = await db["video_analyses"].insert_one(analysis_doc)
+    
+    # Create notification
+    await _create_notification(
+        db,
+        patient_id,
+        "Video Analysis Complete",
+        f"AI analysis completed for {analysis_type} assessment. View detailed report now.",
+        "report"
+    )
+    
+    return {
+        "success": True,
+        "analysis_id": str(result.inserted_id),
+        "patient_id": patient_id,
+        "analysis_type": analysis_type,
+        "report": analysis_report,
+        "medications_recommended": medications_mentioned,
+        "created_at": datetime.utcnow().isoformat(),
+        "ai_model": "Gemini 1.5 Flash"
+    }
 
 
 @router.get("/video/analysis/{analysis_id}/pdf")
@@ -1096,6 +1097,9 @@ async def download_analysis_pdf(
     context: dict = Depends(require_roles(["patient", "doctor"]))
 ):
     """Download video analysis report as professional PDF."""
+    from app.medication_engine import medication_engine
+    from app.pdf_generator import pdf_generator
+    
     db = Database.get_db()
     
     # Get analysis
@@ -1624,7 +1628,7 @@ Reply with ONLY a valid JSON object (no markdown, no extra text) with these exac
 
 Include a roadmap: what to do this week and next week to improve lifestyle. Be specific and encouraging."""
 
-        ai_response = await _call_gemini(prompt)
+        ai_response = await LLMClient.generate_text(prompt, cache="fitness")
         analysis = {}
         if ai_response:
             text = ai_response.strip()
@@ -1861,44 +1865,44 @@ def _default_video_analysis():
     }
 
 
-@router.post("/video-analysis/analyze")
-async def analyze_video(
-    file: Optional[UploadFile] = File(None),
-    context: dict = Depends(require_roles(["patient"]))
-):
-    """Analyze patient video (upload or recording) for gait, mobility, and movement using Gemini AI."""
-    try:
-        db = Database.get_db()
-        patient = await db["patients"].find_one({"user_id": context["user_id"]})
-        if not patient:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found")
-        patient_id = str(patient.get("_id", ""))
+async def _unlocked_video_patient_id(db, context: dict) -> str:
+    """The calling patient's id, once a doctor has unlocked video analysis for them."""
+    patient = await db["patients"].find_one({"user_id": context["user_id"]})
+    if not patient:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Patient not found")
+    patient_id = str(patient.get("_id", ""))
 
-        assignments = await db["patient_doctor_assignments"].find({
-            "patient_id": patient_id,
-            "is_active": True
-        }).to_list(100)
-        if not any(a.get("is_video_analysis_unlocked") for a in assignments):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Video analysis not unlocked for this patient"
-            )
+    assignments = await db["patient_doctor_assignments"].find({
+        "patient_id": patient_id,
+        "is_active": True
+    }).to_list(100)
+    if not any(a.get("is_video_analysis_unlocked") for a in assignments):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Video analysis not unlocked for this patient"
+        )
+    return patient_id
 
-        if not file or not file.filename:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Please upload or record a video to analyze"
-            )
 
-        content = await file.read()
-        if len(content) > 50 * 1024 * 1024:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Video too large (max 50 MB)")
-        video_b64 = base64.standard_b64encode(content).decode("utf-8")
-        mime = file.content_type or "video/mp4"
-        if "webm" in (file.filename or "").lower():
-            mime = "video/webm"
+def _video_max_bytes() -> int:
+    return settings.VIDEO_MAX_UPLOAD_MB * 1024 * 1024
 
-        analysis_prompt = """Analyze this video for mobility and movement. Focus on:
+
+def _video_too_large() -> str:
+    return f"Video too large (max {settings.VIDEO_MAX_UPLOAD_MB} MB)"
+
+
+def _video_mime(file: UploadFile) -> str:
+    mime = file.content_type or "video/mp4"
+    if "webm" in (file.filename or "").lower():
+        mime = "video/webm"
+    return mime
+
+
+async def _run_video_analysis(db, patient_id: str, video_path: str, mime: str, file_name: str) -> Dict:
+    """Gemini gait/mobility analysis of a video file; shared by the endpoint and the video_analysis job."""
+
+    analysis_prompt = """Analyze this video for mobility and movement. Focus on:
 1. Gait quality (0-100), balance (0-100), stride consistency (0-100), movement fluidity (0-100)
 2. Posture description (upright, stooped, etc.)
 3. Movement description (what you see: walking, standing, any difficulties)
@@ -1913,65 +1917,83 @@ Reply with ONLY a valid JSON object (no markdown, no extra text) with these exac
 "recommendations" (array of strings), "summary" (string).
 """
 
-        analysis = _default_video_analysis()
-        report_text = ""
-        if settings.GEMINI_API_KEY:
-            url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={settings.GEMINI_API_KEY}"
-            parts = [
-                {"text": analysis_prompt},
-                {"inline_data": {"mime_type": mime, "data": video_b64}}
-            ]
-            payload = {
-                "contents": [{"role": "user", "parts": parts}],
-                "generationConfig": {"temperature": 0.2, "maxOutputTokens": 2048, "responseMimeType": "application/json"}
-            }
-            try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(url, json=payload, timeout=120) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            candidates = data.get("candidates", [])
-                            if candidates:
-                                text = candidates[0].get("content", {}).get("parts", [{}])[0].get("text", "")
-                                report_text = text
-                                if text:
-                                    text_clean = text.strip()
-                                    if text_clean.startswith("```"):
-                                        text_clean = text_clean.split("```")[1]
-                                        if text_clean.startswith("json"):
-                                            text_clean = text_clean[4:]
-                                    first_brace = text_clean.find("{")
-                                    if first_brace >= 0:
-                                        last_brace = text_clean.rfind("}")
-                                        if last_brace > first_brace:
-                                            parsed = json.loads(text_clean[first_brace:last_brace + 1])
-                                            analysis = {**_default_video_analysis(), **parsed}
-            except Exception as gemini_err:
-                print(f"Gemini video analysis error: {gemini_err}")
-                report_text = analysis.get("summary", "") or "Analysis completed with default report."
-
-        file_name = file.filename or "recording.webm"
-        created = datetime.utcnow()
-        analysis_doc = {
-            "patient_id": patient_id,
-            "analysis_type": "video_gait_analysis",
-            "analysis_date": created,
-            "created_at": created,
-            "file_name": file_name,
-            "video_analysis": analysis,
-            "report_content": report_text or analysis.get("summary", ""),
-            "analysis_text": analysis.get("summary", ""),
-            "doctor_notes": "",
-            "is_reviewed": False
-        }
-        result = await db["video_analyses"].insert_one(analysis_doc)
+    analysis = _default_video_analysis()
+    report_text = ""
+    if settings.GEMINI_API_KEY:
+        parts = [
+            {"text": analysis_prompt},
+            InlineFile(video_path, mime)
+        ]
+        try:
+            data = await LLMClient.generate_content(
+                parts,
+                {"temperature": 0.2, "maxOutputTokens": 2048, "responseMimeType": "application/json"},
+                timeout=120
+            )
+            text = LLMClient.response_text(data)
+            report_text = text
+            if text:
+                text_clean = text.strip()
+                if text_clean.startswith("```"):
+                    text_clean = text_clean.split("```")[1]
+                    if text_clean.startswith("json"):
+                        text_clean = text_clean[4:]
+                first_brace = text_clean.find("{")
+                if first_brace >= 0:
+                    last_brace = text_clean.rfind("}")
+                    if last_brace > first_brace:
+                        parsed = json.loads(text_clean[first_brace:last_brace + 1])
+                        analysis = {**_default_video_analysis(), **parsed}
+        except Exception as gemini_err:
+            print(f"Gemini video analysis error: {gemini_err}")
+            report_text = analysis.get("summary", "") or "Analysis completed with default report."
+
+    created = datetime.utcnow()
+    analysis_doc = {
+        "patient_id": patient_id,
+        "analysis_type": "video_gait_analysis",
+        "analysis_date": created,
+        "created_at": created,
+        "file_name": file_name,
+        "video_analysis": analysis,
+        "report_content": report_text or analysis.get("summary", ""),
+        "analysis_text": analysis.get("summary", ""),
+        "doctor_notes": "",
+        "is_reviewed": False
+    }
+    result = await db["video_analyses"].insert_one(analysis_doc)
 
-        return {
-            "success": True,
-            "analysisId": str(result.inserted_id),
-            "analysis_date": created.isoformat(),
-            **analysis
-        }
+    return {
+        "success": True,
+        "analysisId": str(result.inserted_id),
+        "analysis_date": created.isoformat(),
+        **analysis
+    }
+
+
+@router.post("/video-analysis/analyze")
+async def analyze_video(
+    file: Optional[UploadFile] = File(None),
+    context: dict = Depends(require_roles(["patient"]))
+):
+    """Analyze patient video (upload or recording) for gait, mobility, and movement using Gemini AI."""
+    try:
+        db = Database.get_db()
+        patient_id = await _unlocked_video_patient_id(db, context)
+
+        if not file or not file.filename:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Please upload or record a video to analyze"
+            )
+
+        video_path = await spool_upload(file, _video_max_bytes(), _video_too_large())
+        try:
+            return await _run_video_analysis(
+                db, patient_id, video_path, _video_mime(file), file.filename or "recording.webm"
+            )
+        finally:
+            discard_upload(video_path)
     except HTTPException:
         raise
     except Exception as e:
@@ -2195,3 +2217,206 @@ async def send_sos_alert(
             else f"Alert logged. SMS note: {sms_error or 'Unknown error'}. Please also call emergency services directly."
         )
     }
+
+
+# =====================
+# BACKGROUND ANALYSIS JOBS
+# =====================
+# The video and PDF analyses above hold the request open while Gemini
+# responds; these endpoints queue the same work on JobQueue and return a job
+# id to poll instead.
+
+def _spool_dir() -> str:
+    path = settings.JOB_SPOOL_DIR or os.path.join(tempfile.gettempdir(), "medo-shield-jobs")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _spool_host() -> Optional[str]:
+    # Without a shared JOB_SPOOL_DIR the spooled file only exists on this
+    # replica, so the job must run here too
+    return None if settings.JOB_SPOOL_DIR else JobQueue.host
+
+
+def _read_spooled(path: str) -> bytes:
+    with open(path, "rb") as spool:
+        return spool.read()
+
+
+def _discard_spooled(payload: Dict):
+    discard_upload(payload.get("path"))
+
+
+async def _submit_job(kind: str, payload: Dict, patient_id: Optional[str], context: dict) -> Dict:
+    try:
+        job_id = await JobQueue.submit(
+            kind,
+            payload,
+            patient_id=patient_id,
+            created_by=context["user_id"],
+            host=_spool_host() if payload.get("path") else None
+        )
+    except Exception as e:
+        discard_upload(payload.get("path"))
+        print(f"Job submit error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Background analysis is unavailable"
+        )
+    return {
+        "job_id": job_id,
+        "kind": kind,
+        "status": "queued",
+        "status_url": f"/api/health/jobs/{job_id}"
+    }
+
+
+@JobQueue.register("video_analysis", "Video Analysis", cleanup=_discard_spooled)
+async def _video_analysis_job(db, payload: Dict) -> Dict:
+    return await _run_video_analysis(
+        db, payload["patient_id"], payload["path"], payload["mime"], payload["file_name"]
+    )
+
+
+@JobQueue.register("video_report", "Video Analysis", notify=False, cleanup=_discard_spooled)
+async def _video_report_job(db, payload: Dict) -> Dict:
+    # _generate_video_report sends its own "Video Analysis Complete" notification
+    patient = await db["patients"].find_one({"_id": ObjectId(payload["patient_ref"])})
+    if not patient:
+        raise ValueError("Patient not found")
+    video = InlineFile(payload["path"], payload["mime"]) if payload.get("path") else None
+    return await _generate_video_report(
+        db, patient, payload["patient_id"], payload["analysis_type"], payload["analyzed_by"], video
+    )
+
+
+@JobQueue.register("pdf_report", "PDF Report Analysis", cleanup=_discard_spooled)
+async def _pdf_report_job(db, payload: Dict) -> Dict:
+    content = await asyncio.to_thread(_read_spooled, payload["path"])
+    return await _analyze_pdf_content(content)
+
+
+@router.post("/video-analysis/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_video_analysis_job(
+    file: Optional[UploadFile] = File(None),
+    context: dict = Depends(require_roles(["patient"]))
+):
+    """Queue /video-analysis/analyze as a background job; the result is the same response."""
+    db = Database.get_db()
+    patient_id = await _unlocked_video_patient_id(db, context)
+    if not file or not file.filename:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Please upload or record a video to analyze"
+        )
+
+    path = await spool_upload(file, _video_max_bytes(), _video_too_large(), directory=_spool_dir())
+    payload = {
+        "path": path,
+        "patient_id": patient_id,
+        "mime": _video_mime(file),
+        "file_name": file.filename or "recording.webm"
+    }
+    return await _submit_job("video_analysis", payload, patient_id, context)
+
+
+@router.post("/video/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_video_report_job(
+    patient_id: str,
+    analysis_type: str = "gait",
+    file: Optional[UploadFile] = File(None),
+    context: dict = Depends(require_roles(["patient", "doctor"]))
+):
+    """Queue the /video/analyze neurological report as a background job, with an optional video `file`."""
+    db = Database.get_db()
+    patient = await _verify_patient_access(db, patient_id, context)
+    if not settings.GEMINI_API_KEY:
+        raise HTTPException(status_code=500, detail="Gemini API not configured")
+
+    payload = {
+        "patient_id": patient_id,
+        "patient_ref": str(patient["_id"]),
+        "analysis_type": analysis_type,
+        "analyzed_by": context["user_id"]
+    }
+    if file is not None and file.filename:
+        payload["path"] = await spool_upload(
+            file, _video_max_bytes(), _video_too_large(), directory=_spool_dir(), suffix=".mp4"
+        )
+        payload["mime"] = _video_mime(file)
+    return await _submit_job("video_report", payload, str(patient["_id"]), context)
+
+
+@router.post("/pdf-report/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_pdf_report_job(
+    file: UploadFile = File(...),
+    patient_id: Optional[str] = None,
+    context: dict = Depends(require_roles(["patient", "doctor"]))
+):
+    """
+    Queue /pdf-report/analyze as a background job. Patients are notified
+    when it finishes; doctors may pass patient_id to notify that patient.
+    """
+    if not file.filename or not file.filename.lower().endswith(".pdf"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Please upload a PDF file.")
+    db = Database.get_db()
+    notify_patient_id = None
+    if context["role"] == "patient":
+        patient = await db["patients"].find_one({"user_id": context["user_id"]})
+        notify_patient_id = str(patient["_id"]) if patient else None
+    elif patient_id:
+        patient = await _verify_patient_access(db, patient_id, context)
+        notify_patient_id = str(patient["_id"])
+
+    path = await spool_upload(file, 20 * 1024 * 1024, "PDF too large (max 20 MB).", directory=_spool_dir())
+    return await _submit_job("pdf_report", {"path": path}, notify_patient_id, context)
+
+
+async def _accessible_job(db, job_id: str, context: dict) -> Dict:
+    job = await JobQueue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    if job.get("created_by") != context["user_id"]:
+        if not job.get("patient_id"):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+        await _verify_patient_access(db, job["patient_id"], context)
+    return job
+
+
+@router.get("/jobs/{job_id}")
+async def get_job_status(
+    job_id: str,
+    context: dict = Depends(require_roles(["patient", "doctor"]))
+):
+    """Status of a background analysis job."""
+    db = Database.get_db()
+    job = await _accessible_job(db, job_id, context)
+    return {
+        "job_id": job["_id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "patient_id": job.get("patient_id"),
+        "created_at": job.get("created_at"),
+        "started_at": job.get("started_at"),
+        "finished_at": job.get("finished_at"),
+        "error": job.get("error"),
+        "result_url": f"/api/health/jobs/{job_id}/result" if job["status"] == "completed" else None
+    }
+
+
+@router.get("/jobs/{job_id}/result")
+async def get_job_result(
+    job_id: str,
+    context: dict = Depends(require_roles(["patient", "doctor"]))
+):
+    """Result of a completed job: the response the synchronous endpoint would have returned."""
+    db = Database.get_db()
+    job = await _accessible_job(db, job_id, context)
+    if job["status"] == "completed":
+        return job.get("result") or {}
+    if job["status"] == "failed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job failed: {job.get('error') or 'unknown error'}"
+        )
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Job is {job['status']}")
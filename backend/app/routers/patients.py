@@ -14,6 +14,7 @@ from app.auth import (
     create_access_token, validate_email, validate_password_strength,
     require_roles
 )
+from app.session_repository import SessionRepository
 
 router = APIRouter(prefix="/api/patients", tags=["patients"])
 
@@ -182,18 +183,17 @@ async def get_patient_trends(
     # Get sessions within specified days
     start_date = datetime.utcnow() - timedelta(days=days)
     
-    sessions = await db["analysis_sessions"].find({
-        "patient_id": patient_id,
-        "created_at": {"$gte": start_date}
-    }).sort("created_at", -1).to_list(100)
+    # Sessions and their risk assessments in one round-trip
+    sessions = await SessionRepository.list_with_risk(
+        db, patient_id, view="features", since=start_date
+    )
     
     trend_data = []
     latest_risk_level = "Unknown"
     last_session_date = None
     
     for index, session in enumerate(sessions):
-        # Get risk assessment for this session
-        risk = await db["risk_assessments"].find_one({"session_id": str(session.get("_id", ""))})
+        risk = session.get("risk_assessment")
         
         risk_level = "Unknown"
         if risk:
@@ -282,13 +282,11 @@ async def get_dashboard(context: dict = Depends(require_roles(["patient"]))):
     
     patient_id = str(patient.get("_id", user_id))
     
-    # Get all sessions
-    all_sessions = await db["analysis_sessions"].find({
-        "patient_id": patient_id
-    }).sort("created_at", -1).to_list(100)
+    # Count all sessions, but only fetch the ones shown
+    total_sessions = await SessionRepository.count_for_patient(db, patient_id)
+    all_sessions = await SessionRepository.list_with_risk(db, patient_id, view="features", limit=5)
     
     # Calculate statistics
-    total_sessions = len(all_sessions)
     
     gait_symmetries = []
     tremor_amplitudes = []
@@ -316,10 +314,7 @@ async def get_dashboard(context: dict = Depends(require_roles(["patient"]))):
                 tremor_amplitudes.append(tremor_amp)
             bradykinesia_scores.append(bradykinesia)
             
-            # Get risk for this session
-            risk = await db["risk_assessments"].find_one({
-                "session_id": str(session.get("_id", ""))
-            })
+            risk = session.get("risk_assessment")
             
             risk_level = "UNKNOWN"
             if risk:
@@ -80,6 +80,10 @@ class PoseFrame(BaseModel):
 class SessionFeatures(BaseModel):
     stride_length: Optional[float] = None
     cadence: Optional[float] = None
+    stride_time_variability: Optional[float] = None
+    step_time_variability: Optional[float] = None
+    step_time_asymmetry: Optional[float] = None
+    stance_ratio: Optional[float] = None
     gait_symmetry: float
     tremor_frequency: Optional[float] = None
     tremor_amplitude: Optional[float] = None
@@ -160,6 +164,10 @@ class TrendDataPoint(BaseModel):
     date: datetime
     stride_length: Optional[float] = None
     cadence: Optional[float] = None
+    stride_time_variability: Optional[float] = None
+    step_time_variability: Optional[float] = None
+    step_time_asymmetry: Optional[float] = None
+    stance_ratio: Optional[float] = None
     gait_symmetry: float
     tremor_frequency: Optional[float] = None
     tremor_amplitude: Optional[float] = None
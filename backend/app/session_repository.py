@@ -0,0 +1,152 @@
+"""
+Data access for analysis sessions.
+Routers read sessions through named projections so list views only transfer
+the fields they use; raw pose frames are loaded separately on demand.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+
+from app.ai_engine.keypoints import KeypointTensor
+from app.pose_store import PoseFrameStore
+
+
+class SessionRepository:
+    """Queries over the analysis_sessions collection."""
+
+    COLLECTION = "analysis_sessions"
+
+    # Named projections; None returns the whole document
+    PROJECTIONS: Dict[str, Optional[Dict[str, int]]] = {
+        "features": {
+            "extracted_features": 1,
+            "features_fallback": 1,
+            "created_at": 1
+        },
+        "summary": {
+            "patient_id": 1,
+            "video_duration": 1,
+            "frame_count": 1,
+            "extracted_features": 1,
+            "pose_storage": 1,
+            "created_at": 1
+        },
+        "full": None
+    }
+
+    @classmethod
+    def _projection(cls, view: str) -> Optional[Dict[str, int]]:
+        if view not in cls.PROJECTIONS:
+            raise ValueError(f"Unknown session view: {view}")
+        return cls.PROJECTIONS[view]
+
+    @classmethod
+    async def insert(cls, db, session_doc: Dict) -> str:
+        result = await db[cls.COLLECTION].insert_one(session_doc)
+        return str(result.inserted_id)
+
+    @classmethod
+    async def get(cls, db, session_id: str, view: str = "summary") -> Optional[Dict]:
+        if not ObjectId.is_valid(session_id):
+            return None
+        return await db[cls.COLLECTION].find_one(
+            {"_id": ObjectId(session_id)},
+            projection=cls._projection(view)
+        )
+
+    @classmethod
+    async def find_by_content(cls, db, patient_id: str, content_hash: str, view: str = "full") -> Optional[Dict]:
+        """A patient's session previously stored from identical pose data."""
+        return await db[cls.COLLECTION].find_one(
+            {"patient_id": patient_id, "content_hash": content_hash},
+            projection=cls._projection(view)
+        )
+
+    @classmethod
+    async def get_many(cls, db, session_ids: List[str], view: str = "features") -> Dict[str, Dict]:
+        """Sessions by id in one query, keyed by their string id."""
+        object_ids = [ObjectId(sid) for sid in session_ids if ObjectId.is_valid(sid)]
+        if not object_ids:
+            return {}
+        sessions = await db[cls.COLLECTION].find(
+            {"_id": {"$in": object_ids}},
+            projection=cls._projection(view)
+        ).to_list(None)
+        return {str(session["_id"]): session for session in sessions}
+
+    @classmethod
+    async def list_for_patient(
+        cls,
+        db,
+        patient_id: str,
+        view: str = "features",
+        since: Optional[datetime] = None,
+        limit: int = 100,
+        include_fallback: bool = True
+    ) -> List[Dict]:
+        """
+        A patient's sessions, newest first. include_fallback=False leaves out
+        sessions stored with placeholder features after a failed analysis.
+        """
+        query: Dict = {"patient_id": patient_id}
+        if since is not None:
+            query["created_at"] = {"$gte": since}
+        if not include_fallback:
+            query["features_fallback"] = {"$ne": True}
+
+        return await db[cls.COLLECTION].find(
+            query,
+            projection=cls._projection(view)
+        ).sort("created_at", -1).to_list(limit)
+
+    @classmethod
+    async def list_with_risk(
+        cls,
+        db,
+        patient_id: str,
+        view: str = "features",
+        since: Optional[datetime] = None,
+        limit: int = 100
+    ) -> List[Dict]:
+        """
+        A patient's sessions, newest first, each with its risk assessment
+        joined as `risk_assessment` (absent if none) in one aggregation.
+        """
+        query: Dict = {"patient_id": patient_id}
+        if since is not None:
+            query["created_at"] = {"$gte": since}
+
+        pipeline: List[Dict] = [
+            {"$match": query},
+            {"$sort": {"created_at": -1}},
+            {"$limit": limit}
+        ]
+        projection = cls._projection(view)
+        if projection is not None:
+            pipeline.append({"$project": projection})
+        pipeline += [
+            {"$lookup": {
+                "from": "risk_assessments",
+                "let": {"session_id": {"$toString": "$_id"}},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": ["$session_id", "$$session_id"]}}},
+                    {"$project": {"_id": 0, "risk_score": 1, "flagged_for_review": 1}},
+                    {"$limit": 1}
+                ],
+                "as": "risk_assessment"
+            }},
+            {"$unwind": {"path": "$risk_assessment", "preserveNullAndEmptyArrays": True}}
+        ]
+
+        return await db[cls.COLLECTION].aggregate(pipeline).to_list(limit)
+
+    @classmethod
+    async def count_for_patient(cls, db, patient_id: str) -> int:
+        return await db[cls.COLLECTION].count_documents({"patient_id": patient_id})
+
+    @classmethod
+    async def load_frames(cls, db, session: Dict) -> Optional[KeypointTensor]:
+        """Raw pose frames of a session (fetched from the chunk store)."""
+        return await PoseFrameStore.load_session(db, session)
@@ -0,0 +1,66 @@
+"""
+Upload spooling.
+
+Uploaded files are copied to a temp file in fixed-size chunks instead of
+being read into memory whole, so a request holds one chunk at a time no
+matter how large the upload is.
+
+The size limit is a post-hoc check: Starlette parses multipart bodies into
+its own SpooledTemporaryFile (in memory up to 1 MB, then on disk) before the
+endpoint runs, so by the time spool_upload sees an UploadFile the whole
+upload has already been received. The check keeps oversized files out of
+the spool directory and out of Gemini requests; it does not bound what the
+server accepts, which is up to the proxy in front of it (e.g. nginx
+client_max_body_size).
+"""
+
+import os
+import tempfile
+from typing import Optional
+
+from fastapi import HTTPException, UploadFile, status
+
+from app.database import settings
+
+
+async def spool_upload(
+    file: UploadFile,
+    max_bytes: int,
+    too_large: str,
+    directory: Optional[str] = None,
+    suffix: Optional[str] = None
+) -> str:
+    """
+    Copy an upload to a temp file and return its path; the caller deletes it
+    (see discard_upload). Raises HTTP 400 with `too_large` past `max_bytes`,
+    checked against the already-received upload (see the module docstring).
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=too_large)
+
+    if suffix is None:
+        suffix = os.path.splitext(file.filename or "")[1]
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=directory)
+    written = 0
+    try:
+        with os.fdopen(fd, "wb") as spool:
+            while True:
+                chunk = await file.read(settings.UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > max_bytes:
+                    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=too_large)
+                spool.write(chunk)
+    except BaseException:
+        discard_upload(path)
+        raise
+    return path
+
+
+def discard_upload(path: Optional[str]):
+    if path:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
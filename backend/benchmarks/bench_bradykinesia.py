@@ -0,0 +1,60 @@
+"""
+Bradykinesia scoring benchmark.
+
+Compares the vectorized GaitAnalyzer.calculate_bradykinesia_score against the
+original per-joint scalar loop on synthetic 1, 5 and 20 minute sessions and
+checks that both produce the same score.
+
+Run from the backend directory:
+    python -m benchmarks.bench_bradykinesia
+"""
+
+import time
+import numpy as np
+
+from app.ai_engine import GaitAnalyzer, KeypointTensor
+
+SAMPLE_RATE = 30.0
+DURATIONS_MINUTES = [1, 5, 20]
+
+
+def synthetic_session(minutes: float, seed: int = 0) -> KeypointTensor:
+    """Random-walk pose sequence with 33 landmarks."""
+    rng = np.random.default_rng(seed)
+    frames = int(minutes * 60 * SAMPLE_RATE)
+    steps = rng.normal(0.0, 0.002, size=(frames, 33, 3))
+    xyz = 0.5 + np.cumsum(steps, axis=0)
+    data = np.concatenate([xyz, np.ones((frames, 33, 1))], axis=2)
+    return KeypointTensor(data, sample_rate=SAMPLE_RATE)
+
+
+def _time(fn, repeat: int = 1) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    analyzer = GaitAnalyzer(sample_rate=SAMPLE_RATE)
+    print(f"{'minutes':>8} {'frames':>8} {'loop (s)':>10} {'vector (s)':>11} {'speedup':>8}  match")
+
+    for minutes in DURATIONS_MINUTES:
+        tensor = synthetic_session(minutes)
+
+        loop_score = analyzer.calculate_bradykinesia_score(tensor, vectorized=False)
+        vector_score = analyzer.calculate_bradykinesia_score(tensor)
+
+        loop_time = _time(lambda: analyzer.calculate_bradykinesia_score(tensor, vectorized=False))
+        vector_time = _time(lambda: analyzer.calculate_bradykinesia_score(tensor), repeat=5)
+
+        print(
+            f"{minutes:>8} {len(tensor):>8} {loop_time:>10.3f} {vector_time:>11.4f} "
+            f"{loop_time / vector_time:>7.0f}x  {np.isclose(loop_score, vector_score, rtol=1e-9)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,517 @@
+"""
+Pose-session pipeline benchmark.
+
+Synthesizes side-view walking sessions with hand tremor (benchmarks.synthetic)
+from 10 s to 60 min and times every public method of GaitAnalyzer,
+TremorAnalyzer and BaselineManager plus the full POST
+/api/analysis/upload-session pipeline against an in-memory database (first
+upload and idempotent retry). Each session length runs in its own
+interpreter, so the reported peak RSS belongs to that length only.
+
+Throughput is reported in session frames per second (sessions per second for
+BaselineManager). Because the synthetic sessions have known cadence, stride
+length, event times, asymmetry and tremor, the extracted features are also
+checked against ground truth.
+
+Run from the backend directory (exit status 1 on accuracy failures,
+regressions or public methods without a benchmark case):
+    python -m benchmarks.bench_pipeline [--durations 10,60,600,3600] [--repeat 3]
+    python -m benchmarks.bench_pipeline --save-baseline benchmarks/pipeline_baseline.json
+    python -m benchmarks.bench_pipeline --baseline benchmarks/pipeline_baseline.json [--tolerance 0.3]
+"""
+
+import argparse
+import inspect
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+import timeit
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.ai_engine import BaselineManager, GaitAnalyzer, TremorAnalyzer, extract_session_features
+from benchmarks.synthetic import (
+    event_timing_error,
+    expected_tremor_amplitude,
+    session_feature_dicts,
+    synthetic_gait_session
+)
+
+DEFAULT_DURATIONS = [10, 60, 600, 3600]
+BASELINE_SESSIONS = 10000
+RESULT_PREFIX = "RESULT "
+
+# Accuracy scenarios checked on 60 s sessions, on top of the default walker
+# checked at every benchmarked length
+SCENARIOS = {
+    "asymmetric 60 fps": {
+        "sample_rate": 60.0,
+        "step_asymmetry": 0.1,
+        "stride_jitter": 0.03,
+        "tremor_frequency": 8.3,
+        "tremor_amplitude": 0.006
+    },
+    "slow, no tremor": {
+        "cadence": 90.0,
+        "stride_length": 0.3,
+        "tremor_frequency": None
+    }
+}
+
+# Case: (name, callable, items processed per call)
+Case = Tuple[str, Callable[[], object], int]
+
+
+class PeakRss:
+    """Peak resident set size while the block runs, sampled from /proc (Linux)."""
+
+    INTERVAL = 0.002
+
+    def __init__(self):
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def current_bytes() -> int:
+        try:
+            with open("/proc/self/statm") as statm:
+                return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except OSError:
+            # ru_maxrss is the process-wide peak: KiB on Linux, bytes on macOS
+            scale = 1 if sys.platform == "darwin" else 1024
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+    def _sample(self):
+        while not self._stop.wait(self.INTERVAL):
+            self.peak_bytes = max(self.peak_bytes, self.current_bytes())
+
+    def __enter__(self):
+        self.peak_bytes = self.current_bytes()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, self.current_bytes())
+
+    @property
+    def peak_mb(self) -> float:
+        return self.peak_bytes / 2 ** 20
+
+
+def public_methods(cls) -> List[str]:
+    """Public methods and properties defined by `cls`."""
+    return sorted(
+        name for name, member in vars(cls).items()
+        if not name.startswith("_") and (inspect.isfunction(member) or isinstance(member, property))
+    )
+
+
+def analyzer_cases(tensor) -> List[Case]:
+    """Every public GaitAnalyzer and TremorAnalyzer method on one session."""
+    frames = len(tensor)
+    gait = GaitAnalyzer(sample_rate=tensor.sample_rate)
+    tremor = TremorAnalyzer(sample_rate=tensor.sample_rate)
+    wrist = TremorAnalyzer.LEFT_WRIST
+
+    points = tensor.xyz[:, GaitAnalyzer.EVENT_LANDMARKS]
+    events = gait.detect_gait_events(tensor)
+    left_lengths, right_lengths = gait.limb_lengths(tensor)
+    hips = tensor.xyz[:, [GaitAnalyzer.LEFT_HIP, GaitAnalyzer.RIGHT_HIP]].tolist()
+    oscillation = tremor.extract_oscillation_sequence(tensor, wrist)
+    spectrum = tremor.compute_spectrum(tensor)
+    windows = list(tremor.iter_spectrogram(tensor))
+    window_metrics = list(tremor.iter_tremor_windows(tensor))
+
+    return [
+        ("GaitAnalyzer.calculate_distance", lambda: [gait.calculate_distance(left, right) for left, right in hips], frames),
+        ("GaitAnalyzer.events_from_landmarks", lambda: gait.events_from_landmarks(points), frames),
+        ("GaitAnalyzer.detect_gait_events", lambda: gait.detect_gait_events(tensor), frames),
+        ("GaitAnalyzer.detect_gait_cycles", lambda: gait.detect_gait_cycles(tensor), frames),
+        ("GaitAnalyzer.stride_length_from_events", lambda: gait.stride_length_from_events(events), frames),
+        ("GaitAnalyzer.calculate_stride_length", lambda: gait.calculate_stride_length(tensor), frames),
+        ("GaitAnalyzer.cadence_from_events", lambda: gait.cadence_from_events(events), frames),
+        ("GaitAnalyzer.calculate_cadence", lambda: gait.calculate_cadence(tensor), frames),
+        ("GaitAnalyzer.gait_metrics", lambda: gait.gait_metrics(events), frames),
+        ("GaitAnalyzer.limb_lengths", lambda: gait.limb_lengths(tensor), frames),
+        (
+            "GaitAnalyzer.symmetry_from_limb_lengths",
+            lambda: gait.symmetry_from_limb_lengths(left_lengths.mean(), right_lengths.mean()),
+            frames
+        ),
+        ("GaitAnalyzer.calculate_gait_symmetry", lambda: gait.calculate_gait_symmetry(tensor), frames),
+        ("GaitAnalyzer.calculate_joint_velocities", lambda: gait.calculate_joint_velocities(tensor), frames),
+        ("GaitAnalyzer.calculate_velocity_statistics", lambda: gait.calculate_velocity_statistics(tensor), frames),
+        ("GaitAnalyzer.calculate_bradykinesia_score", lambda: gait.calculate_bradykinesia_score(tensor), frames),
+        ("GaitAnalyzer.bradykinesia_from_velocity", lambda: gait.bradykinesia_from_velocity(0.3), frames),
+        ("TremorAnalyzer.extract_oscillation_sequence", lambda: tremor.extract_oscillation_sequence(tensor, wrist), frames),
+        ("TremorAnalyzer.calculate_fft_spectrum", lambda: tremor.calculate_fft_spectrum(oscillation), frames),
+        ("TremorAnalyzer.compute_spectrum", lambda: tremor.compute_spectrum(tensor), frames),
+        ("TremorAnalyzer.extract_tremor_frequency", lambda: tremor.extract_tremor_frequency(spectrum, wrist), frames),
+        ("TremorAnalyzer.extract_tremor_amplitude", lambda: tremor.extract_tremor_amplitude(spectrum, wrist), frames),
+        ("TremorAnalyzer.detect_resting_tremor", lambda: tremor.detect_resting_tremor(spectrum), frames),
+        ("TremorAnalyzer.calculate_tremor_score", lambda: tremor.calculate_tremor_score(spectrum), frames),
+        ("TremorAnalyzer.iter_spectrogram", lambda: sum(1 for _ in tremor.iter_spectrogram(tensor)), frames),
+        (
+            "TremorAnalyzer.window_tremor_metrics",
+            lambda: [tremor.window_tremor_metrics(window, wrist) for window in windows],
+            frames
+        ),
+        ("TremorAnalyzer.iter_tremor_windows", lambda: sum(1 for _ in tremor.iter_tremor_windows(tensor)), frames),
+        ("TremorAnalyzer.summarize_tremor_windows", lambda: tremor.summarize_tremor_windows(window_metrics), frames),
+        ("extract_session_features", lambda: extract_session_features(tensor, tensor.sample_rate), frames)
+    ]
+
+
+def baseline_cases(count: int) -> List[Case]:
+    """Every public BaselineManager method over `count` stored sessions."""
+    manager = BaselineManager()
+    sessions = session_feature_dicts(count)
+    per_patient = [
+        sessions[start:start + manager.required_sessions]
+        for start in range(0, count - manager.required_sessions + 1, manager.required_sessions)
+    ]
+    baseline = manager.create_baseline(sessions)
+
+    def fold_stats() -> Dict:
+        stats: Dict = {"session_count": 0, "metrics": {}}
+        for session in sessions:
+            manager.update_running_stats(stats, session)
+        return stats
+
+    def update_all() -> Dict:
+        current = baseline
+        for session in sessions:
+            current = manager.update_baseline(current, session)
+        return current
+
+    stats = fold_stats()
+    scores = [manager.calculate_deviation_score(session, baseline) for session in sessions]
+    risks = [manager.classify_risk(score, True) for score in scores]
+    matrix = manager.feature_matrix(sessions)
+    centers, scales = manager.baseline_vectors([baseline] * count)
+    score_array = manager.calculate_deviation_scores(matrix, centers, scales)
+
+    return [
+        ("BaselineManager.update_alpha", lambda: [manager.update_alpha for _ in sessions], count),
+        ("BaselineManager.create_baseline", lambda: [manager.create_baseline(group) for group in per_patient], count),
+        ("BaselineManager.session_metric_values", lambda: [manager.session_metric_values(s) for s in sessions], count),
+        ("BaselineManager.update_running_stats", fold_stats, count),
+        ("BaselineManager.baseline_from_running_stats", lambda: manager.baseline_from_running_stats(stats), count),
+        (
+            "BaselineManager.calculate_deviation_score",
+            lambda: [manager.calculate_deviation_score(session, baseline) for session in sessions],
+            count
+        ),
+        ("BaselineManager.classify_risk", lambda: [manager.classify_risk(score, True) for score in scores], count),
+        ("BaselineManager.feature_matrix", lambda: manager.feature_matrix(sessions), count),
+        ("BaselineManager.baseline_vectors", lambda: manager.baseline_vectors([baseline] * count), count),
+        (
+            "BaselineManager.calculate_deviation_scores",
+            lambda: manager.calculate_deviation_scores(matrix, centers, scales),
+            count
+        ),
+        ("BaselineManager.classify_risk_batch", lambda: manager.classify_risk_batch(score_array, True), count),
+        ("BaselineManager.should_flag_for_review", lambda: [manager.should_flag_for_review(r) for r in risks], count),
+        ("BaselineManager.update_baseline", update_all, count)
+    ]
+
+
+def upload_cases(tensor) -> List[Case]:
+    """POST /api/analysis/upload-session with the database replaced by MemoryDatabase."""
+    from fastapi.testclient import TestClient
+
+    from app.auth import create_access_token
+    from app.database import Database
+    from app.feature_cache import FeatureCache
+    from app.main import app
+    from app.routers.analysis import POSE_FRAMES_CONTENT_TYPE
+    from benchmarks.memory_db import MemoryDatabase
+
+    client = TestClient(app)
+    body = tensor.to_bytes()
+    headers = {
+        "Authorization": f"Bearer {create_access_token({'sub': 'bench-user', 'role': 'patient'})}",
+        "Content-Type": POSE_FRAMES_CONTENT_TYPE
+    }
+
+    def fresh_database() -> MemoryDatabase:
+        db = MemoryDatabase()
+        db["patients"].docs.append({"_id": "bench-patient", "user_id": "bench-user"})
+        # Marks the database as connected for Database.get_db
+        Database.client = object()
+        Database.db = db
+        FeatureCache.clear()
+        return db
+
+    def upload():
+        response = client.post("/api/analysis/upload-session", content=body, headers=headers)
+        if response.status_code != 200:
+            raise RuntimeError(f"upload-session returned {response.status_code}: {response.text[:200]}")
+        return response
+
+    def first_upload():
+        fresh_database()
+        return upload()
+
+    # The retry case reuses one database holding the first attempt
+    def retry():
+        if Database.db is None or not Database.db["analysis_sessions"].docs:
+            first_upload()
+        return upload()
+
+    return [
+        ("upload_analysis_session", first_upload, len(tensor)),
+        ("upload_analysis_session (retry)", retry, len(tensor))
+    ]
+
+
+def time_case(fn: Callable[[], object], repeat: int) -> Tuple[float, float]:
+    """Best seconds per call over `repeat` rounds, and peak RSS (MB) meanwhile."""
+    timer = timeit.Timer(fn)
+    with PeakRss() as rss:
+        number, _ = timer.autorange()
+        best = min(timer.repeat(repeat=repeat, number=number)) / number
+    return best, rss.peak_mb
+
+
+def run_cases(cases: List[Case], repeat: int, unit: str) -> Dict[str, Dict]:
+    results = {}
+    for name, fn, items in cases:
+        seconds, peak_mb = time_case(fn, repeat)
+        results[name] = {
+            "seconds": seconds,
+            "items": items,
+            "unit": unit,
+            "throughput": items / seconds if seconds > 0 else float("inf"),
+            "peak_rss_mb": peak_mb
+        }
+    return results
+
+
+def _check(name: str, measured: Optional[float], expected: float, tolerance: float, relative: bool = False) -> Dict:
+    if measured is None:
+        passed = False
+    elif relative:
+        passed = abs(measured - expected) <= tolerance * abs(expected)
+    else:
+        passed = abs(measured - expected) <= tolerance
+    return {
+        "name": name,
+        "measured": measured,
+        "expected": expected,
+        "tolerance": f"{tolerance:.0%}" if relative else tolerance,
+        "passed": bool(passed)
+    }
+
+
+def accuracy_checks(tensor, truth: Dict) -> List[Dict]:
+    """Extracted features and gait events against the generator's ground truth."""
+    sample_rate = tensor.sample_rate
+    features = extract_session_features(tensor, sample_rate)
+    events = GaitAnalyzer(sample_rate=sample_rate).detect_gait_events(tensor)
+
+    checks = [
+        _check("cadence (steps/min)", features["cadence"], truth["cadence"], 0.02, relative=True),
+        _check("stride_length", features["stride_length"], truth["stride_length"], 0.05, relative=True),
+        _check("stance_ratio", features["stance_ratio"], truth["stance_ratio"], 0.1),
+        _check("step_time_asymmetry", features["step_time_asymmetry"], truth["step_time_asymmetry"], 0.03),
+        _check(
+            "stride_time_variability",
+            features["stride_time_variability"],
+            truth["stride_time_variability"],
+            0.02
+        )
+    ]
+
+    # Events near the session edges cannot be peaks; judge the rest
+    margin = truth["stride_time"] / 2
+    for kind, detected in (("heel strike", events.heel_strikes), ("toe-off", events.toe_offs)):
+        for side in ("left", "right"):
+            times = truth["heel_strikes" if kind == "heel strike" else "toe_offs"][side]
+            times = times[(times >= margin) & (times <= truth["seconds"] - margin)]
+            error, matched = event_timing_error(detected[side], times, sample_rate)
+            checks.append(_check(f"{kind} {side} timing error (s)", error, 0.0, 0.07))
+            checks.append(_check(f"{kind} {side} matched", matched, 1.0, 0.1))
+
+    if truth["tremor_frequency"]:
+        resolution = sample_rate / len(tensor)
+        checks.append(_check(
+            "tremor_frequency (Hz)",
+            features["tremor_frequency"],
+            truth["tremor_frequency"],
+            max(0.2, 2 * resolution)
+        ))
+        checks.append(_check(
+            "tremor_amplitude",
+            features["tremor_amplitude"],
+            expected_tremor_amplitude(truth["tremor_amplitude"]),
+            0.25,
+            relative=True
+        ))
+    else:
+        # Without tremor the band peak must stay well below a mild tremor's
+        checks.append(_check(
+            "tremor_amplitude (none)",
+            features["tremor_amplitude"],
+            0.0,
+            0.25 * expected_tremor_amplitude(0.004)
+        ))
+    return checks
+
+
+def child(kind: str, repeat: int, sample_rate: float) -> Dict:
+    """Benchmark one session length (or BaselineManager) in this process."""
+    if kind == "baseline":
+        return {
+            "label": f"BaselineManager, {BASELINE_SESSIONS} sessions",
+            "cases": run_cases(baseline_cases(BASELINE_SESSIONS), repeat, "sessions"),
+            "accuracy": [],
+            "process_peak_rss_mb": PeakRss.current_bytes() / 2 ** 20
+        }
+
+    seconds = float(kind)
+    tensor, truth = synthetic_gait_session(seconds=seconds, sample_rate=sample_rate)
+    cases = analyzer_cases(tensor) + upload_cases(tensor)
+    results = run_cases(cases, repeat, "frames")
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    return {
+        "label": f"{seconds:g} s session ({len(tensor)} frames @ {sample_rate:g} fps)",
+        "cases": results,
+        "accuracy": accuracy_checks(tensor, truth),
+        "process_peak_rss_mb": usage / 2 ** 20
+    }
+
+
+def run_child(kind: str, repeat: int, sample_rate: float) -> Dict:
+    command = [
+        sys.executable, "-m", "benchmarks.bench_pipeline",
+        "--child", kind, "--repeat", str(repeat), "--sample-rate", str(sample_rate)
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+    for line in reversed(result.stdout.splitlines()):
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    raise RuntimeError(f"benchmark for {kind} failed:\n{result.stderr[-3000:]}")
+
+
+def print_group(group: Dict):
+    unit = next(iter(group["cases"].values()))["unit"] if group["cases"] else "items"
+    print(f"\n== {group['label']} (process peak RSS {group['process_peak_rss_mb']:.0f} MB) ==")
+    print(f"{'case':<48} {'ms/call':>10} {unit + '/s':>14} {'peak RSS MB':>12}")
+    for name, row in group["cases"].items():
+        print(f"{name:<48} {row['seconds'] * 1000:>10.3f} {row['throughput']:>14,.0f} {row['peak_rss_mb']:>12.0f}")
+
+
+def print_accuracy(label: str, checks: List[Dict]) -> int:
+    failures = [check for check in checks if not check["passed"]]
+    print(f"\nAccuracy, {label}: {len(checks) - len(failures)}/{len(checks)} passed")
+    for check in failures:
+        measured = "None" if check["measured"] is None else f"{check['measured']:.4f}"
+        print(f"  FAIL {check['name']}: {measured} (expected {check['expected']:.4f} ± {check['tolerance']})")
+    return len(failures)
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float, rss_tolerance: float) -> List[str]:
+    """Regressions of throughput or peak RSS against a stored baseline."""
+    regressions = []
+    for key, row in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        if row["throughput"] < reference["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{key}: {row['throughput']:,.0f} vs {reference['throughput']:,.0f} {row['unit']}/s"
+            )
+        if row["peak_rss_mb"] > reference["peak_rss_mb"] * (1 + rss_tolerance):
+            regressions.append(
+                f"{key}: peak RSS {row['peak_rss_mb']:.0f} vs {reference['peak_rss_mb']:.0f} MB"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--durations",
+        default=",".join(str(d) for d in DEFAULT_DURATIONS),
+        help="Comma-separated session lengths in seconds"
+    )
+    parser.add_argument("--sample-rate", type=float, default=30.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", help="Fail on regressions against this results file")
+    parser.add_argument("--save-baseline", help="Write results to this file")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Allowed throughput drop (fraction)")
+    parser.add_argument("--rss-tolerance", type=float, default=0.2, help="Allowed peak RSS growth (fraction)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(RESULT_PREFIX + json.dumps(child(args.child, args.repeat, args.sample_rate)))
+        return 0
+
+    failures = []
+    covered = set()
+    results: Dict[str, Dict] = {}
+    kinds = [kind.strip() for kind in args.durations.split(",") if kind.strip()] + ["baseline"]
+
+    for kind in kinds:
+        group = run_child(kind, args.repeat, args.sample_rate)
+        print_group(group)
+        for name, row in group["cases"].items():
+            covered.add(name)
+            results[f"{kind}/{name}"] = row
+        if group["accuracy"] and print_accuracy(group["label"], group["accuracy"]):
+            failures.append(f"accuracy checks failed for {group['label']}")
+
+    for label, params in SCENARIOS.items():
+        tensor, truth = synthetic_gait_session(seconds=60.0, **params)
+        if print_accuracy(label, accuracy_checks(tensor, truth)):
+            failures.append(f"accuracy checks failed for {label}")
+
+    uncovered = [
+        f"{cls.__name__}.{name}"
+        for cls in (GaitAnalyzer, TremorAnalyzer, BaselineManager)
+        for name in public_methods(cls)
+        if f"{cls.__name__}.{name}" not in covered
+    ]
+    if uncovered:
+        failures.append(f"no benchmark case for: {', '.join(uncovered)}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as baseline_file:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "sample_rate": args.sample_rate,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "cases": results
+            }, baseline_file, indent=2)
+        print(f"\nSaved results to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            reference = json.load(baseline_file)["cases"]
+        regressions = compare(results, reference, args.tolerance, args.rss_tolerance)
+        print(f"\nCompared {len(set(results) & set(reference))} cases with {args.baseline}")
+        for regression in regressions:
+            print(f"  REGRESSION {regression}")
+        if regressions:
+            failures.append(f"{len(regressions)} regressions")
+
+    if failures:
+        print("\nFAIL: " + "; ".join(failures))
+        return 1
+    print("\nOK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
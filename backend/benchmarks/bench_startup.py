@@ -0,0 +1,101 @@
+"""
+API cold-start import benchmark.
+
+Imports app.main in fresh interpreters with `python -X importtime`, reports
+the median import time and the slowest top-level packages, and fails when
+the median exceeds a threshold or when a module that should load lazily
+(mediapipe, OpenCV, pandas, reportlab, scipy.signal) is imported at startup.
+
+Run from the backend directory (exit status 1 on regression):
+    python -m benchmarks.bench_startup [--runs 5] [--max-ms 2500]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+TARGET = "app.main"
+LAZY_MODULES = ["mediapipe", "cv2", "pandas", "reportlab", "scipy.signal"]
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def profile_import() -> Tuple[float, Dict[str, int], List[str]]:
+    """
+    Import TARGET once in a new interpreter.
+    Returns: (cumulative ms of TARGET, self us per top-level package, modules imported)
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {TARGET}"],
+        capture_output=True,
+        text=True,
+        env=env
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {TARGET} failed:\n{result.stderr[-2000:]}")
+
+    total_ms = None
+    per_package: Dict[str, int] = defaultdict(int)
+    modules = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, _, module = match.groups()
+        modules.append(module)
+        per_package[module.split(".")[0]] += int(self_us)
+        if module == TARGET:
+            total_ms = int(cumulative_us) / 1000
+
+    if total_ms is None:
+        raise RuntimeError(f"{TARGET} not found in importtime output")
+    return total_ms, per_package, modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=2500.0, help="Fail above this median import time")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    timings = []
+    packages: Dict[str, List[int]] = defaultdict(list)
+    imported = set()
+    for _ in range(args.runs):
+        total_ms, per_package, modules = profile_import()
+        timings.append(total_ms)
+        for name, self_us in per_package.items():
+            packages[name].append(self_us)
+        imported.update(modules)
+
+    median_ms = statistics.median(timings)
+    print(f"import {TARGET}: median {median_ms:.0f} ms over {args.runs} runs "
+          f"(min {min(timings):.0f} ms, max {max(timings):.0f} ms)")
+
+    print(f"\nSlowest top-level packages (median self time):")
+    ranked = sorted(packages.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for name, samples in ranked[:args.top]:
+        print(f"  {name:<24} {statistics.median(samples) / 1000:8.1f} ms")
+
+    failures = []
+    eager = [name for name in LAZY_MODULES if name in imported]
+    if eager:
+        failures.append(f"modules imported at startup: {', '.join(eager)}")
+    if median_ms > args.max_ms:
+        failures.append(f"median import time {median_ms:.0f} ms exceeds {args.max_ms:.0f} ms")
+
+    if failures:
+        print("\nFAIL: " + "; ".join(failures))
+        return 1
+    print("\nOK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
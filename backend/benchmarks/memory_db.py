@@ -0,0 +1,191 @@
+"""
+In-memory stand-in for the Motor database used by the pipeline benchmark.
+
+Implements only the collection calls the analysis upload path makes (equality,
+$in, $ne and $gte filters, $set/$setOnInsert updates with upsert, sorted
+finds), the UpdateOne bulk writes of risk re-scoring and the session/risk
+$lookup aggregation of SessionRepository, so they can run without a MongoDB
+server.
+"""
+
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+
+
+def _matches(doc: Dict, query: Dict) -> bool:
+    def match(value, condition) -> bool:
+        if isinstance(condition, dict) and "$in" in condition:
+            return value in condition["$in"]
+        if isinstance(condition, dict) and "$ne" in condition:
+            return value != condition["$ne"]
+        if isinstance(condition, dict) and "$gte" in condition:
+            return value is not None and value >= condition["$gte"]
+        return value == condition
+    return all(match(doc.get(key), condition) for key, condition in query.items())
+
+
+def _set(doc: Dict, fields: Dict):
+    for path, value in fields.items():
+        *parents, key = path.split(".")
+        target = doc
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[key] = value
+
+
+def _project(doc: Dict, projection: Optional[Dict]) -> Dict:
+    if not projection:
+        return doc
+    if all(not included for included in projection.values()):
+        return {key: value for key, value in doc.items() if key not in projection}
+    keep_id = projection.get("_id", 1)
+    return {
+        key: value for key, value in doc.items()
+        if (key == "_id" and keep_id) or (key != "_id" and projection.get(key))
+    }
+
+
+def _evaluate(expression, doc: Dict, variables: Dict):
+    """The few aggregation expressions SessionRepository uses."""
+    if isinstance(expression, str) and expression.startswith("$$"):
+        return variables[expression[2:]]
+    if isinstance(expression, str) and expression.startswith("$"):
+        return doc.get(expression[1:])
+    if isinstance(expression, dict) and "$toString" in expression:
+        return str(_evaluate(expression["$toString"], doc, variables))
+    if isinstance(expression, dict) and "$eq" in expression:
+        left, right = expression["$eq"]
+        return _evaluate(left, doc, variables) == _evaluate(right, doc, variables)
+    return expression
+
+
+class MemoryCursor:
+    def __init__(self, docs: List[Dict]):
+        self.docs = docs
+
+    def batch_size(self, size: int):
+        return self
+
+    def sort(self, key: str, direction: int = 1):
+        self.docs = sorted(self.docs, key=lambda doc: doc.get(key), reverse=direction < 0)
+        return self
+
+    async def to_list(self, length: Optional[int]):
+        return self.docs[:length] if length else list(self.docs)
+
+    def __aiter__(self):
+        async def iterate():
+            for doc in self.docs:
+                yield doc
+        return iterate()
+
+
+class MemoryCollection:
+    def __init__(self, database: Optional["MemoryDatabase"] = None):
+        self.database = database
+        self.docs: List[Dict] = []
+
+    async def find_one(self, query: Dict, projection: Optional[Dict] = None, **kwargs) -> Optional[Dict]:
+        for doc in self.docs:
+            if _matches(doc, query):
+                return _project(doc, projection)
+        return None
+
+    def find(self, query: Optional[Dict] = None, projection: Optional[Dict] = None, **kwargs) -> MemoryCursor:
+        return MemoryCursor([_project(doc, projection) for doc in self.docs if _matches(doc, query or {})])
+
+    async def insert_one(self, doc: Dict):
+        doc.setdefault("_id", ObjectId())
+        self.docs.append(doc)
+
+        class Result:
+            inserted_id = doc["_id"]
+        return Result()
+
+    async def insert_many(self, docs: List[Dict], ordered: bool = True):
+        for doc in docs:
+            await self.insert_one(doc)
+
+    async def find_one_and_update(self, query: Dict, update: Dict, upsert: bool = False, **kwargs) -> Optional[Dict]:
+        # Always returns the document after the update
+        await self.update_one(query, update, upsert=upsert)
+        return await self.find_one(query)
+
+    async def update_one(self, query: Dict, update: Dict, upsert: bool = False, **kwargs):
+        for doc in self.docs:
+            if _matches(doc, query):
+                _set(doc, update.get("$set", {}))
+                return
+        if upsert:
+            doc = dict(query)
+            doc.update(update.get("$setOnInsert", {}))
+            doc.update(update.get("$set", {}))
+            await self.insert_one(doc)
+
+    async def bulk_write(self, operations: List, ordered: bool = True):
+        # pymongo UpdateOne requests keep their filter and update privately
+        for operation in operations:
+            await self.update_one(operation._filter, operation._doc)
+
+    async def delete_many(self, query: Dict):
+        remaining = [doc for doc in self.docs if not _matches(doc, query)]
+
+        class Result:
+            deleted_count = len(self.docs) - len(remaining)
+        self.docs = remaining
+        return Result()
+
+    async def count_documents(self, query: Dict) -> int:
+        return sum(1 for doc in self.docs if _matches(doc, query))
+
+    def _run_pipeline(self, docs: List[Dict], pipeline: List[Dict], variables: Dict) -> List[Dict]:
+        for stage in pipeline:
+            (name, spec), = stage.items()
+            if name == "$match":
+                expression = spec.get("$expr")
+                query = {key: value for key, value in spec.items() if key != "$expr"}
+                docs = [
+                    doc for doc in docs
+                    if _matches(doc, query) and (expression is None or _evaluate(expression, doc, variables))
+                ]
+            elif name == "$sort":
+                for key, direction in reversed(list(spec.items())):
+                    docs = sorted(docs, key=lambda doc: doc.get(key), reverse=direction < 0)
+            elif name == "$limit":
+                docs = docs[:spec]
+            elif name == "$project":
+                docs = [_project(doc, spec) for doc in docs]
+            elif name == "$lookup":
+                foreign = self.database[spec["from"]]
+                docs = [
+                    {**doc, spec["as"]: foreign._run_pipeline(
+                        list(foreign.docs),
+                        spec["pipeline"],
+                        {var: _evaluate(value, doc, variables) for var, value in spec.get("let", {}).items()}
+                    )}
+                    for doc in docs
+                ]
+            elif name == "$unwind":
+                field = spec["path"].lstrip("$")
+                unwound = []
+                for doc in docs:
+                    values = doc.get(field) or []
+                    if not values and spec.get("preserveNullAndEmptyArrays"):
+                        unwound.append({key: value for key, value in doc.items() if key != field})
+                    unwound += [{**doc, field: value} for value in values]
+                docs = unwound
+            else:
+                raise NotImplementedError(f"Aggregation stage {name} is not supported")
+        return docs
+
+    def aggregate(self, pipeline: List[Dict], **kwargs) -> MemoryCursor:
+        return MemoryCursor(self._run_pipeline(list(self.docs), pipeline, {}))
+
+
+class MemoryDatabase(dict):
+    """Collections are created on first access, like db[name] in Motor."""
+
+    def __missing__(self, name: str) -> MemoryCollection:
+        collection = self[name] = MemoryCollection(self)
+        return collection
@@ -0,0 +1,245 @@
+"""
+Synthetic pose sessions with known gait and tremor ground truth.
+
+A 33-landmark side-view walker in normalized image coordinates (y grows
+downwards). Each foot rests on the ground during stance and swings forward
+by one stride length, the pelvis advances at constant speed, arms swing
+opposite to the legs, and the hands carry a sinusoidal tremor. Event times,
+cadence, asymmetry and tremor parameters are returned as ground truth for
+accuracy checks.
+
+Used by the benchmarks; run from the backend directory.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.ai_engine import KeypointTensor, TremorAnalyzer
+
+# Standing skeleton relative to the pelvis (x forward, y down), normalized units
+SKELETON = {
+    0: (0.03, -0.42),                                                   # nose
+    1: (0.025, -0.44), 2: (0.025, -0.44), 3: (0.025, -0.44),            # left eye
+    4: (0.025, -0.44), 5: (0.025, -0.44), 6: (0.025, -0.44),            # right eye
+    7: (0.0, -0.43), 8: (0.0, -0.43),                                   # ears
+    9: (0.025, -0.40), 10: (0.025, -0.40),                              # mouth
+    11: (0.0, -0.30), 12: (0.0, -0.30),                                 # shoulders
+    13: (0.0, -0.15), 14: (0.0, -0.15),                                 # elbows
+    15: (0.01, -0.02), 16: (0.01, -0.02),                               # wrists
+    17: (0.015, 0.01), 18: (0.015, 0.01),                               # pinkies
+    19: (0.02, 0.015), 20: (0.02, 0.015),                               # index fingers
+    21: (0.02, 0.0), 22: (0.02, 0.0),                                   # thumbs
+    23: (0.0, 0.0), 24: (0.0, 0.0)                                      # hips
+}
+# Foot landmarks: (ankle, heel, toe) per side
+FEET = {"left": (27, 29, 31), "right": (28, 30, 32)}
+KNEES = {"left": 25, "right": 26}
+HANDS = {
+    "left": [TremorAnalyzer.LEFT_WRIST, 17, 19, 21],
+    "right": [TremorAnalyzer.RIGHT_WRIST, 18, 20, 22]
+}
+ELBOWS = {"left": 13, "right": 14}
+
+LEG_LENGTH = 0.4
+FOOT_LENGTH = 0.06
+FOOT_LIFT = 0.04
+ARM_SWING = 0.04
+
+
+def expected_tremor_amplitude(amplitude: float) -> float:
+    """
+    Spectral peak TremorAnalyzer reports for a sinusoid of `amplitude`:
+    one-sided FFT magnitude (amplitude / 2) times the Hann window's
+    coherent gain (0.5).
+    """
+    return amplitude / 4.0
+
+
+def _heel_strike_times(
+    seconds: float,
+    stride_time: float,
+    stride_jitter: float,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """Left heel-strike times covering the session with a stride of margin each side."""
+    count = int(np.ceil(seconds / stride_time)) + 4
+    durations = stride_time * (1.0 + stride_jitter * rng.standard_normal(count))
+    durations = np.clip(durations, 0.5 * stride_time, 1.5 * stride_time)
+    return -2.0 * stride_time + np.concatenate([[0.0], np.cumsum(durations)])
+
+
+def _foot_trajectory(
+    t: np.ndarray,
+    strikes: np.ndarray,
+    stance_ratio: float,
+    speed: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Heel x, heel lift and stride phase of one foot.
+
+    The foot lands at the pelvis position of mid-stance, stays put until
+    toe-off and then swings to its next landing point along a cosine
+    profile (zero velocity at lift-off and landing).
+    """
+    stride = np.clip(np.searchsorted(strikes, t, side="right") - 1, 0, len(strikes) - 2)
+    start, end = strikes[stride], strikes[stride + 1]
+    phase = (t - start) / (end - start)
+
+    # Landing points: pelvis x at mid-stance of each stride
+    durations = np.diff(strikes)
+    landings = speed * (strikes[:-1] + 0.5 * stance_ratio * durations)
+    landings = np.concatenate([landings, [landings[-1] + speed * durations[-1]]])
+
+    swing = np.clip((phase - stance_ratio) / (1.0 - stance_ratio), 0.0, 1.0)
+    progress = 0.5 * (1.0 - np.cos(np.pi * swing))
+    heel_x = landings[stride] + progress * (landings[stride + 1] - landings[stride])
+    lift = FOOT_LIFT * np.sin(np.pi * swing)
+    return heel_x, lift, phase
+
+
+def synthetic_gait_session(
+    seconds: float = 10.0,
+    sample_rate: float = 30.0,
+    cadence: float = 110.0,
+    stride_length: float = 0.5,
+    step_asymmetry: float = 0.0,
+    stance_ratio: float = 0.6,
+    stride_jitter: float = 0.0,
+    tremor_frequency: Optional[float] = 5.0,
+    tremor_amplitude: float = 0.004,
+    noise: float = 0.0005,
+    visibility: float = 0.95,
+    seed: int = 0
+) -> Tuple[KeypointTensor, Dict]:
+    """
+    Walking session seen from the side.
+
+    Args:
+        cadence: steps per minute (stride time = 120 / cadence seconds)
+        stride_length: heel displacement between same-foot strikes
+        step_asymmetry: |left - right| step time over their mean
+        stride_jitter: coefficient of variation of stride durations
+        tremor_frequency: hand tremor in Hz (None for no tremor)
+        tremor_amplitude: peak tremor displacement of the hand landmarks
+        noise: std of Gaussian landmark jitter
+
+    Returns:
+        (tensor, truth) where truth holds heel-strike and toe-off times per
+        foot and the generating parameters.
+    """
+    rng = np.random.default_rng(seed)
+    frames = int(round(seconds * sample_rate))
+    t = np.arange(frames) / sample_rate
+    stride_time = 120.0 / cadence
+    speed = stride_length / stride_time
+
+    xyz = np.zeros((frames, 33, 3))
+    pelvis_x = 0.2 + speed * t
+    # The pelvis is highest at mid-stance, twice per stride
+    pelvis_y = 0.5 - 0.008 * np.cos(4.0 * np.pi * t / stride_time)
+
+    for landmark, (dx, dy) in SKELETON.items():
+        xyz[:, landmark, 0] = pelvis_x + dx
+        xyz[:, landmark, 1] = pelvis_y + dy
+
+    left_strikes = _heel_strike_times(seconds, stride_time, stride_jitter, rng)
+    # Right strikes follow left ones by half a stride, shifted by the asymmetry
+    offset = 0.5 + step_asymmetry / 4.0
+    strikes = {
+        "left": left_strikes,
+        "right": left_strikes[:-1] + offset * np.diff(left_strikes)
+    }
+
+    ground = pelvis_y.max() + LEG_LENGTH
+    truth_strikes, truth_toe_offs = {}, {}
+    for side, (ankle, heel, toe) in FEET.items():
+        heel_x, lift, phase = _foot_trajectory(t, strikes[side], stance_ratio, speed)
+        heel_x = heel_x + 0.2 - 0.5 * FOOT_LENGTH
+        heel_y = ground - lift
+
+        xyz[:, heel, 0], xyz[:, heel, 1] = heel_x, heel_y
+        xyz[:, toe, 0], xyz[:, toe, 1] = heel_x + FOOT_LENGTH, heel_y + 0.01
+        xyz[:, ankle, 0], xyz[:, ankle, 1] = heel_x + 0.01, heel_y - 0.03
+        hip = xyz[:, 23 if side == "left" else 24]
+        xyz[:, KNEES[side], 0] = 0.5 * (hip[:, 0] + heel_x) + 0.03
+        xyz[:, KNEES[side], 1] = 0.5 * (hip[:, 1] + heel_y)
+
+        # Arms swing opposite to the leg on the same side
+        swing = -ARM_SWING * np.cos(2.0 * np.pi * phase)
+        xyz[:, ELBOWS[side], 0] += 0.5 * swing
+        xyz[:, HANDS[side], 0] += swing[:, None]
+
+        sides_strikes = strikes[side]
+        inside = (sides_strikes >= 0) & (sides_strikes < seconds)
+        truth_strikes[side] = sides_strikes[inside]
+        toe_offs = sides_strikes[:-1] + stance_ratio * np.diff(sides_strikes)
+        truth_toe_offs[side] = toe_offs[(toe_offs >= 0) & (toe_offs < seconds)]
+
+    # Depth: the far side of the body sits slightly behind
+    xyz[:, 1::2, 2] = 0.02
+    xyz[:, 2::2, 2] = -0.02
+
+    if tremor_frequency:
+        # Tremor along each hand point's position vector, so the X-Y
+        # displacement magnitude TremorAnalyzer reads oscillates by exactly
+        # the tremor amplitude
+        tremor = tremor_amplitude * np.sin(2.0 * np.pi * tremor_frequency * t + rng.uniform(0, 2 * np.pi))
+        hand_points = HANDS["left"] + HANDS["right"]
+        xy = xyz[:, hand_points, :2]
+        direction = xy / np.linalg.norm(xy, axis=2, keepdims=True)
+        xyz[:, hand_points, :2] = xy + tremor[:, None, None] * direction
+
+    if noise:
+        xyz[:, :, :2] += rng.normal(0.0, noise, size=(frames, 33, 2))
+
+    data = np.empty((frames, 33, 4), dtype=np.float32)
+    data[:, :, :3] = xyz
+    data[:, :, 3] = visibility
+
+    truth = {
+        "seconds": seconds,
+        "sample_rate": sample_rate,
+        "cadence": cadence,
+        "stride_time": stride_time,
+        "stride_length": stride_length,
+        "step_time_asymmetry": step_asymmetry,
+        "stance_ratio": stance_ratio,
+        "stride_time_variability": stride_jitter,
+        "tremor_frequency": tremor_frequency,
+        "tremor_amplitude": tremor_amplitude,
+        "heel_strikes": truth_strikes,
+        "toe_offs": truth_toe_offs
+    }
+    return KeypointTensor(data, sample_rate=sample_rate, timestamps=t), truth
+
+
+def event_timing_error(detected_frames: np.ndarray, true_times: np.ndarray, sample_rate: float) -> Tuple[float, float]:
+    """
+    Mean absolute timing error (seconds) of detected events against the
+    nearest true event, and the fraction of true events matched within
+    a tenth of a second.
+    """
+    if len(detected_frames) == 0 or len(true_times) == 0:
+        return float("inf"), 0.0
+    detected = np.asarray(detected_frames) / sample_rate
+    errors = np.abs(detected[:, None] - true_times[None, :])
+    matched = float((errors.min(axis=0) <= 0.1).mean())
+    return float(errors.min(axis=1).mean()), matched
+
+
+def session_feature_dicts(count: int, seed: int = 0) -> List[Dict]:
+    """Plausible stored session features for BaselineManager benchmarks."""
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "stride_length": float(rng.normal(0.5, 0.03)),
+            "cadence": float(rng.normal(110.0, 4.0)),
+            "gait_symmetry": float(np.clip(rng.normal(0.92, 0.03), 0.0, 1.0)),
+            "bradykinesia_score": float(np.clip(rng.normal(0.3, 0.05), 0.0, 1.0)),
+            "tremor_frequency": float(rng.normal(5.0, 0.3)),
+            "tremor_amplitude": float(abs(rng.normal(0.01, 0.002)))
+        }
+        for _ in range(count)
+    ]
+
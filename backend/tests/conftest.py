@@ -0,0 +1,33 @@
+import pytest
+
+from benchmarks.memory_db import MemoryDatabase
+
+
+@pytest.fixture
+def memory_db(monkeypatch):
+    """MemoryDatabase installed as the app database, with one patient."""
+    from app.database import Database
+    from app.feature_cache import FeatureCache
+
+    db = MemoryDatabase()
+    db["patients"].docs.append({"_id": "test-patient", "user_id": "test-user"})
+    # Marks the database as connected for Database.get_db
+    monkeypatch.setattr(Database, "client", object())
+    monkeypatch.setattr(Database, "db", db)
+    FeatureCache.clear()
+    yield db
+    FeatureCache.clear()
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    return TestClient(app)
+
+
+@pytest.fixture
+def patient_token():
+    from app.auth import create_access_token
+    return create_access_token({"sub": "test-user", "role": "patient"})
@@ -0,0 +1,73 @@
+import asyncio
+import os
+
+import pytest
+
+from app.analysis_service import AnalysisService, AnalysisWorkerLost
+
+
+def _pid() -> int:
+    return os.getpid()
+
+
+def _exit_worker() -> None:
+    os._exit(1)
+
+
+def _exit_worker_once(marker: str) -> int:
+    # Dies the first time it runs, succeeds on the retry
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return os.getpid()
+
+
+def _with_service(test):
+    async def run():
+        await AnalysisService.start(workers=1, max_pending=2, queue_timeout=5.0)
+        try:
+            return await test()
+        finally:
+            await AnalysisService.stop()
+    return asyncio.run(run())
+
+
+def test_pool_is_rebuilt_and_job_retried_after_worker_dies(tmp_path):
+    async def test():
+        first_pid = await AnalysisService.run(_pid)
+        retried_pid = await AnalysisService.run(_exit_worker_once, str(tmp_path / "died"))
+        return first_pid, retried_pid, AnalysisService.stats()["restarts"]
+
+    first_pid, retried_pid, restarts = _with_service(test)
+    assert retried_pid != first_pid
+    assert restarts >= 1
+
+
+def test_job_that_keeps_killing_workers_raises_and_pool_recovers():
+    async def test():
+        with pytest.raises(AnalysisWorkerLost):
+            await AnalysisService.run(_exit_worker)
+        return await AnalysisService.run(_pid)
+
+    assert _with_service(test) != os.getpid()
+
+
+def test_failed_pose_backend_leaves_service_ready_but_degraded():
+    from app.ai_engine.pose_backends import PoseBackendRegistry
+
+    def broken_backend():
+        raise RuntimeError("pose model missing")
+
+    PoseBackendRegistry.register("test-broken", broken_backend)
+
+    async def run():
+        await AnalysisService.start(workers=0, max_pending=1, queue_timeout=1.0, pose_backend="test-broken")
+        try:
+            await AnalysisService._warmup_task
+            return AnalysisService.warmup_status()
+        finally:
+            await AnalysisService.stop()
+
+    status = asyncio.run(run())
+    assert status["state"] == "degraded"
+    assert status["ready"] is True
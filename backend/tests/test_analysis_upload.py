@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from app.ai_engine import KeypointTensor
+from app.analysis_service import AnalysisQueueFull, AnalysisService
+from app.routers.analysis import POSE_FRAMES_CONTENT_TYPE
+
+
+def _tensor(frames: int = 150) -> KeypointTensor:
+    rng = np.random.default_rng(1)
+    data = rng.normal(0.5, 0.02, (frames, KeypointTensor.NUM_LANDMARKS, KeypointTensor.NUM_CHANNELS))
+    data[:, :, 3] = 1.0
+    return KeypointTensor(data, 30.0)
+
+
+def _pose_frames(frames: int) -> list:
+    return [
+        {"frame_number": i, "timestamp": i / 30.0, "keypoints": frame[:, :3].tolist(), "confidence": 1.0}
+        for i, frame in enumerate(_tensor(frames).data)
+    ]
+
+
+def _fail_with(monkeypatch, error: Exception):
+    async def run(fn, *args):
+        raise error
+    monkeypatch.setattr(AnalysisService, "run", run)
+
+
+def test_fallback_features_are_not_reused_or_scored(monkeypatch, memory_db, client, patient_token):
+    _fail_with(monkeypatch, RuntimeError("worker crashed"))
+    headers = {"Authorization": f"Bearer {patient_token}", "Content-Type": POSE_FRAMES_CONTENT_TYPE}
+    body = _tensor().to_bytes()
+
+    first = client.post("/api/analysis/upload-session", content=body, headers=headers)
+    retry = client.post("/api/analysis/upload-session", content=body, headers=headers)
+
+    assert first.status_code == retry.status_code == 200
+    assert first.json()["session_id"] != retry.json()["session_id"]
+    sessions = memory_db["analysis_sessions"].docs
+    assert all(session["features_fallback"] and "content_hash" not in session for session in sessions)
+    assert memory_db["baselines"].docs == []
+    assert memory_db["risk_assessments"].docs == []
+
+
+def test_stream_reports_full_queue(monkeypatch, memory_db, client, patient_token):
+    _fail_with(monkeypatch, AnalysisQueueFull("Analysis queue full (1 jobs in progress)"))
+    frames = _pose_frames(90)
+
+    with client.websocket_connect(f"/api/analysis/stream-session?token={patient_token}") as websocket:
+        websocket.send_json({"type": "frames", "frames": frames})
+        assert websocket.receive_json()["type"] == "ack"
+        websocket.send_json({"type": "end"})
+        message = websocket.receive_json()
+
+    assert message == {"type": "error", "detail": "Analysis queue full (1 jobs in progress)"}
+    assert memory_db["analysis_sessions"].docs == []
+
+
+def test_stream_bounds_buffered_frames(monkeypatch, memory_db, client, patient_token):
+    from app.database import settings
+    monkeypatch.setattr(settings, "STREAM_MAX_SESSION_FRAMES", 100)
+    frames = _pose_frames(60)
+
+    with client.websocket_connect(f"/api/analysis/stream-session?token={patient_token}") as websocket:
+        websocket.send_json({"type": "frames", "frames": frames})
+        assert websocket.receive_json() == {"type": "ack", "frames_received": 60}
+        websocket.send_json({"type": "frames", "frames": frames})
+        assert websocket.receive_json() == {"type": "error", "detail": "Session exceeds 100 frames"}
+
+
+def test_stream_answers_malformed_messages_with_errors(memory_db, client, patient_token):
+    with client.websocket_connect(f"/api/analysis/stream-session?token={patient_token}") as websocket:
+        websocket.send_text("not json")
+        assert websocket.receive_json() == {"type": "error", "detail": "Messages must be JSON text frames"}
+        websocket.send_bytes(b"\x00\x01")
+        assert websocket.receive_json() == {"type": "error", "detail": "Messages must be JSON text frames"}
+        websocket.send_json([1, 2])
+        assert websocket.receive_json() == {"type": "error", "detail": "Messages must be JSON objects"}
+        websocket.send_json({"type": "end"})
+        assert websocket.receive_json() == {"type": "error", "detail": "No pose frames received"}
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from app.ai_engine.baseline import BaselineManager
+
+
+def _calibrated_baseline():
+    return {
+        "is_calibrated": True,
+        "gait_symmetry_mean": 0.9,
+        "gait_symmetry_std": 0.03,
+        "bradykinesia_mean": 0.3,
+        "bradykinesia_std": 0.05
+    }
+
+
+def test_update_baseline_matches_closed_form_ew_statistics():
+    manager = BaselineManager(half_life_sessions=5.0)
+    alpha = manager.update_alpha
+    values = np.random.default_rng(0).normal(0.85, 0.05, 12)
+
+    baseline = _calibrated_baseline()
+    for value in values:
+        manager.update_baseline(baseline, {"gait_symmetry": float(value), "bradykinesia_score": 0.3})
+
+    # The starting baseline keeps weight (1 - alpha)^n, session k gets alpha (1 - alpha)^(n - 1 - k)
+    n = len(values)
+    start_weight = (1 - alpha) ** n
+    weights = alpha * (1 - alpha) ** (n - 1 - np.arange(n))
+    mean = start_weight * 0.9 + np.sum(weights * values)
+    variance = start_weight * (0.03 ** 2 + (0.9 - mean) ** 2) + np.sum(weights * (values - mean) ** 2)
+
+    assert baseline["gait_symmetry_mean"] == pytest.approx(mean)
+    assert baseline["gait_symmetry_std"] == pytest.approx(np.sqrt(variance))
+    assert baseline["sessions_since_calibration"] == n
+
+
+def test_update_baseline_halves_influence_every_half_life():
+    manager = BaselineManager(half_life_sessions=4.0)
+    baseline = _calibrated_baseline()
+
+    for _ in range(4):
+        manager.update_baseline(baseline, {"gait_symmetry": 0.7, "bradykinesia_score": 0.3})
+
+    assert baseline["gait_symmetry_mean"] == pytest.approx(0.7 + 0.5 * (0.9 - 0.7))
+
+
+def test_update_baseline_starts_missing_metrics_and_skips_uncalibrated():
+    manager = BaselineManager()
+    baseline = _calibrated_baseline()
+
+    manager.update_baseline(baseline, {"gait_symmetry": 0.9, "bradykinesia_score": 0.3, "stride_length": 0.52})
+    assert baseline["stride_length_mean"] == 0.52
+
+    uncalibrated = {"is_calibrated": False, "gait_symmetry_mean": 0.9}
+    assert manager.update_baseline(uncalibrated, {"gait_symmetry": 0.5}) == {"is_calibrated": False, "gait_symmetry_mean": 0.9}
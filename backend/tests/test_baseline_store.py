@@ -0,0 +1,40 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.ai_engine.baseline import BaselineManager
+from app.baseline_store import BaselineStore
+
+
+def _session(memory_db, minutes: int, gait_symmetry: float, **fields):
+    memory_db["analysis_sessions"].docs.append({
+        "patient_id": "test-patient",
+        "created_at": datetime(2026, 1, 1) + timedelta(minutes=minutes),
+        "extracted_features": {"gait_symmetry": gait_symmetry, "bradykinesia_score": 0.3},
+        **fields
+    })
+
+
+def test_seed_skips_fallback_sessions(memory_db):
+    _session(memory_db, 0, 0.9)
+    _session(memory_db, 1, 0.8, features_fallback=True)
+    _session(memory_db, 2, 0.7)
+
+    stats = asyncio.run(BaselineStore._seed(memory_db, "test-patient", BaselineManager()))
+
+    assert stats["session_count"] == 2
+    assert stats["metrics"]["gait_symmetry"]["mean"] == pytest.approx(0.8)
+
+
+def test_concurrent_seeds_return_the_stored_statistics(memory_db):
+    manager = BaselineManager()
+    _session(memory_db, 0, 0.9)
+    first = asyncio.run(BaselineStore._seed(memory_db, "test-patient", manager))
+    # A second first-upload that saw one more session loses the upsert
+    _session(memory_db, 1, 0.5)
+    second = asyncio.run(BaselineStore._seed(memory_db, "test-patient", manager))
+
+    assert second["session_count"] == first["session_count"] == 1
+    assert second["metrics"] == first["metrics"]
+    assert len(memory_db[BaselineStore.STATS_COLLECTION].docs) == 1
@@ -0,0 +1,81 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.ai_engine import KeypointTensor
+from app.ai_engine.features import ANALYZER_VERSION
+from app.ai_engine.preprocessing import PosePreprocessor
+from app.feature_cache import FeatureCache
+
+
+def _tensor(seed: int = 0) -> KeypointTensor:
+    data = np.random.default_rng(seed).uniform(0.0, 1.0, (20, 33, 4)).astype(np.float32)
+    return KeypointTensor(data, 30.0)
+
+
+@pytest.fixture
+def cache_stats():
+    # Counters are class-wide; compare against their values before the test
+    return FeatureCache.stats()
+
+
+def test_content_key_depends_on_frames_and_preprocessor_settings():
+    preprocessor = PosePreprocessor()
+    key = FeatureCache.content_key(_tensor(), preprocessor)
+
+    assert FeatureCache.content_key(_tensor(), PosePreprocessor()) == key
+    assert FeatureCache.content_key(_tensor(seed=1), preprocessor) != key
+    assert FeatureCache.content_key(_tensor(), PosePreprocessor(min_visibility=0.3)) != key
+    assert FeatureCache.content_key(_tensor(), PosePreprocessor(smoothing=False)) != key
+    assert FeatureCache.content_key(_tensor(), None) != key
+    # Missing timestamps hash like the implied frame times
+    implied = KeypointTensor(_tensor().data, 30.0, np.arange(20) / 30.0)
+    assert FeatureCache.content_key(implied, preprocessor) == key
+
+
+def test_get_counts_memory_hits_db_hits_and_misses(memory_db, cache_stats):
+    key = FeatureCache.content_key(_tensor(), PosePreprocessor())
+
+    assert asyncio.run(FeatureCache.get(memory_db, key)) is None
+    asyncio.run(FeatureCache.put(memory_db, key, {"cadence": 110.0}))
+    assert asyncio.run(FeatureCache.get(memory_db, key)) == {"cadence": 110.0}
+    # A fresh process only has the collection
+    FeatureCache.clear()
+    assert asyncio.run(FeatureCache.get(memory_db, key)) == {"cadence": 110.0}
+
+    stats = FeatureCache.stats()
+    assert stats["misses"] - cache_stats["misses"] == 1
+    assert stats["memory_hits"] - cache_stats["memory_hits"] == 1
+    assert stats["db_hits"] - cache_stats["db_hits"] == 1
+
+
+def test_entries_from_another_analyzer_version_miss(memory_db):
+    memory_db[FeatureCache.COLLECTION].docs.append({
+        "_id": "key", "analyzer_version": ANALYZER_VERSION + "-old", "features": {"cadence": 90.0}
+    })
+
+    assert asyncio.run(FeatureCache.get(memory_db, "key")) is None
+
+
+def test_session_features_are_computed_once_per_preprocessor_settings(memory_db, monkeypatch):
+    from app.analysis_service import AnalysisService
+    from app.routers.analysis import _session_features
+
+    runs = []
+
+    async def run(func, tensor, sample_rate, preprocessor):
+        runs.append(preprocessor.settings())
+        return {"cadence": 110.0}
+
+    monkeypatch.setattr(AnalysisService, "run", run)
+
+    async def features(preprocessor):
+        tensor = _tensor()
+        return await _session_features(memory_db, tensor, preprocessor, FeatureCache.content_key(tensor, preprocessor))
+
+    asyncio.run(features(PosePreprocessor()))
+    asyncio.run(features(PosePreprocessor()))
+    asyncio.run(features(PosePreprocessor(max_gap_seconds=1.0)))
+
+    assert [settings["max_gap_seconds"] for settings in runs] == [0.5, 1.0]
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from app.ai_engine import GaitAnalyzer, KeypointTensor
+from benchmarks.synthetic import FEET, event_timing_error, synthetic_gait_session
+
+
+def _moving_tensor(frames: int = 90, sample_rate: float = 30.0, seed: int = 0) -> KeypointTensor:
+    rng = np.random.default_rng(seed)
+    data = np.ones((frames, KeypointTensor.NUM_LANDMARKS, KeypointTensor.NUM_CHANNELS), dtype=np.float32)
+    data[:, :, :3] = 0.5 + np.cumsum(rng.normal(0.0, 0.005, (frames, KeypointTensor.NUM_LANDMARKS, 3)), axis=0)
+    return KeypointTensor(data, sample_rate)
+
+
+def test_vectorized_bradykinesia_matches_scalar_loop():
+    tensor = _moving_tensor()
+    gait = GaitAnalyzer()
+
+    assert gait.calculate_bradykinesia_score(tensor) == pytest.approx(
+        gait.calculate_bradykinesia_score(tensor, vectorized=False), rel=1e-6
+    )
+
+
+def test_joint_velocities_of_constant_motion():
+    data = np.ones((10, 33, 4), dtype=np.float32)
+    data[:, :, 0] = (np.arange(10) * 0.01)[:, None]
+    gait = GaitAnalyzer(sample_rate=30.0)
+
+    velocities = gait.calculate_joint_velocities(KeypointTensor(data, 30.0))
+
+    assert velocities.shape == (9, 33)
+    np.testing.assert_allclose(velocities, 0.3, rtol=1e-4)
+
+
+def test_velocity_statistics_detect_slowing_and_distal_ratio():
+    frames = 91
+    data = np.ones((frames, 33, 4), dtype=np.float32)
+    # Speed falls linearly from 0.6 to 0.2 units/s; distal joints move twice as fast
+    speed = np.linspace(0.6, 0.2, frames - 1) / 30.0
+    position = np.concatenate([[0.0], np.cumsum(speed)])
+    data[:, :, 0] = position[:, None]
+    data[:, GaitAnalyzer.DISTAL_JOINTS, 0] = 2 * position[:, None]
+    gait = GaitAnalyzer(sample_rate=30.0)
+
+    stats = gait.calculate_velocity_statistics(KeypointTensor(data, 30.0))
+
+    assert stats["distal_proximal_ratio"] == pytest.approx(2.0, rel=1e-3)
+    assert stats["early_velocity"] > stats["late_velocity"]
+    assert stats["velocity_decrement"] > 0.4
+    assert stats["velocity_trend"] < 0
+    assert len(stats["joint_mean_velocity"]) == 33
+
+
+def test_velocity_statistics_need_a_few_frames():
+    assert GaitAnalyzer().calculate_velocity_statistics(_moving_tensor(frames=3)) is None
+
+
+def _frontal_view(tensor: KeypointTensor) -> KeypointTensor:
+    # Walking towards the camera: feet keep their vertical motion, but heel
+    # and toe share a fixed lateral position per side
+    data = tensor.data.copy()
+    for side, (ankle, heel, toe) in FEET.items():
+        lateral = 0.45 if side == "left" else 0.55
+        data[:, [ankle, heel, toe], 0] = lateral
+    return KeypointTensor(data, tensor.sample_rate, tensor.timestamps)
+
+
+def test_gait_events_in_sagittal_view_match_ground_truth():
+    tensor, truth = synthetic_gait_session(seconds=20.0, stride_jitter=0.02, seed=3)
+    events = GaitAnalyzer(sample_rate=tensor.sample_rate).detect_gait_events(tensor)
+
+    assert events.view == "sagittal"
+    for side in ("left", "right"):
+        strike_error, strikes_matched = event_timing_error(events.heel_strikes[side], truth["heel_strikes"][side], 30.0)
+        toe_off_error, toe_offs_matched = event_timing_error(events.toe_offs[side], truth["toe_offs"][side], 30.0)
+        assert strike_error < 0.05 and strikes_matched > 0.9
+        assert toe_off_error < 0.05 and toe_offs_matched > 0.9
+
+
+def test_gait_events_in_frontal_view_find_every_stride():
+    tensor, truth = synthetic_gait_session(seconds=20.0, seed=4)
+    gait = GaitAnalyzer(sample_rate=tensor.sample_rate)
+
+    events = gait.detect_gait_events(_frontal_view(tensor))
+
+    assert events.view == "frontal"
+    for side in ("left", "right"):
+        # Peak foot speeds sit a few frames off contact and lift-off
+        strike_error, _ = event_timing_error(events.heel_strikes[side], truth["heel_strikes"][side], 30.0)
+        toe_off_error, _ = event_timing_error(events.toe_offs[side], truth["toe_offs"][side], 30.0)
+        assert strike_error < 0.15 and toe_off_error < 0.15
+        assert abs(len(events.heel_strikes[side]) - len(truth["heel_strikes"][side])) <= 1
+        assert abs(len(events.toe_offs[side]) - len(truth["toe_offs"][side])) <= 1
+    assert gait.cadence_from_events(events) == pytest.approx(truth["cadence"], rel=0.05)
@@ -0,0 +1,109 @@
+import asyncio
+
+from app.job_queue import JobQueue
+
+
+@JobQueue.register("test_echo", "Test", notify=False)
+async def _echo(db, payload):
+    if payload.get("sleep"):
+        await asyncio.sleep(payload["sleep"])
+    return {"echo": payload.get("value")}
+
+
+# Values of jobs whose cleanup ran
+_cleaned = []
+
+
+@JobQueue.register("test_spooled", "Test", notify=False, cleanup=lambda payload: _cleaned.append(payload["value"]))
+async def _spooled(db, payload):
+    if payload.get("sleep"):
+        await asyncio.sleep(payload["sleep"])
+    if payload.get("fail"):
+        raise ValueError("unreadable upload")
+    return {"echo": payload["value"]}
+
+
+def _run(test, **options):
+    async def run():
+        await JobQueue.start(None, backend="memory", workers=0, **options)
+        try:
+            return await test()
+        finally:
+            await JobQueue.stop()
+    return asyncio.run(run())
+
+
+def test_job_pinned_to_another_host_is_not_claimed():
+    async def test():
+        other = await JobQueue.submit("test_echo", {"value": 1}, host="other-replica")
+        local = await JobQueue.submit("test_echo", {"value": 2}, host=JobQueue.host)
+        shared = await JobQueue.submit("test_echo", {"value": 3})
+        while await JobQueue.run_next():
+            pass
+        return [(await JobQueue.get(job_id))["status"] for job_id in (other, local, shared)]
+
+    assert _run(test) == ["queued", "completed", "completed"]
+
+
+def test_running_job_keeps_its_lease_and_dead_leases_are_recovered():
+    async def test():
+        long_job = await JobQueue.submit("test_echo", {"value": 1, "sleep": 0.6})
+        running = asyncio.create_task(JobQueue.run_next())
+        await asyncio.sleep(0.35)
+        # Past the original 0.2 s lease, but renewed by the heartbeat
+        await JobQueue.recover()
+        assert (await JobQueue.get(long_job))["status"] == "running"
+        await running
+
+        # A job whose replica died mid-run: claimed, never renewed
+        orphan = await JobQueue.submit("test_echo", {"value": 2})
+        await JobQueue.backend.claim(JobQueue.lease_seconds, JobQueue.host)
+        worker = asyncio.create_task(JobQueue._worker())
+        await asyncio.sleep(0.5)
+        worker.cancel()
+        return (await JobQueue.get(long_job))["status"], await JobQueue.get(orphan)
+
+    status, orphan = _run(test, lease_seconds=0.2, poll_interval=0.05)
+    assert status == "completed"
+    assert orphan["status"] == "completed"
+    assert orphan["attempts"] == 2
+
+
+def test_pinned_job_fails_when_its_host_never_claims_it():
+    async def test():
+        stranded = await JobQueue.submit("test_spooled", {"value": "stranded"}, host="dead-replica")
+        shared = await JobQueue.submit("test_spooled", {"value": "shared"})
+        await asyncio.sleep(0.15)
+        await JobQueue.recover()
+        return await JobQueue.get(stranded), await JobQueue.get(shared)
+
+    _cleaned.clear()
+    stranded, shared = _run(test, pinned_timeout=0.1)
+    assert stranded["status"] == "failed" and "replica" in stranded["error"]
+    assert shared["status"] == "queued"
+    assert _cleaned == ["stranded"]
+
+
+def test_cleanup_waits_for_the_final_attempt():
+    async def test():
+        job_id = await JobQueue.submit("test_spooled", {"value": "retried", "sleep": 0.3})
+        # Shutdown cancels the first attempt mid-run
+        first = asyncio.create_task(JobQueue.run_next())
+        await asyncio.sleep(0.05)
+        first.cancel()
+        await asyncio.gather(first, return_exceptions=True)
+        cleaned_after_cancel = list(_cleaned)
+
+        await asyncio.sleep(0.25)
+        await JobQueue.recover()
+        await JobQueue.run_next()
+        failing = await JobQueue.submit("test_spooled", {"value": "failing", "fail": True})
+        await JobQueue.run_next()
+        return cleaned_after_cancel, await JobQueue.get(job_id), await JobQueue.get(failing)
+
+    _cleaned.clear()
+    cleaned_after_cancel, retried, failing = _run(test, lease_seconds=0.2)
+    assert cleaned_after_cancel == []
+    assert retried["status"] == "completed" and retried["attempts"] == 2
+    assert failing["status"] == "failed"
+    assert _cleaned == ["retried", "failing"]
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from app.ai_engine import GaitAnalyzer, KeypointTensor, TremorAnalyzer
+
+
+def _frames(count: int = 40, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0.2, 0.8, (count, KeypointTensor.NUM_LANDMARKS, 3)).astype(np.float32)
+
+
+def test_from_frames_adds_visibility_from_frame_confidence():
+    frames = _frames(3)
+    tensor = KeypointTensor.from_frames(frames.tolist(), visibility=[0.9, 0.5, 0.1])
+
+    assert tensor.data.shape == (3, 33, 4)
+    assert tensor.data.dtype == np.float32
+    np.testing.assert_allclose(tensor.xyz, frames)
+    np.testing.assert_allclose(tensor.visibility[:, 0], [0.9, 0.5, 0.1])
+
+
+@pytest.mark.parametrize("frames, message", [
+    ([[[0.0, 0.0, 0.0]] * 32], "33 landmarks"),
+    ([[[0.0, 0.0]] * 33], "33 landmarks"),
+    ([[[0.0, 0.0, 0.0]] * 33, [[0.0, 0.0, 0.0]] * 32], "same number of landmarks")
+])
+def test_from_frames_rejects_malformed_frames(frames, message):
+    with pytest.raises(ValueError, match=message):
+        KeypointTensor.from_frames(frames)
+
+
+def test_coerce_keeps_tensors_and_converts_lists():
+    tensor = KeypointTensor.from_frames(_frames().tolist())
+
+    assert KeypointTensor.coerce(tensor) is tensor
+    np.testing.assert_array_equal(KeypointTensor.coerce(tensor.data).data, tensor.data)
+    np.testing.assert_array_equal(KeypointTensor.coerce(_frames().tolist()).data, tensor.data)
+
+
+def test_analyzers_give_the_same_result_for_lists_and_tensors():
+    frames = _frames(120).tolist()
+    tensor = KeypointTensor.from_frames(frames)
+    gait, tremor = GaitAnalyzer(), TremorAnalyzer()
+
+    assert gait.calculate_gait_symmetry(frames) == gait.calculate_gait_symmetry(tensor)
+    assert gait.calculate_bradykinesia_score(frames) == gait.calculate_bradykinesia_score(tensor)
+    assert tremor.calculate_tremor_score(frames) == tremor.calculate_tremor_score(tensor)
+
+
+def test_wire_format_roundtrip_keeps_frames_and_fps():
+    tensor = KeypointTensor.from_frames(_frames(5).tolist(), sample_rate=60.0, visibility=[0.7] * 5)
+
+    decoded = KeypointTensor.from_bytes(tensor.to_bytes())
+
+    assert decoded.sample_rate == 60.0
+    np.testing.assert_array_equal(decoded.data, tensor.data)
+
+
+def test_wire_format_with_three_channels_defaults_visibility():
+    xyz = _frames(2)
+    header = KeypointTensor.WIRE_HEADER.pack(KeypointTensor.WIRE_MAGIC, KeypointTensor.WIRE_VERSION, 3, 33, 2, 30.0)
+
+    decoded = KeypointTensor.from_bytes(header + xyz.astype("<f4").tobytes())
+
+    np.testing.assert_array_equal(decoded.xyz, xyz)
+    assert (decoded.visibility == 1.0).all()
+
+
+def _header(**fields) -> bytes:
+    values = {
+        "magic": KeypointTensor.WIRE_MAGIC,
+        "version": KeypointTensor.WIRE_VERSION,
+        "channels": 4,
+        "landmarks": 33,
+        "frames": 1,
+        "fps": 30.0,
+        **fields
+    }
+    return KeypointTensor.WIRE_HEADER.pack(*values.values())
+
+
+@pytest.mark.parametrize("buffer, message", [
+    (b"NSPF", "shorter than the pose frame header"),
+    (_header(magic=b"JUNK") + bytes(33 * 16), "Unrecognized"),
+    (_header(version=9) + bytes(33 * 16), "version 9"),
+    (_header(landmarks=17) + bytes(17 * 16), "33 landmarks"),
+    (_header(fps=0.0) + bytes(33 * 16), "fps must be positive"),
+    (_header(frames=2) + bytes(33 * 16), "Expected")
+])
+def test_wire_format_rejects_bad_headers(buffer, message):
+    with pytest.raises(ValueError, match=message):
+        KeypointTensor.from_bytes(buffer)
@@ -0,0 +1,69 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.llm_cache import LLMResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """LLMResponseCache with a fake monotonic clock and its settings restored afterwards."""
+    for name in ("max_entries", "ttl_seconds", "endpoints"):
+        monkeypatch.setattr(LLMResponseCache, name, getattr(LLMResponseCache, name))
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr("app.llm_cache.time", SimpleNamespace(monotonic=lambda: now.value))
+    LLMResponseCache.clear()
+    yield now
+    LLMResponseCache.clear()
+
+
+def test_entries_expire_after_the_ttl(clock):
+    LLMResponseCache.configure(max_entries=8, ttl_seconds=60.0, endpoints=["insights"])
+
+    asyncio.run(LLMResponseCache.put(None, "insights", "key", "cached answer"))
+    clock.value += 59.0
+    assert asyncio.run(LLMResponseCache.get(None, "insights", "key")) == "cached answer"
+    clock.value += 2.0
+    assert asyncio.run(LLMResponseCache.get(None, "insights", "key")) is None
+    assert LLMResponseCache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    LLMResponseCache.configure(max_entries=2, ttl_seconds=60.0, endpoints=["insights"])
+
+    asyncio.run(LLMResponseCache.put(None, "insights", "a", "A"))
+    asyncio.run(LLMResponseCache.put(None, "insights", "b", "B"))
+    # Reading "a" makes "b" the oldest
+    assert asyncio.run(LLMResponseCache.get(None, "insights", "a")) == "A"
+    asyncio.run(LLMResponseCache.put(None, "insights", "c", "C"))
+
+    assert asyncio.run(LLMResponseCache.get(None, "insights", "b")) is None
+    assert asyncio.run(LLMResponseCache.get(None, "insights", "a")) == "A"
+    assert asyncio.run(LLMResponseCache.get(None, "insights", "c")) == "C"
+
+
+def test_shared_entries_are_reused_until_they_expire(memory_db, clock):
+    LLMResponseCache.configure(max_entries=8, ttl_seconds=60.0, endpoints=["insights"])
+    collection = memory_db[LLMResponseCache.COLLECTION]
+    collection.docs += [
+        {"_id": "fresh", "text": "from another replica", "expires_at": datetime.utcnow() + timedelta(seconds=30)},
+        {"_id": "stale", "text": "expired", "expires_at": datetime.utcnow() - timedelta(seconds=1)}
+    ]
+
+    assert asyncio.run(LLMResponseCache.get(memory_db, "insights", "fresh")) == "from another replica"
+    assert asyncio.run(LLMResponseCache.get(memory_db, "insights", "stale")) is None
+    # The local copy keeps the shared entry's remaining lifetime, not a full TTL
+    clock.value += 31.0
+    collection.docs.clear()
+    assert asyncio.run(LLMResponseCache.get(memory_db, "insights", "fresh")) is None
+
+
+def test_keys_ignore_prompt_whitespace_but_not_model_or_config():
+    key = LLMResponseCache.key("Summarize\n   the week", "gemini", {"temperature": 0.4})
+
+    assert LLMResponseCache.key("Summarize the week ", "gemini", {"temperature": 0.4}) == key
+    assert LLMResponseCache.key("Summarize the week", "other-model", {"temperature": 0.4}) != key
+    assert LLMResponseCache.key("Summarize the week", "gemini", {"temperature": 0.9}) != key
+    assert not LLMResponseCache.enabled(None)
@@ -0,0 +1,112 @@
+import asyncio
+import base64
+import json
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.database import settings
+from app.llm_client import InlineFile, LLMClient, LLMError
+
+
+def _reply(text: str) -> web.Response:
+    return web.json_response({"candidates": [{"content": {"parts": [{"text": text}]}}]})
+
+
+@pytest.fixture
+def gemini(monkeypatch):
+    """Runs a test against a local generateContent stub answering with `responses` in turn."""
+    monkeypatch.setattr(settings, "GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(LLMClient, "max_retries", 2)
+    monkeypatch.setattr(LLMClient, "BACKOFF_BASE", 0.01)
+    delays = []
+    backoff = LLMClient._backoff.__func__
+
+    def recorded_backoff(cls, attempt, retry_after=None):
+        delays.append(backoff(cls, attempt, retry_after))
+        return delays[-1]
+
+    monkeypatch.setattr(LLMClient, "_backoff", classmethod(recorded_backoff))
+
+    def run(responses, test):
+        requests = []
+
+        async def handler(request):
+            requests.append({"headers": dict(request.headers), "body": await request.read()})
+            return responses[min(len(requests), len(responses)) - 1]()
+
+        async def main():
+            app = web.Application(client_max_size=16 * 1024 * 1024)
+            app.router.add_post("/models/{model}", handler)
+            server = TestServer(app)
+            await server.start_server()
+            monkeypatch.setattr(LLMClient, "base_url", str(server.make_url("")).rstrip("/"))
+            try:
+                return await test()
+            finally:
+                await LLMClient.stop()
+                await server.close()
+
+        return asyncio.run(main()), requests, delays
+
+    return run
+
+
+def test_transient_errors_are_retried_with_backoff(gemini):
+    responses = [
+        lambda: web.Response(status=503, text="overloaded"),
+        lambda: web.Response(status=429, text="slow down", headers={"Retry-After": "0.05"}),
+        lambda: _reply("ok")
+    ]
+
+    text, requests, delays = gemini(responses, lambda: LLMClient.generate_text("hello"))
+
+    assert text == "ok"
+    assert len(requests) == 3
+    assert requests[0]["headers"]["x-goog-api-key"] == "test-key"
+    # Full jitter up to BACKOFF_BASE on the first retry, then Retry-After
+    assert 0.0 <= delays[0] <= 0.01
+    assert delays[1] == 0.05
+
+
+def test_client_errors_are_not_retried(gemini):
+    async def test():
+        with pytest.raises(LLMError) as error:
+            await LLMClient.generate_content([{"text": "hello"}])
+        return error.value.status
+
+    status, requests, delays = gemini([lambda: web.Response(status=400, text="bad request")], test)
+
+    assert status == 400
+    assert len(requests) == 1 and delays == []
+
+
+def test_retries_stop_after_max_retries(gemini):
+    async def test():
+        with pytest.raises(LLMError) as error:
+            await LLMClient.generate_content([{"text": "hello"}])
+        return error.value.status
+
+    status, requests, delays = gemini([lambda: web.Response(status=500, text="boom")], test)
+
+    assert status == 500
+    assert len(requests) == LLMClient.max_retries + 1
+    assert len(delays) == LLMClient.max_retries
+
+
+def test_inline_files_are_streamed_as_base64_on_every_attempt(gemini, tmp_path, monkeypatch):
+    monkeypatch.setattr(InlineFile, "CHUNK_BYTES", 3 * 1000)
+    video = tmp_path / "walk.mp4"
+    video.write_bytes(bytes(range(256)) * 50)
+    responses = [lambda: web.Response(status=502), lambda: _reply("seen")]
+
+    data, requests, _ = gemini(responses, lambda: LLMClient.generate_content(
+        [{"text": "describe"}, InlineFile(str(video), "video/mp4")]
+    ))
+
+    assert LLMClient.response_text(data) == "seen"
+    for request in requests:
+        parts = json.loads(request["body"])["contents"][0]["parts"]
+        assert parts[1]["inline_data"]["mime_type"] == "video/mp4"
+        assert base64.b64decode(parts[1]["inline_data"]["data"]) == video.read_bytes()
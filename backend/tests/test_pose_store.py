@@ -0,0 +1,66 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.ai_engine import KeypointTensor
+from app.pose_store import PoseFrameStore
+
+
+def _tensor(frames: int = 10) -> KeypointTensor:
+    data = np.random.default_rng(0).uniform(0.0, 1.0, (frames, 33, 4)).astype(np.float32)
+    return KeypointTensor(data, 25.0, np.arange(frames) / 25.0 + 1.5)
+
+
+def test_save_and_load_roundtrip_across_chunks(memory_db):
+    tensor = _tensor()
+
+    storage = asyncio.run(PoseFrameStore.save(memory_db, "session-1", tensor, range(10), chunk_frames=4))
+    loaded = asyncio.run(PoseFrameStore.load(memory_db, "session-1", storage["sample_rate"]))
+
+    assert storage["chunks"] == 3 and storage["frames"] == 10
+    assert [chunk["frame_count"] for chunk in memory_db[PoseFrameStore.COLLECTION].docs] == [4, 4, 2]
+    np.testing.assert_array_equal(loaded.data, tensor.data)
+    np.testing.assert_array_equal(loaded.timestamps, tensor.timestamps)
+    assert loaded.sample_rate == 25.0
+
+
+def test_float16_storage_keeps_values_to_half_precision(memory_db):
+    tensor = _tensor()
+
+    storage = asyncio.run(PoseFrameStore.save(memory_db, "session-1", tensor, range(10), dtype="float16"))
+    session = {"_id": "session-1", "pose_storage": storage}
+    loaded = asyncio.run(PoseFrameStore.load_session(memory_db, session))
+
+    np.testing.assert_allclose(loaded.data, tensor.data, atol=1e-3)
+
+
+def test_unknown_storage_dtype_is_rejected():
+    with pytest.raises(ValueError):
+        PoseFrameStore.encode_chunks(_tensor(), range(10), dtype="float64")
+
+
+def test_load_session_falls_back_to_embedded_pose_frames(memory_db):
+    keypoints = np.random.default_rng(1).uniform(0.0, 1.0, (3, 33, 3))
+    session = {
+        "_id": "legacy",
+        "pose_frames": [
+            {"frame_number": i, "timestamp": i / 30.0, "keypoints": keypoints[i].tolist(), "confidence": 0.9}
+            for i in range(3)
+        ]
+    }
+
+    loaded = asyncio.run(PoseFrameStore.load_session(memory_db, session))
+
+    np.testing.assert_allclose(loaded.xyz, keypoints, atol=1e-6)
+    np.testing.assert_allclose(loaded.timestamps, np.arange(3) / 30.0)
+    assert asyncio.run(PoseFrameStore.load_session(memory_db, {"_id": "empty"})) is None
+
+
+def test_delete_removes_only_that_session(memory_db):
+    asyncio.run(PoseFrameStore.save(memory_db, "session-1", _tensor(), range(10), chunk_frames=4))
+    asyncio.run(PoseFrameStore.save(memory_db, "session-2", _tensor(), range(10), chunk_frames=4))
+
+    assert asyncio.run(PoseFrameStore.delete(memory_db, "session-1")) == 3
+    assert asyncio.run(PoseFrameStore.load(memory_db, "session-1")) is None
+    assert asyncio.run(PoseFrameStore.load(memory_db, "session-2")) is not None
@@ -0,0 +1,56 @@
+import time
+
+import numpy as np
+import pytest
+
+from app.ai_engine import KeypointTensor, PosePreprocessor, SignalQualityError
+
+
+def _session(frames: int = 300, sample_rate: float = 30.0, time_scale: float = 1.0) -> KeypointTensor:
+    rng = np.random.default_rng(0)
+    data = np.empty((frames, KeypointTensor.NUM_LANDMARKS, KeypointTensor.NUM_CHANNELS), dtype=np.float32)
+    data[:, :, :3] = rng.normal(0.5, 0.01, (frames, KeypointTensor.NUM_LANDMARKS, 3))
+    data[:, :, 3] = 1.0
+    timestamps = np.arange(frames) / sample_rate * time_scale
+    return KeypointTensor(data, sample_rate, timestamps)
+
+
+def test_accepts_second_timestamps():
+    tensor, report = PosePreprocessor().process(_session())
+    assert report["accepted"]
+    assert report["frames_out"] == 300
+
+
+def test_rejects_millisecond_timestamps_before_resampling():
+    started = time.perf_counter()
+    with pytest.raises(SignalQualityError) as error:
+        PosePreprocessor().process(_session(time_scale=1000.0))
+
+    assert "timestamps must be in seconds" in str(error.value)
+    assert error.value.report["accepted"] is False
+    # The grid is never built, so rejection is immediate
+    assert "frames_out" not in error.value.report
+    assert time.perf_counter() - started < 0.5
+
+
+def _pose_frames(session: KeypointTensor, channels: int, confidence: float) -> list:
+    return [
+        {"frame_number": i, "timestamp": float(t), "keypoints": frame[:, :channels].tolist(), "confidence": confidence}
+        for i, (frame, t) in enumerate(zip(session.data, session.timestamps))
+    ]
+
+
+def test_low_frame_confidence_does_not_mask_landmarks():
+    tensor = KeypointTensor.from_pose_frames(_pose_frames(_session(), channels=3, confidence=0.3))
+
+    _, report = PosePreprocessor().process(tensor)
+    assert report["accepted"] and report["valid_fraction"] == 1.0
+
+
+def test_low_per_landmark_visibility_is_rejected():
+    session = _session()
+    session.data[:, :, 3] = 0.3
+
+    with pytest.raises(SignalQualityError) as error:
+        PosePreprocessor().process(KeypointTensor.from_pose_frames(_pose_frames(session, channels=4, confidence=0.9)))
+    assert "key landmarks are visible" in str(error.value)
@@ -0,0 +1,72 @@
+import asyncio
+
+from bson import ObjectId
+
+from app.ai_engine.baseline import BaselineManager
+from app.risk_rescoring import rescore_risk_assessments
+
+
+def test_sessions_without_usable_features_are_skipped(memory_db):
+    memory_db["baselines"].docs.append({
+        "patient_id": "test-patient",
+        "is_calibrated": True,
+        "metrics": {"gait_symmetry_mean": 0.9, "bradykinesia_mean": 0.3, "is_calibrated": True}
+    })
+    sessions = {
+        "complete": {"extracted_features": {"gait_symmetry": 0.6, "bradykinesia_score": 0.7}},
+        "missing_key": {"extracted_features": {"gait_symmetry": 0.6}},
+        "no_features": {},
+        "fallback": {
+            "features_fallback": True,
+            "extracted_features": {"gait_symmetry": 0.8, "bradykinesia_score": 0.5}
+        }
+    }
+    for name, session in sessions.items():
+        session_id = ObjectId()
+        memory_db["analysis_sessions"].docs.append({"_id": session_id, "patient_id": "test-patient", **session})
+        memory_db["risk_assessments"].docs.append({
+            "_id": name,
+            "session_id": str(session_id),
+            "patient_id": "test-patient",
+            "risk_score": {"score": 0.5, "classification": "Low", "confidence": 0.8}
+        })
+
+    totals = asyncio.run(rescore_risk_assessments(memory_db, BaselineManager(), dry_run=True))
+
+    assert totals["read"] == 4
+    assert totals["scored"] == 1
+    assert totals["skipped"] == 3
+
+
+def test_rescoring_updates_classification_and_review_flag(memory_db):
+    memory_db["baselines"].docs.append({
+        "patient_id": "test-patient",
+        "is_calibrated": True,
+        "metrics": {"gait_symmetry_mean": 0.9, "bradykinesia_mean": 0.3, "is_calibrated": True}
+    })
+    session_id = ObjectId()
+    memory_db["analysis_sessions"].docs.append({
+        "_id": session_id,
+        "patient_id": "test-patient",
+        "extracted_features": {"gait_symmetry": 0.6, "bradykinesia_score": 0.7}
+    })
+    memory_db["risk_assessments"].docs.append({
+        "_id": "stale",
+        "session_id": str(session_id),
+        "patient_id": "test-patient",
+        "risk_score": {"score": 0.5, "classification": "LOW", "confidence": 0.8},
+        "flagged_for_review": False
+    })
+    # Deviation is (0.3 / 0.05 + 0.4 / 0.1) / 2 = 5.0
+    manager = BaselineManager(low_threshold=6.0, medium_threshold=8.0)
+
+    totals = asyncio.run(rescore_risk_assessments(memory_db, manager))
+    assessment = memory_db["risk_assessments"].docs[0]
+    assert totals["updated"] == 1
+    assert assessment["risk_score"]["classification"] == "LOW"
+    assert assessment["flagged_for_review"] is False
+
+    totals = asyncio.run(rescore_risk_assessments(memory_db, BaselineManager()))
+    assert totals["updated"] == 1
+    assert assessment["risk_score"]["classification"] == "HIGH"
+    assert assessment["flagged_for_review"] is True
@@ -0,0 +1,58 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from app.session_repository import SessionRepository
+
+
+def _session(memory_db, minutes: int, patient_id: str = "test-patient") -> str:
+    session_id = ObjectId()
+    memory_db[SessionRepository.COLLECTION].docs.append({
+        "_id": session_id,
+        "patient_id": patient_id,
+        "created_at": datetime(2026, 1, 1) + timedelta(minutes=minutes),
+        "extracted_features": {"gait_symmetry": 0.9},
+        "pose_frames": [{"keypoints": []}]
+    })
+    return str(session_id)
+
+
+def _risk(memory_db, session_id: str, score: float, flagged: bool):
+    memory_db["risk_assessments"].docs.append({
+        "_id": ObjectId(),
+        "session_id": session_id,
+        "patient_id": "test-patient",
+        "risk_score": score,
+        "flagged_for_review": flagged,
+        "explanation": "not part of the join"
+    })
+
+
+def test_list_with_risk_joins_each_sessions_assessment(memory_db):
+    oldest = _session(memory_db, 0)
+    middle = _session(memory_db, 1)
+    newest = _session(memory_db, 2)
+    _session(memory_db, 3, patient_id="other-patient")
+    _risk(memory_db, oldest, 10.0, False)
+    _risk(memory_db, newest, 80.0, True)
+
+    sessions = asyncio.run(SessionRepository.list_with_risk(memory_db, "test-patient"))
+
+    assert [str(session["_id"]) for session in sessions] == [newest, middle, oldest]
+    assert sessions[0]["risk_assessment"] == {"risk_score": 80.0, "flagged_for_review": True}
+    assert "risk_assessment" not in sessions[1]
+    assert sessions[2]["risk_assessment"] == {"risk_score": 10.0, "flagged_for_review": False}
+    # The features view leaves raw frames behind
+    assert all("pose_frames" not in session for session in sessions)
+
+
+def test_list_with_risk_applies_since_and_limit(memory_db):
+    for minutes in range(5):
+        _risk(memory_db, _session(memory_db, minutes), float(minutes), False)
+
+    recent = asyncio.run(SessionRepository.list_with_risk(
+        memory_db, "test-patient", since=datetime(2026, 1, 1, 0, 2), limit=2
+    ))
+
+    assert [session["risk_assessment"]["risk_score"] for session in recent] == [4.0, 3.0]
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+from scipy.signal import detrend, windows
+
+from app.ai_engine import KeypointTensor, SpectralEngine, TremorAnalyzer
+from app.ai_engine.spectral import SlidingSpectrogram
+
+WRISTS = [TremorAnalyzer.LEFT_WRIST, TremorAnalyzer.RIGHT_WRIST]
+
+
+def _fft_spectrum(signal_data: np.ndarray, sample_rate: float):
+    # The full-FFT path SpectralEngine replaced
+    windowed = signal_data * windows.hann(len(signal_data))
+    magnitudes = np.abs(np.fft.fft(windowed)) / len(signal_data)
+    half = len(signal_data) // 2
+    return np.fft.fftfreq(len(signal_data), 1 / sample_rate)[:half], magnitudes[:half]
+
+
+def _tremor_tensor(seconds: float, sample_rate: float = 30.0, frequency: float = 5.0,
+                   amplitude: float = 0.01, tremor_from: float = 0.0, seed: int = 0) -> KeypointTensor:
+    rng = np.random.default_rng(seed)
+    frames = int(seconds * sample_rate)
+    times = np.arange(frames) / sample_rate
+    data = np.ones((frames, 33, 4), dtype=np.float32)
+    data[:, :, :3] = 0.5 + rng.normal(0.0, 0.0005, (frames, 33, 3))
+    oscillation = np.where(times >= tremor_from, amplitude * np.sin(2 * np.pi * frequency * times), 0.0)
+    data[:, WRISTS, 0] += oscillation[:, None]
+    return KeypointTensor(data, sample_rate)
+
+
+@pytest.mark.parametrize("length", [64, 101, 300])
+def test_rfft_spectrum_matches_full_fft(length):
+    signal_data = np.random.default_rng(length).normal(size=length)
+
+    frequencies, magnitudes = SpectralEngine(30.0).spectrum(signal_data)
+    expected_frequencies, expected_magnitudes = _fft_spectrum(signal_data, 30.0)
+
+    np.testing.assert_allclose(frequencies, expected_frequencies)
+    np.testing.assert_allclose(magnitudes[0], expected_magnitudes, atol=1e-12)
+
+
+def test_batched_spectrum_matches_each_landmark_alone():
+    tensor = _tremor_tensor(10.0)
+    analyzer = TremorAnalyzer()
+
+    spectrum = analyzer.compute_spectrum(tensor)
+
+    for landmark in TremorAnalyzer.TREMOR_LANDMARKS:
+        oscillation = detrend(analyzer.extract_oscillation_sequence(tensor, landmark))
+        _, expected = _fft_spectrum(oscillation, 30.0)
+        np.testing.assert_allclose(spectrum.landmark_magnitudes(landmark), expected, atol=1e-12)
+
+
+def test_spectrum_queries_find_the_tremor_peak():
+    tensor = _tremor_tensor(10.0, frequency=6.0)
+    analyzer = TremorAnalyzer()
+    spectrum = analyzer.compute_spectrum(tensor)
+
+    assert analyzer.extract_tremor_frequency(spectrum, TremorAnalyzer.LEFT_WRIST) == pytest.approx(6.0, abs=0.1)
+    assert analyzer.extract_tremor_frequency(tensor, TremorAnalyzer.LEFT_WRIST) == \
+        analyzer.extract_tremor_frequency(spectrum, TremorAnalyzer.LEFT_WRIST)
+
+
+def test_sliding_spectrogram_window_count_and_chunking():
+    tensor = _tremor_tensor(20.0)
+    window_size, hop_size = 120, 30
+    expected_windows = (len(tensor) - window_size) // hop_size + 1
+
+    whole = list(SlidingSpectrogram(WRISTS, 30.0, window_size, hop_size).push(tensor))
+    spectrogram = SlidingSpectrogram(WRISTS, 30.0, window_size, hop_size)
+    chunked = [window for start in range(0, len(tensor), 37) for window in spectrogram.push(tensor.slice(start, start + 37))]
+
+    assert len(whole) == len(chunked) == expected_windows
+    assert [window.start_frame for window in chunked] == list(range(0, expected_windows * hop_size, hop_size))
+    for a, b in zip(whole, chunked):
+        np.testing.assert_allclose(a.magnitudes, b.magnitudes, atol=1e-12)
+    # Only frames a future window can use stay buffered
+    assert spectrogram._buffer.shape[1] < window_size
+
+
+def test_sliding_spectrogram_rejects_tiny_windows():
+    with pytest.raises(ValueError):
+        SlidingSpectrogram(WRISTS, 30.0, window_size=2, hop_size=1)
+    with pytest.raises(ValueError):
+        SlidingSpectrogram(WRISTS, 30.0, window_size=8, hop_size=0)
+
+
+def test_tremor_fraction_follows_tremor_onset():
+    # Tremor starts halfway through a 40 s session
+    tensor = _tremor_tensor(40.0, frequency=5.0, amplitude=0.02, tremor_from=20.0)
+    analyzer = TremorAnalyzer()
+
+    windows = list(analyzer.iter_tremor_windows(tensor, window_seconds=4.0, hop_seconds=1.0))
+    summary = analyzer.summarize_tremor_windows(windows)
+
+    assert len(windows) == 37
+    assert windows[0]["end_time"] == pytest.approx(4.0)
+    assert summary["window_count"] == 37
+    left = summary["landmarks"][TremorAnalyzer.LEFT_WRIST]
+    assert 0.4 <= left["tremor_fraction"] <= 0.6
+    assert left["median_frequency"] == pytest.approx(5.0, abs=0.3)
+    assert not windows[0]["landmarks"][TremorAnalyzer.LEFT_WRIST]["tremor_present"]
+    assert windows[-1]["landmarks"][TremorAnalyzer.LEFT_WRIST]["tremor_present"]
@@ -0,0 +1,8 @@
+from benchmarks.bench_startup import LAZY_MODULES, TARGET, profile_import
+
+
+def test_heavy_modules_are_not_imported_at_startup():
+    _, _, modules = profile_import()
+
+    assert TARGET in modules
+    assert [name for name in LAZY_MODULES if name in modules] == []
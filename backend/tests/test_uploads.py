@@ -0,0 +1,46 @@
+import asyncio
+import io
+import os
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.database import settings
+from app.uploads import discard_upload, spool_upload
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_BYTES", 64)
+
+
+def _upload(content: bytes, size=None) -> UploadFile:
+    return UploadFile(io.BytesIO(content), size=size, filename="walk.mp4")
+
+
+def test_upload_within_limit_is_copied_to_the_spool_directory(tmp_path):
+    content = os.urandom(1000)
+
+    path = asyncio.run(spool_upload(_upload(content), 1000, "too large", directory=str(tmp_path)))
+
+    assert os.path.dirname(path) == str(tmp_path) and path.endswith(".mp4")
+    with open(path, "rb") as spooled:
+        assert spooled.read() == content
+    discard_upload(path)
+    assert os.listdir(tmp_path) == []
+
+
+def test_upload_past_the_limit_is_rejected_and_removed(tmp_path):
+    # No declared size, so the limit trips while copying
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(spool_upload(_upload(os.urandom(1001)), 1000, "too large", directory=str(tmp_path)))
+
+    assert error.value.status_code == 400 and error.value.detail == "too large"
+    assert os.listdir(tmp_path) == []
+
+
+def test_declared_size_past_the_limit_is_rejected_before_copying(tmp_path):
+    with pytest.raises(HTTPException):
+        asyncio.run(spool_upload(_upload(b"", size=5000), 1000, "too large", directory=str(tmp_path)))
+
+    assert os.listdir(tmp_path) == []